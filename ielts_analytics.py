@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Müsaitlik geçmişinin sütunlu dışa aktarımı ve vektörel analizi.
+
+Gözlemler (her döngüde bulunan tarih × venue × seviye) geçmiş veritabanından
+NumPy dizilerine okunur; .npz ya da (pyarrow kuruluysa) Parquet olarak
+yazılabilir. Analiz tamamen dizi işlemleriyle yapılır:
+
+- yayın zamanı: yeni slotun ilk görüldüğü saat / gün (histogram, saat × gün ısı haritası)
+- öne alma süresi: yayın ile sınav tarihi arasındaki gün sayısı
+- slot ömrü ve doluluk: kaybolan slotların ne kadar açık kaldığı, sınavdan
+  önce kaybolanların (dolan) oranı, venue başına
+
+Bir slotun "yayını", aynı hedefte kesintisiz görüldüğü ilk döngüdür; hedefin
+ilk taramasında zaten açık olanlar yayın sayılmaz, son taramasında hâlâ açık
+olanların ömrü bitmemiş sayılır. Hedefin tarandığı döngüler (tarih bulunamasa
+da) geçmişteki run_targets tablosundan okunur. Aradaki --gap-runs döngüden
+uzun kesinti slotun dolup yeniden açıldığı anlamına gelir.
+
+    pip install numpy            # Parquet için ayrıca: pip install pyarrow
+    python ielts_analytics.py export --db ielts_history.db --out gozlemler.parquet
+    python ielts_analytics.py report --db ielts_history.db
+    python ielts_analytics.py report --input gozlemler.npz --json rapor.json
+    python ielts_analytics.py synth --venues 40 --days 365 --out sentetik.npz   # büyük veriyle hız ölçümü
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+from datetime import datetime, timezone, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # Analiz komutları numpy olmadan çalışmaz; diğer modüller bu dosyayı import etmez
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "ielts_history.db"
+
+# Seviye kodları (0: bilinmiyor)
+LEVELS = ("", "low", "medium", "high")
+
+WEEKDAYS = ("Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz")
+
+# Yayın saatleri varsayılan olarak Türkiye saatine göre gruplanır
+DEFAULT_UTC_OFFSET_HOURS = 3
+
+# Öne alma süresi histogramı: haftalık kovalar, son kova "daha uzun"
+LEAD_TIME_WEEKS = 26
+
+OBSERVATION_DTYPE = [("run_id", "i8"), ("observed_at", "f8"), ("target", "i4"), ("exam_day", "i4"), ("level", "i1")]
+
+EXPORT_QUERY = """
+SELECT o.run_id, o.observed_at, t.code,
+       CAST(julianday(o.exam_date) - 2440587.5 AS INTEGER),
+       CASE lower(o.level) WHEN 'low' THEN 1 WHEN 'medium' THEN 2 WHEN 'high' THEN 3 ELSE 0 END
+FROM observations o JOIN temp.target_codes t ON t.target_key = o.target_key
+WHERE o.observed_at >= ?
+"""
+
+
+# Hedef başına taranan ilk / son döngü (tarih bulunamayan taramalar dahil)
+SCAN_RUNS_QUERY = """
+SELECT rt.target_key, MIN(rt.run_id), MAX(rt.run_id)
+FROM run_targets rt JOIN runs r ON r.id = rt.run_id
+WHERE r.checked_at >= ?
+GROUP BY rt.target_key
+"""
+
+
+def _require_numpy():
+    if np is None:
+        raise SystemExit("❌ Analiz için numpy gerekli: pip install numpy")
+
+
+class Observations:
+    """Sütunlu gözlem kümesi: eşit uzunlukta NumPy dizileri + hedef sözlüğü"""
+
+    def __init__(self, columns, targets, venues, run_ids, run_times, scan_runs=None):
+        self.columns = columns          # run_id, observed_at, target, exam_day, level
+        self.targets = list(targets)    # kod → target_key
+        self.venues = list(venues)      # kod → venue adı
+        self.run_ids = run_ids          # tüm döngüler (sıralı), tarih bulunamayanlar dahil
+        self.run_times = run_times
+        # Hedef başına taranan ilk / son döngü id'si (n_targets × 2); -1 ya da None: bilinmiyor
+        self.scan_runs = scan_runs
+
+    def __len__(self):
+        return len(self.columns["run_id"])
+
+    @classmethod
+    def from_db(cls, path=DEFAULT_DB_PATH, since=None):
+        """Geçmiş veritabanını tek sorguda, satırları Python nesnesine çevirmeden okur"""
+        _require_numpy()
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            keys = conn.execute(
+                "SELECT target_key, MIN(venue) FROM observations GROUP BY target_key ORDER BY target_key"
+            ).fetchall()
+            conn.execute("CREATE TEMP TABLE target_codes (target_key TEXT PRIMARY KEY, code INTEGER)")
+            conn.executemany("INSERT INTO temp.target_codes VALUES (?, ?)",
+                             [(key, code) for code, (key, _) in enumerate(keys)])
+            rows = np.fromiter(conn.execute(EXPORT_QUERY, (since or 0,)), dtype=OBSERVATION_DTYPE)
+            runs = np.fromiter(conn.execute("SELECT id, checked_at FROM runs WHERE checked_at >= ? ORDER BY id",
+                                            (since or 0,)), dtype=[("id", "i8"), ("checked_at", "f8")])
+            try:
+                spans = {key: (first, last) for key, first, last in conn.execute(SCAN_RUNS_QUERY, (since or 0,))}
+            except sqlite3.OperationalError:
+                spans = {}  # run_targets tablosundan önceki geçmiş
+        finally:
+            conn.close()
+        columns = {name: np.ascontiguousarray(rows[name]) for name, _ in OBSERVATION_DTYPE}
+        scan_runs = np.array([spans.get(key, (-1, -1)) for key, _ in keys], dtype="i8").reshape(-1, 2)
+        return cls(columns, [k for k, _ in keys], [v for _, v in keys], runs["id"], runs["checked_at"], scan_runs)
+
+    @classmethod
+    def load(cls, path):
+        """export ile yazılmış .npz ya da .parquet dosyasını okur"""
+        _require_numpy()
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            table = pq.read_table(path)
+            meta = json.loads(table.schema.metadata[b"ielts"])
+            target = table.column("target_key").combine_chunks()
+            columns = {
+                "run_id": table.column("run_id").to_numpy(),
+                "observed_at": table.column("observed_at").cast("int64").to_numpy() / 1000.0,
+                "target": target.indices.to_numpy().astype("i4"),
+                "exam_day": table.column("exam_date").cast("int32").to_numpy(),
+                # Sözlük LEVELS sırasıyla yazılır; indeksler doğrudan seviye kodudur
+                "level": table.column("level").combine_chunks().indices.to_numpy().astype("i1"),
+            }
+            scan_runs = np.array(meta["scan_runs"], dtype="i8").reshape(-1, 2) if meta.get("scan_runs") else None
+            return cls(columns, target.dictionary.to_pylist(), meta["venues"],
+                       np.array(meta["run_ids"], dtype="i8"), np.array(meta["run_times"], dtype="f8"), scan_runs)
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name: data[name] for name, _ in OBSERVATION_DTYPE}
+            scan_runs = data["scan_runs"] if "scan_runs" in data.files else None
+            return cls(columns, data["targets"].tolist(), data["venues"].tolist(), data["run_ids"], data["run_times"],
+                       scan_runs)
+
+    def save(self, path):
+        """.parquet (pyarrow) ya da .npz olarak yazar; yazılan yolu döndürür"""
+        if path.endswith(".parquet"):
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                path = path[: -len(".parquet")] + ".npz"
+                logger.warning(f"⚠️ pyarrow kurulu değil, NumPy biçiminde yazılıyor: {path}")
+            else:
+                c = self.columns
+                table = pa.table({
+                    "run_id": c["run_id"],
+                    "observed_at": pa.array((c["observed_at"] * 1000).astype("i8"), pa.timestamp("ms")),
+                    "target_key": pa.DictionaryArray.from_arrays(c["target"], pa.array(self.targets, pa.string())),
+                    "venue": pa.DictionaryArray.from_arrays(c["target"], pa.array(self.venues, pa.string())),
+                    "exam_date": pa.array(c["exam_day"], pa.int32()).cast(pa.date32()),
+                    "level": pa.DictionaryArray.from_arrays(c["level"].astype("i1"), pa.array(LEVELS, pa.string())),
+                })
+                meta = {"venues": self.venues, "run_ids": self.run_ids.tolist(), "run_times": self.run_times.tolist(),
+                        "scan_runs": self.scan_runs.tolist() if self.scan_runs is not None else None}
+                table = table.replace_schema_metadata({"ielts": json.dumps(meta, ensure_ascii=False)})
+                pq.write_table(table, path, compression="zstd")
+                return path
+        extra = {"scan_runs": self.scan_runs} if self.scan_runs is not None else {}
+        np.savez_compressed(path, targets=np.array(self.targets, dtype=str), venues=np.array(self.venues, dtype=str),
+                            run_ids=self.run_ids, run_times=self.run_times, **extra, **self.columns)
+        return path if path.endswith(".npz") else path + ".npz"
+
+
+def _episodes(obs, gap_runs=1):
+    """
+    Gözlemleri slot bölümlerine (aynı hedef + sınav tarihi, kesintisiz döngüler)
+    ayırır. Her bölüm bir yayın olayıdır. Sözlük halinde paralel diziler döndürür.
+    """
+    c = obs.columns
+    run_ids = obs.run_ids if len(obs.run_ids) else np.unique(c["run_id"])
+    run_pos = np.searchsorted(run_ids, c["run_id"])
+    order = np.lexsort((run_pos, c["exam_day"], c["target"]))
+    target, exam_day, pos = c["target"][order], c["exam_day"][order], run_pos[order]
+    observed_at, level = c["observed_at"][order], c["level"][order]
+
+    new_slot = np.ones(len(order), dtype=bool)
+    new_slot[1:] = (target[1:] != target[:-1]) | (exam_day[1:] != exam_day[:-1])
+    new_episode = new_slot.copy()
+    new_episode[1:] |= (pos[1:] - pos[:-1]) > gap_runs
+    starts = np.flatnonzero(new_episode)
+    ends = np.append(starts[1:], len(order)) - 1
+
+    # Hedefin taranan ilk ve son döngüsü: sol / sağ sansür için. Tarama kaydı olmayan
+    # hedeflerde tüm döngülerin ilki / sonu; gözlemler kapsamı yalnızca genişletir
+    n_targets = len(obs.targets)
+    first_pos = np.zeros(n_targets, dtype="i8")
+    last_pos = np.full(n_targets, len(run_ids) - 1, dtype="i8")
+    if obs.scan_runs is not None and len(obs.scan_runs):
+        scan_runs = np.asarray(obs.scan_runs, dtype="i8")
+        known = scan_runs[:, 0] >= 0
+        first_pos[known] = np.searchsorted(run_ids, scan_runs[known, 0])
+        last_pos[known] = np.searchsorted(run_ids, scan_runs[known, 1])
+        np.minimum.at(first_pos, target, pos)
+        np.maximum.at(last_pos, target, pos)
+
+    t = target[starts]
+    return {
+        "target": t,
+        "exam_day": exam_day[starts],
+        "level": level[starts],
+        "first_seen": observed_at[starts],
+        "last_seen": observed_at[ends],
+        "observations": ends - starts + 1,
+        # Hedefin ilk taramasında zaten açıktı: yayın zamanı bilinmiyor
+        "left_censored": pos[starts] <= first_pos[t],
+        # Hedefin son taramasında hâlâ açık: ömrü henüz bitmedi
+        "right_censored": pos[ends] >= last_pos[t],
+    }
+
+
+def _percentiles(values, qs=(50, 90)):
+    if not len(values):
+        return {f"p{q}": None for q in qs}
+    return {f"p{q}": round(float(v), 2) for q, v in zip(qs, np.percentile(values, qs))}
+
+
+def analyze(obs, utc_offset_hours=DEFAULT_UTC_OFFSET_HOURS, gap_runs=1):
+    """Yayın histogramları, öne alma süresi, slot ömrü ve doluluk oranları"""
+    _require_numpy()
+    start = time.perf_counter()
+    ep = _episodes(obs, gap_runs)
+
+    released = ~ep["left_censored"]
+    local = ep["first_seen"][released] + utc_offset_hours * 3600
+    local_day = np.floor_divide(local, 86400).astype("i8")
+    hours = (np.mod(local, 86400) // 3600).astype("i8")
+    weekdays = (local_day + 3) % 7  # 1970-01-01 perşembe; pazartesi = 0
+    heatmap = np.bincount(weekdays * 24 + hours, minlength=7 * 24).reshape(7, 24)
+    lead_days = ep["exam_day"][released] - local_day
+    lead_weeks = np.clip(lead_days // 7, 0, LEAD_TIME_WEEKS)
+
+    # Kaybolan (sağ sansürsüz) bölümler: sınavdan önce kaybolduysa doldu, sonra ise süresi geçti
+    closed = ~ep["right_censored"]
+    exam_start = ep["exam_day"].astype("f8") * 86400 - utc_offset_hours * 3600
+    filled = closed & (ep["last_seen"] < exam_start)
+    lifetime_hours = (ep["last_seen"] - ep["first_seen"]) / 3600
+    tracked = filled & released  # ömrü tam bilinen slotlar
+
+    n_targets = len(obs.targets)
+    per_target = []
+    releases = np.bincount(ep["target"][released], minlength=n_targets)
+    closed_count = np.bincount(ep["target"][closed], minlength=n_targets)
+    filled_count = np.bincount(ep["target"][filled], minlength=n_targets)
+    open_count = np.bincount(ep["target"][~closed], minlength=n_targets)
+    tracked_target = ep["target"][tracked]
+    tracked_life = lifetime_hours[tracked]
+    order = np.argsort(tracked_target, kind="stable")
+    bounds = np.searchsorted(tracked_target[order], np.arange(n_targets + 1))
+    for code in range(n_targets):
+        lives = tracked_life[order[bounds[code]:bounds[code + 1]]]
+        per_target.append({
+            "target": obs.targets[code],
+            "venue": obs.venues[code],
+            "releases": int(releases[code]),
+            "open_now": int(open_count[code]),
+            "fill_rate": round(float(filled_count[code] / closed_count[code]), 3) if closed_count[code] else None,
+            "lifetime_hours": _percentiles(lives),
+        })
+
+    level_counts = np.bincount(obs.columns["level"].astype("i8"), minlength=len(LEVELS))
+    elapsed = time.perf_counter() - start
+    return {
+        "observations": len(obs),
+        "runs": int(len(obs.run_ids)),
+        "targets": n_targets,
+        "episodes": int(len(ep["target"])),
+        "releases": int(released.sum()),
+        "utc_offset_hours": utc_offset_hours,
+        "release_hour_histogram": np.bincount(hours, minlength=24).tolist(),
+        "release_weekday_histogram": heatmap.sum(axis=1).tolist(),
+        "release_heatmap": heatmap.tolist(),
+        "lead_time_weeks_histogram": np.bincount(lead_weeks, minlength=LEAD_TIME_WEEKS + 1).tolist(),
+        "lead_time_days": _percentiles(lead_days, (10, 50, 90)),
+        "lifetime_hours": _percentiles(lifetime_hours[tracked], (10, 50, 90)),
+        "fill_rate": round(float(filled.sum() / closed.sum()), 3) if closed.any() else None,
+        "level_share": {LEVELS[i] or "?": int(n) for i, n in enumerate(level_counts) if n},
+        "per_target": per_target,
+        "elapsed_seconds": round(elapsed, 3),
+    }
+
+
+def _bar(value, peak, width=30):
+    return "█" * int(round(width * value / peak)) if peak else ""
+
+
+def format_report(report, out=print):
+    """Raporu terminal için yazar"""
+    out(f"📊 {report['observations']:,} gözlem, {report['runs']:,} döngü, {report['targets']} hedef, "
+        f"{report['releases']:,} yayın ({report['elapsed_seconds']}s)")
+    hours = report["release_hour_histogram"]
+    out(f"\n🕒 Yayın saatleri (UTC{report['utc_offset_hours']:+d}):")
+    for hour, count in enumerate(hours):
+        if count:
+            out(f"   {hour:02d}:00 {count:>7} {_bar(count, max(hours))}")
+    weekdays = report["release_weekday_histogram"]
+    out("\n📆 Yayın günleri:")
+    for day, count in enumerate(weekdays):
+        out(f"   {WEEKDAYS[day]} {count:>7} {_bar(count, max(weekdays))}")
+    lead = report["lead_time_days"]
+    out(f"\n⏳ Yayından sınava kalan gün: p10={lead['p10']}, medyan={lead['p50']}, p90={lead['p90']}")
+    life = report["lifetime_hours"]
+    out(f"⌛ Slot ömrü (saat, dolanlar): p10={life['p10']}, medyan={life['p50']}, p90={life['p90']}")
+    out(f"🎟️ Doluluk oranı (sınavdan önce kaybolan): {report['fill_rate']}")
+    out("\n📍 Hedef başına:")
+    for item in sorted(report["per_target"], key=lambda x: -x["releases"]):
+        out(f"   {item['venue'][:28]:<28} yayın {item['releases']:>6}  açık {item['open_now']:>3}  "
+            f"doluluk {item['fill_rate'] if item['fill_rate'] is not None else '-':>5}  "
+            f"medyan ömür {item['lifetime_hours']['p50'] if item['lifetime_hours']['p50'] is not None else '-'} sa")
+
+
+def synthesize(venues=40, days=365, interval_minutes=10, seed=7):
+    """
+    Hız ölçümü için sentetik gözlem kümesi: her venue'de hafta içi sabah
+    yoğunlaşan yayınlar, üstel dağılımlı ömürler. Tamamen vektörel üretilir.
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    n_runs = days * 24 * 60 // interval_minutes
+    t0 = datetime(2025, 1, 1, tzinfo=timezone(timedelta(hours=DEFAULT_UTC_OFFSET_HOURS))).timestamp()
+    run_times = t0 + np.arange(n_runs) * interval_minutes * 60.0
+
+    n_episodes = venues * days * 2
+    target = rng.integers(0, venues, n_episodes).astype("i4")
+    day = rng.integers(0, days, n_episodes)
+    hour = np.clip(rng.normal(10, 2, n_episodes), 0, 23.9)
+    start_time = t0 + day * 86400 + hour * 3600
+    start_run = np.clip(np.searchsorted(run_times, start_time), 0, n_runs - 1)
+    length = np.maximum(1, rng.exponential(36 * 60 / interval_minutes, n_episodes).astype("i8"))
+    end_run = np.minimum(start_run + length, n_runs)
+    lead_days = rng.integers(14, 120, n_episodes)
+    exam_day = (np.floor_divide(run_times[start_run] + DEFAULT_UTC_OFFSET_HOURS * 3600, 86400) + lead_days).astype("i4")
+    level = rng.integers(1, len(LEVELS), n_episodes).astype("i1")
+
+    # Bölümleri döngü başına gözlemlere aç (np.repeat + kümülatif indeks)
+    counts = end_run - start_run
+    episode = np.repeat(np.arange(n_episodes), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    runs = start_run[episode] + offsets
+    columns = {
+        "run_id": runs + 1,
+        "observed_at": run_times[runs],
+        "target": target[episode],
+        "exam_day": exam_day[episode],
+        "level": level[episode],
+    }
+    targets = [f"Şehir{v}|Academic - IELTS|{1000 + v}" for v in range(venues)]
+    return Observations(columns, targets, [f"Venue {v}" for v in range(venues)],
+                        np.arange(1, n_runs + 1, dtype="i8"), run_times)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="IELTS müsaitlik geçmişi analizi")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_source(p):
+        p.add_argument("--db", default=DEFAULT_DB_PATH, help="Geçmiş veritabanı")
+        p.add_argument("--input", help="export ile yazılmış .npz / .parquet (veritabanı yerine)")
+        p.add_argument("--days", type=float, help="Yalnızca son N günün gözlemleri")
+
+    export = commands.add_parser("export", help="Gözlemleri sütunlu dosyaya yaz")
+    add_source(export)
+    export.add_argument("--out", required=True, help=".parquet (pyarrow) ya da .npz")
+
+    report = commands.add_parser("report", help="Yayın zamanları, ömür ve doluluk raporu")
+    add_source(report)
+    report.add_argument("--utc-offset", type=int, default=DEFAULT_UTC_OFFSET_HOURS)
+    report.add_argument("--gap-runs", type=int, default=1, help="Bu kadar döngüden uzun kesinti yeni yayın sayılır")
+    report.add_argument("--json", help="Raporu bu dosyaya yaz")
+
+    synth = commands.add_parser("synth", help="Hız ölçümü için sentetik gözlem kümesi üret")
+    synth.add_argument("--venues", type=int, default=40)
+    synth.add_argument("--days", type=int, default=365)
+    synth.add_argument("--interval", type=int, default=10, help="Dakika")
+    synth.add_argument("--out", required=True)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    _require_numpy()
+
+    if args.command == "synth":
+        start = time.perf_counter()
+        obs = synthesize(args.venues, args.days, args.interval)
+        path = obs.save(args.out)
+        print(f"🧪 {len(obs):,} gözlem üretildi ({time.perf_counter() - start:.1f}s): {path}")
+        return
+
+    start = time.perf_counter()
+    if args.input:
+        obs = Observations.load(args.input)
+    else:
+        if not os.path.exists(args.db):
+            sys.exit(f"ℹ️ Henüz geçmiş yok: {args.db}")
+        since = time.time() - args.days * 86400 if args.days else None
+        obs = Observations.from_db(args.db, since)
+    print(f"📥 {len(obs):,} gözlem okundu ({time.perf_counter() - start:.1f}s)")
+
+    if args.command == "export":
+        print(f"💾 {obs.save(args.out)}")
+        return
+
+    result = analyze(obs, args.utc_offset, args.gap_runs)
+    format_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel durum API'si: son kontrolün sonuçlarını bellekteki önbellekten sunar.
+
+Okumalar Selenium'a, veritabanına ya da siteye dokunmaz; her yayında gövde bir
+kez JSON'a çevrilip ETag'i hesaplanır, istekler hazır baytları yazar. asyncio
+tabanlı küçük bir HTTP/1.1 sunucusu (keep-alive) daemon içinde ayrı bir
+thread'de çalışır.
+
+    GET  /status    açık tarihler, kontrol zamanı, tazelik (If-None-Match → 304)
+    GET  /health    yalnızca tazelik özeti
+    POST /refresh   bir sonraki kontrolü hemen başlatır; API_REFRESH_MIN_SECONDS
+                    içinde tekrar istenirse 429 + Retry-After, kontrol zaten
+                    sürüyorsa aynı kontrole bağlanır (202)
+
+    curl -s http://127.0.0.1:8787/status
+    curl -s -X POST http://127.0.0.1:8787/refresh
+"""
+
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from email.utils import formatdate
+
+import ielts_metrics as metrics
+
+logger = logging.getLogger(__name__)
+
+# İstek satırı + başlıklar için üst sınır; daha büyüğü 431 ile reddedilir
+MAX_HEADER_BYTES = 16 * 1024
+
+# Boşta kalan keep-alive bağlantısı bu süre sonra kapatılır
+KEEPALIVE_TIMEOUT = 15
+
+# Tarih kaydındaki API'de yayınlanmayan alanlar (datetime nesnesi, tarayıcı iç bilgisi)
+_PRIVATE_FIELDS = {"date"}
+
+_REASONS = {
+    200: "OK", 202: "Accepted", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 429: "Too Many Requests", 431: "Request Header Fields Too Large",
+    503: "Service Unavailable",
+}
+
+
+def public_date(record):
+    """Tarih kaydının JSON'a yazılabilir kopyası"""
+    return {key: value for key, value in record.items() if key not in _PRIVATE_FIELDS}
+
+
+class Snapshot:
+    """Bir yayının değişmeyen, önceden serileştirilmiş hali"""
+
+    __slots__ = ("version", "checked_at", "dates", "scanned_targets", "source", "body", "etag", "last_modified",
+                 "error")
+
+    def __init__(self, version, checked_at, dates, scanned_targets, source, body, error=None):
+        self.version = version
+        self.checked_at = checked_at
+        self.dates = dates
+        self.scanned_targets = scanned_targets
+        self.source = source
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        self.last_modified = formatdate(checked_at, usegmt=True) if checked_at else None
+        self.error = error
+
+
+class StatusCache:
+    """
+    Son kontrol sonucunun tek kopyası. publish() tracker thread'inden çağrılır;
+    okuyucular snapshot referansını kilitsiz alır. wait_newer() ile bir sonraki
+    yayın beklenebilir (isteğe bağlı kontroller için).
+    """
+
+    def __init__(self, interval_seconds=None):
+        self.interval_seconds = interval_seconds
+        self._condition = threading.Condition()
+        self._snapshot = self._build(0, None, [], [], source="", error=None)
+
+    def _build(self, version, checked_at, dates, scanned_targets, source, error):
+        public = [public_date(d) for d in dates]
+        scanned_targets = sorted(scanned_targets)
+        payload = {
+            "checked_at": checked_at,
+            "checked_at_iso": datetime.fromtimestamp(checked_at).isoformat(timespec="seconds") if checked_at else None,
+            "source": source,
+            "interval_seconds": self.interval_seconds,
+            "count": len(public),
+            "scanned_targets": scanned_targets,
+            "error": error,
+            "dates": public,
+        }
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        return Snapshot(version, checked_at, public, scanned_targets, source, body, error)
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def publish(self, dates, scanned_targets=(), checked_at=None, source="daemon"):
+        """Başarılı bir kontrolün sonucunu yayınlar"""
+        with self._condition:
+            self._snapshot = self._build(self._snapshot.version + 1, checked_at or time.time(), dates,
+                                         scanned_targets, source, None)
+            self._condition.notify_all()
+        metrics.REGISTRY.set_gauge("api_snapshot_version", self._snapshot.version)
+        return self._snapshot
+
+    def publish_error(self, error):
+        """Başarısız kontrol: son bilinen tarihler korunur, hata ve eski kontrol zamanı görünür"""
+        with self._condition:
+            current = self._snapshot
+            self._snapshot = self._build(current.version + 1, current.checked_at, current.dates,
+                                         current.scanned_targets, current.source, str(error)[:300])
+            self._condition.notify_all()
+        return self._snapshot
+
+    def seed_from_history(self, store):
+        """Daemon açılışında geçmişteki açık slotlarla doldurur (ilk kontrol bitene kadar)"""
+        last_run = store.last_run()
+        if not last_run:
+            return None
+        dates = [{"venue": row["venue"], "date_str": row["exam_date"], "level": row["level"],
+                  "target_key": row["target_key"], "first_seen": row["first_seen"]}
+                 for row in store.current_slots()]
+        with self._condition:
+            self._snapshot = self._build(self._snapshot.version + 1, last_run["checked_at"], dates, [],
+                                         "history", None)
+            self._condition.notify_all()
+        return self._snapshot
+
+    def wait_newer(self, version, timeout=None):
+        """version'dan yeni bir yayın gelene kadar bekler; gelmezse None"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._snapshot.version <= version:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            return self._snapshot
+
+    def age(self):
+        """Son başarılı kontrolden bu yana geçen saniye; hiç kontrol yoksa None"""
+        checked_at = self._snapshot.checked_at
+        return max(0.0, time.time() - checked_at) if checked_at else None
+
+    def is_stale(self):
+        """Son kontrol beklenen aralığın iki katından eskiyse True"""
+        age = self.age()
+        if age is None:
+            return True
+        return bool(self.interval_seconds) and age > 2 * self.interval_seconds
+
+
+class RefreshGate:
+    """
+    İsteğe bağlı kontrol tetikleyicisi: en fazla min_interval saniyede bir
+    tetikler, kontrol sürerken gelen istekler aynı kontrole bağlanır.
+    trigger() zamanlayıcıyı uyandırır (ör. AdaptiveScheduler.request_run).
+    """
+
+    def __init__(self, trigger, min_interval=300):
+        self.trigger = trigger
+        self.min_interval = float(min_interval)
+        self._lock = threading.Lock()
+        self._last = None
+        self._running = False
+
+    def set_running(self, running):
+        """Tracker kontrol başlarken / biterken çağırır"""
+        with self._lock:
+            self._running = running
+
+    def request(self):
+        """("queued" | "running" | "limited", Retry-After saniyesi)"""
+        with self._lock:
+            if self._running:
+                return "running", 0
+            now = time.monotonic()
+            if self._last is not None and now - self._last < self.min_interval:
+                return "limited", int(self.min_interval - (now - self._last)) + 1
+            self._last = now
+        self.trigger()
+        metrics.REGISTRY.set_gauge("api_refresh_last_timestamp", int(time.time()))
+        logger.info("🔄 API üzerinden kontrol istendi")
+        return "queued", 0
+
+
+class StatusServer:
+    """asyncio HTTP sunucusu; start() kendi event loop'unu daemon thread'inde açar"""
+
+    def __init__(self, cache, host="127.0.0.1", port=8787, refresh_gate=None):
+        self.cache = cache
+        self.host = host
+        self.port = port
+        self.refresh_gate = refresh_gate
+        self.requests = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    # ---- HTTP ----
+
+    def _response(self, status, body=b"", headers=None, head_only=False, keep_alive=True):
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+        all_headers = {"Content-Type": "application/json; charset=utf-8", "Content-Length": str(len(body)),
+                       "Connection": "keep-alive" if keep_alive else "close"}
+        all_headers.update(headers or {})
+        lines += [f"{name}: {value}" for name, value in all_headers.items()]
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head if head_only or status == 304 else head + body
+
+    def _json(self, status, payload, headers=None, **kwargs):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        return self._response(status, body, headers, **kwargs)
+
+    def handle(self, method, path, headers, keep_alive=True):
+        """Tek isteğin yanıt baytları (ağdan bağımsız; test ve benchmark için de kullanılır)"""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        head_only = method == "HEAD"
+        if path in ("/", "/status"):
+            if method not in ("GET", "HEAD"):
+                return self._json(405, {"error": "GET"}, {"Allow": "GET, HEAD"}, keep_alive=keep_alive)
+            snapshot = self.cache.snapshot
+            age = self.cache.age()
+            cache_headers = {
+                "ETag": snapshot.etag,
+                "Cache-Control": "no-cache",
+                "Age": str(int(age)) if age is not None else "0",
+                "X-Stale": "1" if self.cache.is_stale() else "0",
+            }
+            if snapshot.last_modified:
+                cache_headers["Last-Modified"] = snapshot.last_modified
+            match = headers.get("if-none-match")
+            if match and (match.strip() == "*" or snapshot.etag in [m.strip() for m in match.split(",")]):
+                return self._response(304, b"", cache_headers, keep_alive=keep_alive)
+            return self._response(200, snapshot.body, cache_headers, head_only=head_only, keep_alive=keep_alive)
+        if path == "/health":
+            age = self.cache.age()
+            return self._json(200, {"version": self.cache.snapshot.version,
+                                    "age_seconds": round(age, 1) if age is not None else None,
+                                    "stale": self.cache.is_stale()}, keep_alive=keep_alive, head_only=head_only)
+        if path == "/refresh":
+            if method != "POST":
+                return self._json(405, {"error": "POST"}, {"Allow": "POST"}, keep_alive=keep_alive)
+            if self.refresh_gate is None:
+                return self._json(503, {"error": "refresh kapalı"}, keep_alive=keep_alive)
+            state, retry_after = self.refresh_gate.request()
+            payload = {"status": state, "version": self.cache.snapshot.version}
+            if state == "limited":
+                return self._json(429, payload, {"Retry-After": str(retry_after)}, keep_alive=keep_alive)
+            return self._json(202, payload, keep_alive=keep_alive)
+        return self._json(404, {"error": "bulunamadı"}, keep_alive=keep_alive)
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except asyncio.LimitOverrunError:
+                    writer.write(self._json(431, {"error": "başlık çok büyük"}, keep_alive=False))
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                lines = raw.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(self._json(400, {"error": "geçersiz istek"}, keep_alive=False))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                # Gövde kullanılmıyor, ama bağlantıda sonraki isteğe karışmaması için okunur
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version != "HTTP/1.0" or connection == "keep-alive")
+                self.requests += 1
+                writer.write(self.handle(method.upper(), target, headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Sunucu kapanıyor; bağlantı görevi sessizce biter
+            pass
+        finally:
+            writer.close()
+
+    # ---- yaşam döngüsü ----
+
+    async def _start(self):
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._start())
+        except OSError as e:
+            logger.warning(f"⚠️ Durum API'si başlatılamadı ({self.host}:{self.port}): {e}")
+            self._ready.set()
+            return
+        self._ready.set()
+        self._loop.run_forever()
+        # Açık keep-alive bağlantıları kapatılır, sonra loop
+        self._server.close()
+        tasks = asyncio.all_tasks(self._loop)
+        for task in tasks:
+            task.cancel()
+        self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def start(self):
+        """Sunucuyu arka planda başlatır; dinlenemiyorsa None"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="status-api", daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        if self._server is None:
+            return None
+        logger.info(f"🌐 Durum API'si: http://{self.host}:{self.port}/status")
+        return self
+
+    def shutdown(self):
+        if self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+
+
+def start_status_server(cache, host="127.0.0.1", port=8787, refresh_gate=None):
+    """Durum API'sini arka planda başlatır; başlatılamazsa None"""
+    return StatusServer(cache, host, port, refresh_gate).start()
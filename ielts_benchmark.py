@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel mock booking sitesine karşı çevrimdışı uçtan uca benchmark.
+IELTSTracker.run_check veya IELTSChecker.run_single_check'i tekrar eden
+döngülerde çalıştırır; adım bazlı ve uçtan uca süreleri, WebDriver komut
+sayılarını ve süreç ağacının tepe RSS'ini ölçer. Sonuçlar JSON olarak
+kaydedilir ve önceki bir çalıştırmayla karşılaştırılabilir.
+
+    python ielts_benchmark.py --target tracker --cycles 5 --delay 0.05
+    python ielts_benchmark.py --target single --compare bench_results/benchmark-tracker-20250701-120000.json
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from ielts_fixture_server import start_fixture_server, load_fixture
+from ielts_metrics import REGISTRY
+from ielts_supervisor import tree_rss
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULTS_DIR = "bench_results"
+
+# Her iki giriş noktasında da bulunan ve ayrı ölçülen adımlar
+PHASES = ("setup_driver", "open_cached_results", "fill_registration_form", "check_available_dates")
+
+
+class CommandCounter:
+    """WebDriver.execute çağrılarını komut adına göre sayar"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = Counter()
+        self._original = None
+
+    def install(self):
+        from selenium.webdriver.remote.webdriver import WebDriver
+        original = WebDriver.execute
+        counter = self
+
+        def execute(driver, driver_command, params=None):
+            with counter._lock:
+                counter.counts[driver_command] += 1
+            return original(driver, driver_command, params)
+
+        self._original = original
+        WebDriver.execute = execute
+
+    def uninstall(self):
+        if self._original is not None:
+            from selenium.webdriver.remote.webdriver import WebDriver
+            WebDriver.execute = self._original
+            self._original = None
+
+    def take(self):
+        """Sayaçları döndürür ve sıfırlar"""
+        with self._lock:
+            counts, self.counts = self.counts, Counter()
+        return counts
+
+
+class PhaseTimer:
+    """Sınıf metotlarını sarmalayıp çağrı sürelerini adım adına göre toplar"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings = defaultdict(list)
+
+    def wrap(self, cls, name):
+        original = getattr(cls, name)
+        timer = self
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with timer._lock:
+                    timer.timings[name].append(elapsed)
+
+        setattr(cls, name, timed)
+
+    def take(self):
+        """Toplanan süreleri döndürür ve sıfırlar"""
+        with self._lock:
+            timings, self.timings = dict(self.timings), defaultdict(list)
+        return timings
+
+
+class RssSampler:
+    """Arka plan thread'inde süreç ağacının tepe RSS'ini örnekler"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._use_proc = os.path.isdir("/proc")
+
+    def sample(self):
+        if self._use_proc:
+            return tree_rss(os.getpid())
+        # /proc olmayan sistemlerde (macOS) yalnızca bu süreç ve beklenen çocuklar
+        import resource
+        scale = 1 if sys.platform == "darwin" else 1024
+        return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * scale
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.sample())
+            self._stop.wait(self.interval)
+
+    def reset(self):
+        self.peak = self.sample()
+
+    def start(self):
+        self.reset()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+
+def summarize(values):
+    """Süre listesinin özet istatistikleri (saniye)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "n": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+
+def state_paths(workdir, subscriptions=False):
+    """Çalışma dizinine yönlendirilen tüm durum dosyaları (ayar adı → yol)"""
+    paths = {
+        "selector_stats_path": "selector_stats.json",
+        "history_db_path": "ielts_history.db",
+        "session_cache_path": "session_cache.json",
+        "snapshot_path": "ielts_snapshots.jsonl.gz",
+        "queue_db_path": "ielts_queue.db",
+        "rate_limit_path": "ielts_ratelimit.json",
+        "circuit_breaker_path": "ielts_breaker.json",
+        "command_offset_path": "telegram_offset.json",
+        "log_path": "ielts_benchmark.log",
+    }
+    if subscriptions:
+        paths["subscriptions_db_path"] = "ielts_subscriptions.db"
+    return {key: os.path.join(workdir, name) for key, name in paths.items()}
+
+
+def prepare_tracker(base_url, workdir, args):
+    """ielts_tracker için sentetik config modülü kurar ve (sınıf, çalıştırıcı) döndürür"""
+    config = types.ModuleType("config")
+    config.TELEGRAM_BOT_TOKEN = ""
+    config.CHAT_ID = ""
+    config.USERNAME = ""
+    config.PASSWORD = ""
+    config.BASE_URL = base_url
+    config.COUNTRY_ID = "212"
+    config.LOCATION = "Ankara"
+    config.TEST_TYPE = "Academic - IELTS"
+    config.TARGET_MONTHS = args.target_months
+    config.TARGET_YEAR = args.target_year
+    config.TARGET_RANGE = args.target_range
+    config.CHECK_INTERVAL_MINUTES = 5
+    config.HEADLESS_MODE = True
+    config.IMPLICIT_WAIT = 0
+    config.ENABLE_POSITIVE_NOTIFICATIONS = True
+    config.ENABLE_NEGATIVE_NOTIFICATIONS = True
+    config.CHROME_BINARY = args.chrome_binary
+    config.PERSISTENT_SESSION = not args.cold
+    config.ENGINE = args.engine
+    config.LEAN_MODE = not args.no_lean
+    for key, path in state_paths(workdir).items():
+        setattr(config, key.upper(), path)
+    sys.modules["config"] = config
+
+    import ielts_tracker
+    tracker = ielts_tracker.IELTSTracker()
+    return ielts_tracker.IELTSTracker, tracker.run_check, tracker.shutdown, ielts_tracker.notifier
+
+
+def prepare_single(base_url, workdir, args):
+    """ielts_single_check için ortam değişkenlerini kurar ve (sınıf, çalıştırıcı) döndürür"""
+    os.environ.update({
+        "TELEGRAM_BOT_TOKEN": "",
+        "CHAT_ID": "",
+        "BASE_URL": base_url,
+        "COUNTRY_ID": "212",
+        "LOCATION": "Ankara",
+        "TEST_TYPE": "Academic - IELTS",
+        "TARGET_MONTHS": ",".join(str(m) for m in args.target_months),
+        "TARGET_YEAR": str(args.target_year),
+        "TARGET_RANGE": args.target_range or "",
+        "HEADLESS_MODE": "True",
+        "IMPLICIT_WAIT": "0",
+        "ENGINE": args.engine,
+        "LEAN_MODE": "False" if args.no_lean else "True",
+    })
+    # Abonelik DB'si yalnızca ortamda açıksa (gerçek DB'ye yazılmasın diye) yönlendirilir
+    subscriptions = os.environ.get("SUBSCRIPTIONS_DB_PATH", "").strip().lower() not in ("", "none")
+    os.environ.update({key.upper(): path for key, path in state_paths(workdir, subscriptions).items()})
+    os.environ["METRICS_SUMMARY_PATH"] = os.path.join(workdir, "ielts_metrics.json")
+
+    import ielts_single_check
+    checker = ielts_single_check.IELTSChecker()
+    return ielts_single_check.IELTSChecker, checker.run_single_check, checker.shutdown, ielts_single_check.notifier
+
+
+def run_benchmark(args):
+    """Benchmark'ı çalıştırır ve sonuç sözlüğünü döndürür"""
+    fixture = load_fixture(args.fixture)
+    server, base_url = start_fixture_server(fixture=fixture, delay=args.delay, page_delay=args.page_delay)
+    workdir = tempfile.mkdtemp(prefix="ielts-bench-")
+    logger.info(f"🧪 Mock site: {base_url} (çalışma dizini: {workdir})")
+
+    commands = CommandCounter()
+    phases = PhaseTimer()
+    sampler = RssSampler()
+
+    prepare = prepare_tracker if args.target == "tracker" else prepare_single
+    cls, run_once, shutdown, notifier = prepare(base_url, workdir, args)
+
+    found = []
+    original_scan = cls.scan_all_targets
+
+    def scan_all_targets(self):
+        dates, scanned = original_scan(self)
+        found.append(len(dates) if dates is not None else None)
+        return dates, scanned
+
+    cls.scan_all_targets = scan_all_targets
+    for name in PHASES:
+        phases.wrap(cls, name)
+    commands.install()
+
+    cycles = []
+    sampler.start()
+    try:
+        for index in range(args.cycles):
+            sampler.reset()
+            start = time.perf_counter()
+            run_once()
+            elapsed = time.perf_counter() - start
+            cycle = {
+                "cycle": index + 1,
+                "end_to_end": elapsed,
+                "phases": {name: sum(values) for name, values in phases.take().items()},
+                "commands": dict(commands.take()),
+                "peak_rss": sampler.peak,
+                "dates_found": found[-1] if found else None,
+            }
+            cycle["command_total"] = sum(cycle["commands"].values())
+            cycles.append(cycle)
+            logger.info(f"⏱️ Döngü {index + 1}/{args.cycles}: {elapsed:.2f}s, "
+                        f"{cycle['command_total']} WebDriver komutu, "
+                        f"tepe RSS {cycle['peak_rss'] / 1048576:.0f} MB, {cycle['dates_found']} tarih")
+    finally:
+        shutdown()
+        sampler.stop()
+        commands.uninstall()
+        notifier.close(timeout=5)
+        server.shutdown()
+
+    # İlk döngü tarayıcı başlatmayı içerir; sıcak döngüler ayrıca raporlanır
+    warm = cycles[1:] if len(cycles) > 1 else cycles
+    return {
+        "target": args.target,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "settings": {
+            "cycles": args.cycles,
+            "delay": args.delay,
+            "page_delay": args.page_delay,
+            "engine": args.engine,
+            "lean": not args.no_lean,
+            "cold": args.cold,
+            "fixture": args.fixture,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "summary": {
+            "end_to_end": summarize([c["end_to_end"] for c in cycles]),
+            "end_to_end_warm": summarize([c["end_to_end"] for c in warm]),
+            "phases": {name: summarize([c["phases"][name] for c in cycles if name in c["phases"]])
+                       for name in PHASES},
+            "commands_per_cycle": statistics.fmean(c["command_total"] for c in cycles) if cycles else 0,
+            "peak_rss": max((c["peak_rss"] for c in cycles), default=0),
+        },
+        "cycles": cycles,
+        # Uygulamanın kendi adım metrikleri (ielts_metrics)
+        "metrics": REGISTRY.snapshot(),
+    }
+
+
+def save_results(results, results_dir=DEFAULT_RESULTS_DIR):
+    """Sonuçları results_dir altına zaman damgalı JSON olarak yazar"""
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(results_dir, f"benchmark-{results['target']}-{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def _metrics(results):
+    """Karşılaştırılan metrikler: ad → değer"""
+    summary = results["summary"]
+    metrics = {}
+    for key in ("end_to_end", "end_to_end_warm"):
+        if summary.get(key):
+            metrics[f"{key}.p50 (s)"] = summary[key]["p50"]
+            metrics[f"{key}.mean (s)"] = summary[key]["mean"]
+    for name, stats in summary.get("phases", {}).items():
+        if stats:
+            metrics[f"{name}.p50 (s)"] = stats["p50"]
+    metrics["commands_per_cycle"] = summary.get("commands_per_cycle", 0)
+    metrics["peak_rss (MB)"] = summary.get("peak_rss", 0) / 1048576
+    return metrics
+
+
+def compare(current, baseline):
+    """İki çalıştırmanın metriklerini yan yana gösteren satırlar"""
+    now, before = _metrics(current), _metrics(baseline)
+    lines = [f"{'metrik':<36}{'önce':>12}{'şimdi':>12}{'fark':>10}"]
+    for name in now:
+        if name not in before:
+            continue
+        old, new = before[name], now[name]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+        lines.append(f"{name:<36}{old:>12.3f}{new:>12.3f}{change:>10}")
+    return "\n".join(lines)
+
+
+def format_summary(results):
+    """Özet tabloyu okunabilir satırlara çevirir"""
+    lines = [f"🏁 {results['target']} benchmark ({results['settings']['cycles']} döngü)"]
+    for name, value in _metrics(results).items():
+        lines.append(f"   {name:<36}{value:>10.3f}")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock booking sitesine karşı çevrimdışı benchmark")
+    parser.add_argument("--target", choices=("tracker", "single"), default="tracker",
+                        help="tracker: IELTSTracker.run_check, single: IELTSChecker.run_single_check")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.0, help="Mock JSON yanıt gecikmesi (saniye)")
+    parser.add_argument("--page-delay", type=float, default=0.0, help="Mock booking sayfası gecikmesi (saniye)")
+    parser.add_argument("--fixture", help="Müsaitlik verisini içeren JSON fixture")
+    parser.add_argument("--engine", choices=("selenium", "http"), default="selenium")
+    parser.add_argument("--no-lean", action="store_true", help="Yalın profili kapat")
+    parser.add_argument("--cold", action="store_true", help="Tracker'da kalıcı oturumu kapat (her döngüde yeni tarayıcı)")
+    parser.add_argument("--chrome-binary", default=None, help="Chrome binary path (varsayılan: sistemdeki Chrome)")
+    parser.add_argument("--target-months", default="7,8")
+    parser.add_argument("--target-year", type=int, default=2025)
+    parser.add_argument("--target-range", default=None,
+                        help="Yıl sınırını aşabilen ay aralığı (ör. 2025-11..2026-02); datepicker atlamalarını ölçer")
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args(argv)
+    args.target_months = [int(m) for m in args.target_months.split(",") if m.strip()]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    results = run_benchmark(args)
+    path = save_results(results, args.results_dir)
+    print(format_summary(results))
+    print(f"💾 Sonuçlar kaydedildi: {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print(compare(results, json.load(f)))
+
+
+if __name__ == "__main__":
+    main()
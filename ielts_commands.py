@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Telegram komutları: daemon getUpdates ile uzun yoklama (long polling) yapar,
+offset'i dosyada tutar (yeniden başlatmada aynı komut iki kez işlenmez).
+
+    /check        güncel tarihler; son kontrol COMMAND_CACHE_TTL_SECONDS'dan
+                  yeniyse önbellekten, değilse bir kontrol başlatılıp sonucu
+                  beklenir. Aynı anda gelen /check'ler tek kontrolü paylaşır.
+    /status       son kontrolün özeti (kontrol başlatmaz)
+    /subscribe    [şehir,...] [ay aralığı]  ör. /subscribe Ankara 2025-11..2026-02
+    /unsubscribe  bu chat'in tüm abonelikleri
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import ielts_metrics as metrics
+from ielts_notifier import PRIORITY_POSITIVE, PRIORITY_ERROR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OFFSET_PATH = "telegram_offset.json"
+
+# getUpdates uzun yoklama süresi (saniye); istek zaman aşımı biraz daha uzun tutulur
+POLL_TIMEOUT = 25
+
+# Bu süreden eski mesajlar (ör. bot kapalıyken birikenler) yanıtlanmaz
+MAX_MESSAGE_AGE = 300
+
+# /check yanıtlarını bekleyen işçi sayısı; bekleyenler aynı kontrolü paylaştığı, sonrakiler
+# önbellekten yanıtlandığı için küçük tutulur
+HANDLER_WORKERS = 4
+
+_MONTHS_PATTERN = re.compile(r"^\d{4}-\d{1,2}(\.\.\d{4}-\d{1,2})?(,\d{4}-\d{1,2}(\.\.\d{4}-\d{1,2})?)*$")
+
+HELP_TEXT = (
+    "🤖 <b>IELTS Takip Botu komutları</b>\n\n"
+    "/check - Güncel tarihler (gerekirse yeni kontrol)\n"
+    "/status - Son kontrolün özeti\n"
+    "/subscribe [şehir,...] [2025-11..2026-02] - Yeni tarihlerde bildirim al\n"
+    "/unsubscribe - Bildirimleri kapat"
+)
+
+
+class SingleFlight:
+    """
+    Aynı anda gelen çağrılar tek bir fn() çalıştırmasını paylaşır: ilk çağıran
+    çalıştırır, çalışma sürerken gelenler aynı sonucu (ya da istisnayı) alır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flight = None
+        self.joined = 0
+
+    def do(self, fn):
+        """(sonuç, paylaşıldı mı) döndürür"""
+        with self._lock:
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = {"done": threading.Event(), "result": None, "error": None}
+            else:
+                self.joined += 1
+        if not leader:
+            flight["done"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["result"], True
+        try:
+            flight["result"] = fn()
+            return flight["result"], False
+        except Exception as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._flight = None
+            flight["done"].set()
+
+
+def format_snapshot(snapshot, title="📋 <b>Güncel IELTS Tarihleri</b>"):
+    """Durum önbelleğindeki sonucu mesaja çevirir (venue başına sıralı tarihler)"""
+    if not snapshot.checked_at:
+        return "ℹ️ Henüz kontrol yapılmadı."
+    checked = datetime.fromtimestamp(snapshot.checked_at)
+    age_minutes = max(0, int((time.time() - snapshot.checked_at) // 60))
+    footer = f"⏰ Son kontrol: {checked.strftime('%H:%M:%S')} ({age_minutes} dk önce)"
+    if snapshot.error:
+        footer += f"\n⚠️ Son deneme başarısız: {snapshot.error}"
+    if not snapshot.dates:
+        return f"❌ Müsait IELTS tarihi yok.\n{footer}"
+
+    venues = {}
+    for record in snapshot.dates:
+        venues.setdefault(record["venue"], set()).add(record["date_str"])
+    message = f"{title}\n\n"
+    for venue, dates in venues.items():
+        message += f"📍 <b>{venue}</b>\n"
+        for date_str in sorted(dates):
+            message += f"   📅 {datetime.strptime(date_str, '%Y-%m-%d').strftime('%d %B %Y - %A')}\n"
+        message += "\n"
+    return message + footer
+
+
+def parse_subscribe_args(text):
+    """"/subscribe Ankara,Istanbul 2025-11..2026-02" → (şehirler, ay filtresi)"""
+    locations, months = [], ""
+    for token in text.split()[1:]:
+        if _MONTHS_PATTERN.match(token):
+            months = token
+        else:
+            locations.extend(x.strip() for x in token.split(",") if x.strip())
+    return locations, months
+
+
+class CommandBot:
+    """
+    getUpdates döngüsü ve komut yönlendirmesi. /check, tracker'ın durum
+    önbelleği (StatusCache) ve kontrol tetikleyicisi (RefreshGate) üzerinden
+    çalışır; tarayıcıyı yalnızca zamanlayıcı thread'i kullanır.
+    """
+
+    def __init__(self, notifier, status_cache, refresh_gate=None, subscriptions_db_path=None,
+                 offset_path=DEFAULT_OFFSET_PATH, cache_ttl=120, check_timeout=600):
+        self.notifier = notifier
+        self.status_cache = status_cache
+        self.refresh_gate = refresh_gate
+        self.subscriptions_db_path = subscriptions_db_path
+        self.offset_path = offset_path
+        self.cache_ttl = cache_ttl
+        self.check_timeout = check_timeout
+        self.offset = self._load_offset()
+        self.flight = SingleFlight()
+        self.cache_hits = 0
+        self._session = None
+        self._subscriptions = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(HANDLER_WORKERS, thread_name_prefix="telegram-command")
+        self.handlers = {
+            "/start": self.cmd_help,
+            "/help": self.cmd_help,
+            "/check": self.cmd_check,
+            "/status": self.cmd_status,
+            "/subscribe": self.cmd_subscribe,
+            "/unsubscribe": self.cmd_unsubscribe,
+        }
+
+    # ---- offset ----
+
+    def _load_offset(self):
+        if not self.offset_path or not os.path.exists(self.offset_path):
+            return 0
+        try:
+            with open(self.offset_path, encoding="utf-8") as f:
+                return int(json.load(f).get("offset", 0))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Telegram offset okunamadı ({self.offset_path}): {e}")
+            return 0
+
+    def _save_offset(self):
+        if not self.offset_path:
+            return
+        tmp_path = f"{self.offset_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"offset": self.offset, "updated_at": time.time()}, f)
+            os.replace(tmp_path, self.offset_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Telegram offset yazılamadı: {e}")
+
+    # ---- yoklama ----
+
+    @property
+    def session(self):
+        """Uzun yoklamaya ayrılmış oturum; gönderim havuzunu meşgul etmez"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def poll_once(self, timeout=POLL_TIMEOUT):
+        """Tek getUpdates çağrısı; gelen güncellemeleri işler ve sayısını döndürür"""
+        params = {"timeout": timeout, "allowed_updates": json.dumps(["message"])}
+        if self.offset:
+            params["offset"] = self.offset
+        response = self.session.get(self.notifier.api_url("getUpdates"), params=params, timeout=timeout + 10)
+        result = response.json()
+        if not result.get("ok"):
+            if response.status_code == 409:
+                # Webhook tanımlı ya da aynı token'la başka bir süreç yokluyor
+                raise RuntimeError(f"getUpdates çakışması: {result.get('description', '')}")
+            raise RuntimeError(f"getUpdates hatası: {result}")
+
+        updates = result.get("result", [])
+        for update in updates:
+            self.offset = max(self.offset, update["update_id"] + 1)
+            try:
+                self.dispatch(update)
+            except Exception as e:
+                logger.error(f"❌ Telegram komutu işlenemedi: {e}")
+        if updates:
+            self._save_offset()
+        return len(updates)
+
+    def run(self):
+        """Durdurulana kadar yoklar; hatada geri çekilir"""
+        logger.info("🤖 Telegram komutları dinleniyor (/check, /status, /subscribe)")
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                delay = min(300, 5 * 2 ** min(failures - 1, 6))
+                logger.warning(f"⚠️ Telegram yoklama hatası, {delay}s sonra tekrar: {e}")
+                self._stop.wait(delay)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="telegram-commands", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
+        if self._subscriptions is not None:
+            self._subscriptions.close()
+
+    # ---- komutlar ----
+
+    def dispatch(self, update):
+        """Mesajdaki komutu ilgili işleyiciye yönlendirir"""
+        message = update.get("message") or {}
+        text = (message.get("text") or "").strip()
+        chat_id = (message.get("chat") or {}).get("id")
+        if not text.startswith("/") or chat_id is None:
+            return
+        if time.time() - message.get("date", 0) > MAX_MESSAGE_AGE:
+            logger.info(f"⏭️ Eski komut atlandı: {text.split()[0]}")
+            return
+        # "/check@BotAdi" biçimi grup sohbetlerinde kullanılır
+        command = text.split()[0].split("@", 1)[0].lower()
+        handler = self.handlers.get(command)
+        if handler is None:
+            self.reply(chat_id, HELP_TEXT)
+            return
+        logger.info(f"💬 {command} komutu ({chat_id})")
+        if handler == self.cmd_check:
+            # Kontrol sonucunu bekleyebilir; yoklama thread'ini ve diğer komutları bloklamaz
+            self._executor.submit(self._handle, handler, chat_id, text, message)
+        else:
+            self._handle(handler, chat_id, text, message)
+
+    def _handle(self, handler, chat_id, text, message):
+        start = time.monotonic()
+        try:
+            handler(chat_id, text, message)
+            metrics.REGISTRY.observe("telegram_command", time.monotonic() - start, ok=True)
+        except Exception as e:
+            metrics.REGISTRY.observe("telegram_command", time.monotonic() - start, ok=False)
+            logger.error(f"❌ Komut hatası ({text.split()[0]}): {e}")
+            self.reply(chat_id, f"⚠️ Komut işlenemedi: {e}", PRIORITY_ERROR)
+
+    def reply(self, chat_id, text, priority=PRIORITY_POSITIVE):
+        return self.notifier.send(text, priority, chat_id=chat_id)
+
+    def cmd_help(self, chat_id, text, message):
+        self.reply(chat_id, HELP_TEXT)
+
+    def cmd_status(self, chat_id, text, message):
+        self.reply(chat_id, format_snapshot(self.status_cache.snapshot, "📊 <b>Son Kontrol</b>"))
+
+    def _fresh_check(self):
+        """Kontrolü tetikler ve sonucunu bekler (SingleFlight içinde, aynı anda tek kez)"""
+        version = self.status_cache.snapshot.version
+        state, retry_after = self.refresh_gate.request()
+        if state == "limited":
+            return None, retry_after
+        snapshot = self.status_cache.wait_newer(version, self.check_timeout)
+        return snapshot, 0
+
+    def cmd_check(self, chat_id, text, message):
+        age = self.status_cache.age()
+        if age is not None and age <= self.cache_ttl and not self.status_cache.snapshot.error:
+            self.cache_hits += 1
+            metrics.REGISTRY.set_gauge("telegram_check_cache_hits", self.cache_hits)
+            self.reply(chat_id, format_snapshot(self.status_cache.snapshot))
+            return
+        if self.refresh_gate is None:
+            self.reply(chat_id, format_snapshot(self.status_cache.snapshot))
+            return
+
+        self.reply(chat_id, "🔄 Kontrol başlatıldı, sonuç birazdan gelecek...")
+        (snapshot, retry_after), shared = self.flight.do(self._fresh_check)
+        if shared:
+            metrics.REGISTRY.set_gauge("telegram_check_coalesced", self.flight.joined)
+            logger.info(f"🔗 /check devam eden kontrole bağlandı ({chat_id})")
+        if snapshot is None and retry_after:
+            self.reply(chat_id, format_snapshot(self.status_cache.snapshot) +
+                       f"\n⏳ Yeni kontrol {retry_after}s sonra yapılabilir.")
+        elif snapshot is None:
+            self.reply(chat_id, "⚠️ Kontrol zamanında tamamlanmadı; /status ile daha sonra bakın.", PRIORITY_ERROR)
+        else:
+            self.reply(chat_id, format_snapshot(snapshot))
+
+    def subscription_store(self):
+        if self._subscriptions is None and self.subscriptions_db_path:
+            from ielts_subscriptions import SubscriptionStore
+            self._subscriptions = SubscriptionStore(self.subscriptions_db_path)
+        return self._subscriptions
+
+    def cmd_subscribe(self, chat_id, text, message):
+        store = self.subscription_store()
+        if store is None:
+            self.reply(chat_id, "ℹ️ Abonelikler kapalı (SUBSCRIPTIONS_DB_PATH tanımlı değil).")
+            return
+        from ielts_subscriptions import describe_subscription
+        locations, months = parse_subscribe_args(text)
+        name = (message.get("from") or {}).get("first_name", "")
+        try:
+            subscription_id = store.add(chat_id, name, locations, months=months)
+        except ValueError as e:
+            self.reply(chat_id, f"⚠️ Geçersiz ay filtresi: {e}\nÖrnek: /subscribe Ankara 2025-11..2026-02")
+            return
+        subscription = next(s for s in store.subscriptions(chat_id) if s.id == subscription_id)
+        logger.info(f"👥 Telegram'dan abonelik eklendi: #{subscription_id} ({chat_id})")
+        self.reply(chat_id, f"✅ Abonelik #{subscription_id}: {describe_subscription(subscription)}")
+
+    def cmd_unsubscribe(self, chat_id, text, message):
+        store = self.subscription_store()
+        if store is None:
+            self.reply(chat_id, "ℹ️ Abonelikler kapalı (SUBSCRIPTIONS_DB_PATH tanımlı değil).")
+            return
+        count = store.remove(chat_id=chat_id)
+        self.reply(chat_id, f"🗑️ {count} abonelik kaldırıldı." if count else "ℹ️ Aktif aboneliğiniz yok.")
+
+
+def start_command_bot(notifier, status_cache, refresh_gate=None, subscriptions_db_path=None,
+                      offset_path=DEFAULT_OFFSET_PATH, cache_ttl=120, check_timeout=600):
+    """Komut döngüsünü arka planda başlatır; token yoksa None"""
+    if not notifier.token:
+        logger.warning("⚠️ TELEGRAM_BOT_TOKEN tanımlı değil, Telegram komutları kapalı")
+        return None
+    return CommandBot(notifier, status_cache, refresh_gate, subscriptions_db_path, offset_path,
+                      cache_ttl, check_timeout).start()
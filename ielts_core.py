@@ -0,0 +1,1246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Daemon (ielts_tracker.py) ve tek seferlik kontrolün (ielts_single_check.py)
+paylaştığı çekirdek: ayarlar, tarayıcı kurulumu, form doldurma, tarih okuma,
+HTTP motoru, geçmiş ve bildirim.
+
+Selenium, requests ve HTTP motoru yalnızca kullanıldıkları metotların içinde
+import edilir; tarayıcı gerektirmeyen modlar (status, dry-run, notify-only)
+bu bağımlılıkları hiç yüklemeden milisaniyeler içinde başlar.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+
+import ielts_metrics as metrics
+from ielts_scan import ScanPool, ScanTarget, load_targets, describe, target_key
+from ielts_history import AvailabilityStore, slot_target_key
+from ielts_datepicker import target_periods, format_periods
+from ielts_notifier import PRIORITY_POSITIVE, PRIORITY_ERROR, PRIORITY_NEGATIVE
+
+logger = logging.getLogger(__name__)
+
+LINUX_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+MAC_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Devre açıkken worker'ın durumu yeniden kontrol etme aralığı (saniye)
+CIRCUIT_POLL_SECONDS = 60
+
+# Ayar adı → varsayılan değer. config.py'de büyük harfli adıyla, ortamda aynı
+# adlı environment variable ile verilir; tür varsayılan değerden çıkarılır.
+DEFAULTS = {
+    "telegram_bot_token": "",
+    "chat_id": "",
+    "username": "",
+    "password": "",
+    "base_url": "https://ielts.idp.com/book/IELTS",
+    "country_id": "212",
+    "location": "Ankara",
+    "test_type": "Academic - IELTS",
+    "target_months": [7, 8],
+    "target_year": 2025,
+    "target_range": None,
+    "check_interval_minutes": 30,
+    "headless_mode": True,
+    "implicit_wait": 10,
+    "enable_positive_notifications": True,
+    "enable_negative_notifications": True,
+    "engine": "selenium",
+    "venue_id": "1771",
+    "venue_name": "Bilkent University",
+    "scan_targets": None,
+    "scan_pool_size": 2,
+    "selector_stats_path": "selector_stats.json",
+    "history_db_path": "ielts_history.db",
+    "subscriptions_db_path": None,
+    "session_cache_path": "session_cache.json",
+    "session_ttl_minutes": 720,
+    # Sayfa snapshot'ları (bkz. ielts_snapshots): off, empty, all
+    "snapshot_mode": "empty",
+    "snapshot_path": "ielts_snapshots.jsonl.gz",
+    "snapshot_max_mb": 50,
+    # Koordinatör / worker modu (bkz. ielts_queue): standalone, coordinator, worker
+    "queue_role": "standalone",
+    "queue_db_path": "ielts_queue.db",
+    "queue_lease_seconds": 300,
+    "queue_max_attempts": 3,
+    "queue_cycle_timeout_minutes": 15,
+    # Ortak istek bütçesi (bkz. ielts_ratelimit): "host=30/min:5;*=60/min", "off" ile kapalı
+    "rate_limits": "ielts.idp.com=30/min:5",
+    "rate_limit_path": "ielts_ratelimit.json",
+    # Aşamalı tarama ve devre kesici (bkz. ielts_pipeline)
+    "stage_retries": 2,
+    "circuit_breaker_path": "ielts_breaker.json",
+    "circuit_breaker_threshold": 3,
+    "circuit_breaker_cooldown_minutes": 10,
+    # Loglama (bkz. ielts_logging): text / json, boyut ya da zaman ('midnight') ile döndürme
+    "log_level": "INFO",
+    "log_path": None,
+    "log_format": "text",
+    "log_max_mb": 10,
+    "log_backup_count": 5,
+    "log_rotate_when": None,
+    "lean_mode": True,
+    "lean_block_types": ["image", "font", "media"],
+    "lean_allow_list": [],
+    "lean_extra_blocked_hosts": [],
+    "wait_timeouts": None,
+    "http_endpoints": None,
+    "chrome_binary": None,
+    "user_agent": LINUX_USER_AGENT,
+    "persistent_session": False,
+    # Tarayıcı denetimi (bkz. ielts_supervisor); 0 = sınırsız
+    "browser_max_checks": 0,
+    "browser_max_rss_mb": 0,
+    "reap_orphans": True,
+    "metrics_host": "127.0.0.1",
+    "metrics_port": None,
+    "metrics_summary_path": None,
+    # Durum API'si (bkz. ielts_api); port verilmezse kapalı
+    "api_host": "127.0.0.1",
+    "api_port": None,
+    "api_refresh_min_seconds": 300,
+    # Telegram komutları (bkz. ielts_commands); /check bu süreden yeni sonucu önbellekten yanıtlar
+    "telegram_commands": False,
+    "command_offset_path": "telegram_offset.json",
+    "command_cache_ttl_seconds": 120,
+    # Daemon zamanlayıcısı (bkz. ielts_scheduler)
+    "release_windows": [],
+    "release_window_interval_minutes": None,
+    "learn_release_windows": True,
+    "min_interval_minutes": 1,
+    "max_backoff_minutes": 60,
+}
+
+# Ortamdan okunurken özel biçimi olan ayarlar
+_INT_LIST_KEYS = {"target_months"}
+_STR_LIST_KEYS = {"lean_block_types", "lean_allow_list", "lean_extra_blocked_hosts", "release_windows"}
+_FLOAT_KEYS = {"release_window_interval_minutes", "min_interval_minutes", "max_backoff_minutes",
+               "session_ttl_minutes", "queue_cycle_timeout_minutes", "circuit_breaker_cooldown_minutes",
+               "log_max_mb"}
+
+
+def _parse_env_value(key, raw):
+    """Environment variable metnini varsayılan değerin türüne çevirir; boşsa None"""
+    raw = raw.strip()
+    if not raw:
+        return None
+    default = DEFAULTS[key]
+    if key in _INT_LIST_KEYS:
+        return [int(x.strip()) for x in raw.split(",") if x.strip()]
+    if key in _STR_LIST_KEYS:
+        return [x.strip() for x in raw.split(",") if x.strip()]
+    if key == "wait_timeouts":
+        # "page_ready=15,datepicker=20"
+        timeouts = {}
+        for item in raw.split(","):
+            if "=" in item:
+                name, value = item.split("=", 1)
+                timeouts[name.strip()] = float(value)
+        return timeouts or None
+    if key in ("metrics_port", "api_port"):
+        return int(raw)
+    if key in _FLOAT_KEYS:
+        return float(raw)
+    if isinstance(default, bool):
+        return raw.lower() not in ("false", "0", "no", "off")
+    if isinstance(default, int):
+        return int(raw)
+    return raw
+
+
+class Settings:
+    """İki giriş noktasının ortak ayarları; config.py'den veya ortamdan oluşturulur"""
+
+    def __init__(self, **values):
+        unknown = set(values) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen ayar(lar): {', '.join(sorted(unknown))}")
+        for key, default in DEFAULTS.items():
+            setattr(self, key, values.get(key, default))
+        self.engine = (self.engine or "selenium").strip().lower()
+
+    @classmethod
+    def from_config(cls, config, **defaults):
+        """config.py modülünden (BÜYÜK_HARF adlar); tanımsız olanlar varsayılan kalır"""
+        values = dict(defaults)
+        for key in DEFAULTS:
+            if hasattr(config, key.upper()):
+                values[key] = getattr(config, key.upper())
+        return cls(**values)
+
+    @classmethod
+    def from_env(cls, environ=None, **defaults):
+        """Environment variable'lardan (GitHub Actions); boş değerler varsayılana düşer"""
+        environ = os.environ if environ is None else environ
+        values = dict(defaults)
+        for key in DEFAULTS:
+            raw = environ.get(key.upper())
+            if raw is None:
+                continue
+            if raw.strip().lower() == "none" and DEFAULTS[key] is None:
+                # Opsiyonel özellikler (ör. METRICS_SUMMARY_PATH) "none" ile kapatılır
+                values[key] = None
+                continue
+            value = _parse_env_value(key, raw)
+            if value is not None:
+                values[key] = value
+        return cls(**values)
+
+    @property
+    def default_target(self):
+        return ScanTarget(str(self.country_id), self.location, self.test_type,
+                          str(self.venue_id), self.venue_name)
+
+    @property
+    def targets(self):
+        """Taranacak hedefler; tanımlı değilse tek varsayılan hedef"""
+        return load_targets(self.scan_targets, self.default_target)
+
+    @property
+    def target_periods(self):
+        """Taranacak (yıl, ay) çiftleri; TARGET_RANGE yıl sınırını aşabilir"""
+        return target_periods(self.target_months, self.target_year, self.target_range)
+
+    def describe(self):
+        """Gizli değerleri maskelenmiş ayar özeti (dry-run ve log için)"""
+        hidden = {"telegram_bot_token", "password"}
+        lines = []
+        for key in DEFAULTS:
+            value = getattr(self, key)
+            if key in hidden and value:
+                value = "***"
+            lines.append(f"   {key.upper():<32} {value!r}")
+        return "\n".join(lines)
+
+
+class CheckerCore:
+    """Tarayıcı ve HTTP motoruyla hedefleri tarayan ortak motor"""
+
+    def __init__(self, settings, notifier=None):
+        self.settings = settings
+        self.notifier = notifier
+        self.driver = None
+        self.waits = None
+        self.driver_started_at = None
+        self.session_reuse_count = 0
+        self.http_engine = None
+        self.scan_pool = None
+        self.history = None
+        self.subscriptions = None
+        self._matcher = None
+        self._matcher_version = None
+        self.network_stats = None
+        self.queue = None
+        self.scan_priority = None
+        self._selectors = None
+        self._block_patterns = None
+
+    @property
+    def selectors(self):
+        """Selector çözücü (ilk kullanımda Selenium ile birlikte yüklenir)"""
+        if self._selectors is None:
+            from ielts_selectors import get_resolver
+            self._selectors = get_resolver(self.settings.selector_stats_path, self.settings.implicit_wait)
+        return self._selectors
+
+    def save_state(self):
+        """Selector istatistiklerini (bu örnek ya da worker'lar kullandıysa) diske yazar"""
+        if self._selectors is None and "ielts_selectors" not in sys.modules:
+            return
+        self.selectors.save()
+
+    def spawn_worker(self):
+        """Worker havuzu için aynı ayarlarla yeni bir örnek"""
+        return type(self)(self.settings)
+
+    @metrics.timed("setup_driver")
+    def setup_driver(self):
+        """Chrome WebDriver'ı yapılandırır"""
+        settings = self.settings
+        try:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            from ielts_waits import WaitEngine
+            from ielts_lean import apply_lean_options, build_block_patterns, enable_resource_blocking
+            from ielts_supervisor import get_supervisor, owner_argument
+
+            chrome_options = Options()
+
+            # Chrome binary path (yoksa sistemdeki Chrome kullanılır)
+            if settings.chrome_binary and os.path.exists(settings.chrome_binary):
+                chrome_options.binary_location = settings.chrome_binary
+
+            if settings.headless_mode:
+                chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--window-size=1920,1080")
+            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+            chrome_options.add_argument(f"--user-agent={settings.user_agent}")
+            # Artık süreç temizliği yalnızca bu sürecin başlattığı Chrome'lara dokunur
+            chrome_options.add_argument(owner_argument())
+            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+            if settings.lean_mode:
+                apply_lean_options(chrome_options, settings.lean_block_types, settings.lean_allow_list)
+
+            # Selenium'un built-in driver manager'ını kullan (Selenium 4.6.0+)
+            supervisor = get_supervisor()
+            with supervisor.starting():
+                self.driver = webdriver.Chrome(options=chrome_options)
+                supervisor.register(self, self.driver)
+            self.driver.implicitly_wait(settings.implicit_wait)
+
+            # Automation detection'ı bypass et
+            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+            # Yalın mod: gereksiz kaynak türlerini ve takip host'larını engelle
+            if settings.lean_mode:
+                if self._block_patterns is None:
+                    self._block_patterns = build_block_patterns(
+                        settings.lean_block_types, settings.lean_allow_list, settings.lean_extra_blocked_hosts
+                    )
+                enable_resource_blocking(self.driver, self._block_patterns)
+
+            # Önbellekteki oturum cookie'leri ilk sayfa açılmadan yüklenir
+            self.restore_session()
+
+            self.waits = WaitEngine(self.driver, settings.wait_timeouts)
+            self.driver_started_at = time.time()
+            self.session_reuse_count = 0
+            logger.info("✅ Chrome WebDriver başarıyla başlatıldı")
+            return True
+        except Exception as e:
+            logger.error(f"❌ WebDriver başlatma hatası: {e}")
+            self.close_driver()
+            return False
+
+    def is_driver_alive(self):
+        """Mevcut WebDriver oturumunun hâlâ yanıt verip vermediğini kontrol eder"""
+        if not self.driver:
+            return False
+        from selenium.common.exceptions import WebDriverException
+        try:
+            # Hem driver süreci hem de tarayıcı sekmesi yanıt vermeli
+            self.driver.window_handles
+            self.driver.execute_script("return document.readyState")
+            return True
+        except WebDriverException as e:
+            logger.warning(f"⚠️ WebDriver oturumu yanıt vermiyor: {e.__class__.__name__}")
+            return False
+        except Exception as e:
+            logger.warning(f"⚠️ WebDriver sağlık kontrolü hatası: {e}")
+            return False
+
+    def ensure_driver(self):
+        """Canlı bir WebDriver oturumu sağlar, ölü oturumu yeniden oluşturur"""
+        if self.driver:
+            if self.is_driver_alive():
+                self.session_reuse_count += 1
+                age = int(time.time() - self.driver_started_at) if self.driver_started_at else 0
+                logger.info(f"♻️ Mevcut WebDriver oturumu kullanılıyor ({self.session_reuse_count}. tekrar, {age}s)")
+                return True
+            logger.warning("♻️ WebDriver oturumu yeniden başlatılıyor")
+            self.close_driver()
+        return self.setup_driver()
+
+    def close_driver(self):
+        """WebDriver oturumunu güvenli şekilde kapatır"""
+        if not self.driver:
+            return
+        from ielts_supervisor import get_supervisor
+        get_supervisor().unregister(self)
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ WebDriver kapatma hatası: {e}")
+            # quit() yarıda kaldıysa chromedriver/chrome süreçleri geride kalabilir
+            if self.settings.reap_orphans:
+                get_supervisor().reap()
+        finally:
+            self.driver = None
+            self.waits = None
+            self.driver_started_at = None
+
+    def supervise_browser(self):
+        """Kontrol sonrası tarayıcıyı kontrol sayısı ve bellek tavanına göre yeniden başlattırır"""
+        if not self.driver:
+            return
+        from ielts_supervisor import get_supervisor
+        supervisor = get_supervisor()
+        reason = supervisor.recycle_reason(
+            self, self.session_reuse_count + 1,
+            self.settings.browser_max_checks, self.settings.browser_max_rss_mb
+        )
+        if reason:
+            rss_mb = supervisor.driver_rss(self) / 1048576
+            logger.info(f"♻️ Tarayıcı yeniden başlatılacak ({reason}, {self.session_reuse_count + 1} kontrol, {rss_mb:.0f} MB)")
+            supervisor.record_recycle(reason)
+            self.close_driver()
+
+    def reap_browsers(self):
+        """Artık chrome/chromedriver süreçlerini temizler ve bellek özetini loglar"""
+        from ielts_supervisor import get_supervisor
+        supervisor = get_supervisor()
+        if self.settings.reap_orphans:
+            supervisor.reap()
+        supervisor.total_rss()
+        logger.info(f"🧠 Tarayıcı belleği: {supervisor.summary()}")
+
+    def session_cache(self):
+        """Worker'ların paylaştığı oturum önbelleği; SESSION_CACHE_PATH yoksa None"""
+        if not self.settings.session_cache_path:
+            return None
+        from ielts_session import get_session_cache
+        return get_session_cache(self.settings.session_cache_path, self.settings.session_ttl_minutes * 60)
+
+    def rate_limiter(self):
+        """Tüm worker ve süreçlerin paylaştığı istek bütçesi; RATE_LIMITS yoksa None"""
+        if not self.settings.rate_limits or not self.settings.rate_limit_path:
+            return None
+        from ielts_ratelimit import get_rate_limiter
+        return get_rate_limiter(self.settings.rate_limit_path, self.settings.rate_limits)
+
+    def throttle(self, url=None):
+        """Sayfa geçişi veya backend isteği öncesi ortak bütçeden token alır"""
+        limiter = self.rate_limiter()
+        if limiter is None:
+            return
+        from ielts_ratelimit import LOWEST_PRIORITY
+        priority = LOWEST_PRIORITY if self.scan_priority is None else self.scan_priority
+        waited = limiter.acquire(url or self.settings.base_url, priority)
+        metrics.REGISTRY.observe("rate_limit_wait", waited)
+        if waited >= 1:
+            logger.info(f"🚦 İstek bütçesi için {waited:.1f}s beklendi (öncelik {priority})")
+
+    def target_priority(self, target):
+        """
+        Hedefin önceliği: ilgilenilen en yakın hedef aya kalan ay sayısı (küçük olan
+        önce). Hedefe uyan aboneliklerin ayları genel TARGET_* aylarına eklenir.
+        """
+        from ielts_ratelimit import month_distance
+        periods = set(self.settings.target_periods)
+        matcher = self.subscription_matcher()
+        for subscription in (matcher.subscriptions if matcher else ()):
+            if ((not subscription.locations or target.location in subscription.locations)
+                    and (not subscription.test_types or target.test_type in subscription.test_types)
+                    and (not subscription.venue_ids or target.venue_id in subscription.venue_ids)):
+                periods.update(subscription.periods)
+        return month_distance(periods)
+
+    def circuit_breaker(self):
+        """Worker'ların paylaştığı devre kesici; CIRCUIT_BREAKER_PATH yoksa None"""
+        if not self.settings.circuit_breaker_path:
+            return None
+        from ielts_pipeline import get_circuit_breaker
+        cooldown = self.settings.circuit_breaker_cooldown_minutes * 60
+        return get_circuit_breaker(self.settings.circuit_breaker_path, self.settings.circuit_breaker_threshold,
+                                   cooldown, cooldown * 6)
+
+    def circuit_allows(self):
+        """Devre açıksa taramayı atlatır (site yokken sayfa yüklenmez, hata mesajı gönderilmez)"""
+        breaker = self.circuit_breaker()
+        if breaker is None or breaker.allow():
+            return True
+        logger.info(f"🔌 Site yanıt vermiyor, devre açık: kontrol atlandı "
+                    f"({breaker.remaining() / 60:.0f} dk sonra yeniden denenecek)")
+        return False
+
+    def report_scan_result(self, error=None):
+        """
+        Tarama sonucunu devre kesiciye bildirir. Devre açıldığında ve site
+        toparlandığında birer mesaj gönderilir; aradaki hatalar yalnızca loglanır.
+        """
+        from ielts_pipeline import SITE_DOWN, SELECTOR_DRIFT
+        if error is not None and error.kind == SELECTOR_DRIFT:
+            logger.warning(f"🧩 Selector kayması ({error.stage}): site yapısı değişmiş olabilir")
+        breaker = self.circuit_breaker()
+        if breaker is None:
+            return
+        if error is not None and error.kind == SITE_DOWN:
+            if breaker.record_failure(error.kind, error):
+                self.send_telegram_message(
+                    f"🔌 IELTS sitesi yanıt vermiyor ({breaker.threshold} art arda hata); kontroller "
+                    f"{breaker.remaining() / 60:.0f} dk durduruldu.\n❌ {error}", PRIORITY_ERROR
+                )
+        elif breaker.record_success():
+            self.send_telegram_message("✅ IELTS sitesi yeniden yanıt veriyor, kontroller devam ediyor.")
+
+    def abandon_circuit_trial(self):
+        """Tarama site hakkında sonuç üretmeden bitti; yarı açık devrenin denemesi serbest kalır"""
+        breaker = self.circuit_breaker()
+        if breaker is not None:
+            breaker.abandon_trial()
+
+    def should_report_error(self, error):
+        """Genel hata mesajı gönderilsin mi: site kapalıysa ya da devre açıksa hayır"""
+        from ielts_pipeline import StageError, classify, SITE_DOWN, CLOSED
+        kind = classify(error)
+        if kind == SITE_DOWN:
+            self.report_scan_result(error if isinstance(error, StageError) else StageError(kind, "check", str(error)))
+            return False
+        breaker = self.circuit_breaker()
+        return breaker is None or breaker.state == CLOSED
+
+    def record_snapshot(self, target, periods, views, found, error=None):
+        """
+        SNAPSHOT_MODE'a göre sonuç sayfası ve datepicker görünümlerini arşive ekler;
+        error (StageError) verilirse o anki sayfa hata sınıfıyla birlikte kaydedilir
+        """
+        mode = (self.settings.snapshot_mode or "off").lower()
+        if mode == "off" or not self.settings.snapshot_path or (mode == "empty" and found):
+            return
+        if self.driver is None:
+            return
+        from ielts_snapshots import capture, get_recorder
+        try:
+            snapshot = capture(self.driver, target, periods, views, found, self.waits.timings,
+                               url=self.driver.current_url, error=error)
+            size = get_recorder(self.settings.snapshot_path, self.settings.snapshot_max_mb).record(snapshot)
+            logger.debug(f"🎞️ Snapshot kaydedildi ({size} bayt): {self.settings.snapshot_path}")
+        except Exception as e:
+            logger.warning(f"⚠️ Snapshot alınamadı: {e}")
+
+    def restore_session(self):
+        """Önbellekteki cookie'leri yeni tarayıcıya yükler"""
+        cache = self.session_cache()
+        if cache is None:
+            return
+        from ielts_session import restore_cookies
+        try:
+            restored = restore_cookies(self.driver, cache.cookies())
+            if restored:
+                logger.info(f"🍪 {restored} cookie oturum önbelleğinden yüklendi")
+        except Exception as e:
+            logger.warning(f"⚠️ Cookie'ler yüklenemedi: {e}")
+
+    def remember_session(self, target=None, logged_in=None):
+        """Güncel cookie'leri ve (hedef verildiyse) filtreli sonuç sayfası URL'sini önbelleğe yazar"""
+        cache = self.session_cache()
+        if cache is None:
+            return
+        from ielts_session import export_cookies
+        try:
+            cache.store(export_cookies(self.driver), target_key(target) if target else None,
+                        self.driver.current_url if target else None, self.settings.base_url, logged_in)
+        except Exception as e:
+            logger.warning(f"⚠️ Oturum önbelleğe alınamadı: {e}")
+
+    def shutdown(self):
+        """Tarayıcıyı, tarama havuzunu, HTTP bağlantılarını ve geçmişi kapatır"""
+        if self.scan_pool:
+            self.scan_pool.close()
+            self.scan_pool = None
+        self.close_driver()
+        if self.http_engine:
+            self.http_engine.close()
+            self.http_engine = None
+        if self.history:
+            self.history.close()
+            self.history = None
+        if self.subscriptions:
+            self.subscriptions.close()
+            self.subscriptions = None
+            self._matcher = None
+        if self.queue:
+            self.queue.close()
+            self.queue = None
+
+    def history_store(self):
+        """Geçmiş veritabanını ilk kullanımda açar"""
+        if self.history is None:
+            self.history = AvailabilityStore(self.settings.history_db_path)
+        return self.history
+
+    def record_cycle(self, available_dates, scanned_targets, source):
+        """Döngüyü geçmişe yazar ve bir önceki çalıştırmada açık olmayan tarihleri döndürür"""
+        return self.history_store().record_cycle(
+            available_dates,
+            [slot_target_key(t.location, t.test_type, t.venue_id) for t in scanned_targets],
+            source=source
+        )
+
+    def subscription_matcher(self):
+        """Abonelik indeksi; SUBSCRIPTIONS_DB_PATH yoksa None, abonelikler değişince yeniden kurulur"""
+        if not self.settings.subscriptions_db_path:
+            return None
+        from ielts_subscriptions import SubscriptionStore, SubscriptionMatcher
+        if self.subscriptions is None:
+            self.subscriptions = SubscriptionStore(self.settings.subscriptions_db_path)
+        version = self.subscriptions.version()
+        if self._matcher is None or version != self._matcher_version:
+            self._matcher = SubscriptionMatcher(self.subscriptions.subscriptions())
+            self._matcher_version = version
+            logger.info(f"👥 {len(self._matcher)} aktif abonelik yüklendi")
+        return self._matcher
+
+    @metrics.timed("notify_subscribers")
+    def notify_subscribers(self, available_dates, new_dates):
+        """
+        Yeni tarihi olan her aboneye, filtresine uyan tüm açık tarihleri içeren
+        kişisel mesaj gönderir (format_dates_message(dates, subscriptions)).
+        Gönderilen mesaj sayısını döndürür.
+        """
+        matcher = self.subscription_matcher()
+        if not matcher or not new_dates:
+            return 0
+        interested = matcher.route(new_dates)
+        if not interested:
+            return 0
+        routed = matcher.route(available_dates)
+        for chat_id, (subscriptions, _) in interested.items():
+            dates = routed[chat_id][1]
+            message = self.format_dates_message(dates, subscriptions)
+            if self.notifier is not None:
+                self.notifier.send(message, PRIORITY_POSITIVE, chat_id=chat_id)
+        logger.info(f"👥 {len(interested)}/{len(matcher)} aboneye yeni tarih bildirildi")
+        return len(interested)
+
+    # Yeni tarih mesajının başlığı; giriş noktaları kendi metnini verebilir
+    dates_message_title = "🎉 <b>Yeni IELTS Tarihleri Bulundu!</b>"
+
+    def message_time(self):
+        """Mesajlardaki kontrol zamanı"""
+        return datetime.now()
+
+    def no_dates_message(self, checked_at):
+        """Tarih bulunamadığında gönderilen mesaj"""
+        return "❌ Temmuz-Ağustos aylarında müsait IELTS tarihi bulunamadı."
+
+    def dates_message_footer(self, checked_at):
+        """Tarih mesajının son satırı"""
+        return f"⏰ Kontrol Zamanı: {checked_at.strftime('%H:%M:%S')}"
+
+    def format_dates_message(self, dates, subscriptions=None):
+        """Tarih listesini mesaj formatına çevirir; abonelik verilirse kişiselleştirir"""
+        from ielts_subscriptions import describe_subscription
+
+        checked_at = self.message_time()
+        if not dates:
+            return self.no_dates_message(checked_at)
+
+        message = f"{self.dates_message_title}\n\n"
+        if subscriptions:
+            name = next((s.name for s in subscriptions if s.name), "")
+            message += f"👤 {name + ', t' if name else 'T'}akip ettiğiniz filtreler:\n"
+            for subscription in subscriptions:
+                message += f"   🔎 {describe_subscription(subscription)}\n"
+            message += "\n"
+
+        # Tarihleri venue'ye göre grupla
+        venues = {}
+        for date_info in dates:
+            venues.setdefault(date_info["venue"], []).append(date_info["date"])
+
+        for venue, venue_dates in venues.items():
+            message += f"📍 <b>{venue}</b>\n"
+            for date in sorted(venue_dates):
+                message += f"   📅 {date.strftime('%d %B %Y - %A')}\n"
+            message += "\n"
+
+        message += f"🔗 <a href='{self.settings.base_url}'>Hemen Kayıt Ol</a>\n"
+        message += self.dates_message_footer(checked_at)
+
+        return message
+
+    @metrics.timed("send_telegram_message")
+    def send_telegram_message(self, message, priority=PRIORITY_NEGATIVE):
+        """Telegram mesajını gönderim kuyruğuna ekler (scrape thread'i bloklanmaz)"""
+        if self.notifier is None:
+            logger.warning("⚠️ Bildirim kanalı tanımlı değil, mesaj atlandı")
+            return False
+        return self.notifier.send(message, priority)
+
+    @metrics.timed("login")
+    def login(self):
+        """Siteye giriş yapar"""
+        from ielts_waits import try_wait
+        try:
+            # Ana sayfaya git
+            self.throttle()
+            self.driver.get(self.settings.base_url)
+            logger.info("📄 Ana sayfaya gidildi")
+
+            # Sayfanın yüklenmesini bekle
+            try_wait(self.waits.page_ready, step="login_page")
+
+            # Önbellekteki cookie'lerle hâlâ giriş yapılmış mı
+            cache = self.session_cache()
+            if cache and cache.logged_in:
+                selector, account_link = self.selectors.find(self.driver, "login_success", timeout=3)
+                if account_link:
+                    logger.info("🍪 Önbellekteki oturum geçerli, login atlandı")
+                    return True
+                logger.info("🍪 Önbellekteki oturum geçersiz, yeniden giriş yapılıyor")
+                cache.invalidate(login=True)
+
+            # Login linkini tüm selector'larla aynı anda ara
+            selector, login_link = self.selectors.find(self.driver, "login_link", timeout=15, clickable=True)
+            if not login_link:
+                logger.error("❌ Login linki bulunamadı")
+                return False
+            logger.info(f"🔐 Login linki bulundu: {selector[1]}")
+
+            login_link.click()
+            try_wait(self.waits.page_ready, step="login_form")
+            logger.info("🔐 Login sayfasına gidildi")
+
+            # Kullanıcı adı alanı
+            selector, username_field = self.selectors.find(self.driver, "username_field", timeout=15)
+            if not username_field:
+                logger.error("❌ Username alanı bulunamadı")
+                return False
+            logger.info(f"👤 Username alanı bulundu: {selector[1]}")
+
+            username_field.clear()
+            username_field.send_keys(self.settings.username)
+
+            # Şifre alanı
+            selector, password_field = self.selectors.find(self.driver, "password_field", timeout=10)
+            if not password_field:
+                logger.error("❌ Password alanı bulunamadı")
+                return False
+            logger.info(f"🔒 Password alanı bulundu: {selector[1]}")
+
+            password_field.clear()
+            password_field.send_keys(self.settings.password)
+
+            # Login butonu
+            selector, login_button = self.selectors.find(self.driver, "login_button", timeout=10, clickable=True)
+            if not login_button:
+                logger.error("❌ Login butonu bulunamadı")
+                return False
+            logger.info(f"🔘 Login butonu bulundu: {selector[1]}")
+
+            login_button.click()
+            try_wait(self.waits.page_ready, step="login_submit")
+
+            # Giriş başarılı mı kontrol et
+            selector, account_link = self.selectors.find(self.driver, "login_success", timeout=15)
+            if account_link:
+                logger.info(f"✅ Giriş başarısı onaylandı: {selector[1]}")
+                logger.info("✅ Başarıyla giriş yapıldı")
+                self.remember_session(logged_in=True)
+                return True
+            else:
+                logger.error("❌ Giriş başarısı doğrulanamadı")
+                return False
+
+        except Exception as e:
+            logger.error(f"❌ Giriş yapma hatası: {e}")
+            return False
+
+    def select_dropdown(self, name, label, text=None, value=None):
+        """Dropdown'ı bulur, seçenek yüklenene kadar bekler ve seçimi yapar"""
+        from selenium.webdriver.support.ui import Select
+        from selenium.common.exceptions import TimeoutException
+
+        selector, element = self.selectors.find(self.driver, name, timeout=15)
+        if not element:
+            logger.error(f"❌ {label} dropdown bulunamadı")
+            return False
+        logger.info(f"🔎 {label} dropdown bulundu: {selector[1]}")
+
+        # Bağımlı dropdown bir önceki seçime göre dolana kadar bekle
+        try:
+            element = self.waits.select_has_option(selector, text=text, value=value, step=name)
+        except TimeoutException:
+            logger.error(f"❌ {label} seçeneği yüklenmedi: {text or value}")
+            return False
+
+        # Seçim bir sonraki dropdown'ı dolduran isteği tetikler
+        self.throttle()
+        if value is not None:
+            Select(element).select_by_value(value)
+        else:
+            Select(element).select_by_visible_text(text)
+        return True
+
+    @metrics.timed("fill_registration_form")
+    def fill_registration_form(self, target=None):
+        """Kayıt formunu hedefin ülke, lokasyon ve test türüyle doldurur"""
+        from ielts_waits import try_wait
+        target = target or self.settings.default_target
+        try:
+            # Kayıt sayfasına git
+            self.throttle()
+            self.driver.get(self.settings.base_url)
+            logger.info("📋 Kayıt formuna gidildi")
+
+            # Sayfanın yüklenmesini bekle
+            try_wait(self.waits.page_ready, step="form_page")
+
+            # Ülke seçimi
+            if not self.select_dropdown("country_dropdown", "🌍 Ülke", value=target.country_id):
+                return False
+            logger.info(f"🌍 Ülke seçildi: {target.country_id}")
+
+            # Lokasyon seçimi
+            if not self.select_dropdown("location_dropdown", "📍 Lokasyon", text=target.location):
+                return False
+            logger.info(f"📍 Lokasyon seçildi: {target.location}")
+
+            # Test türü seçimi
+            if not self.select_dropdown("test_type_dropdown", "📝 Test türü", text=target.test_type):
+                return False
+            logger.info(f"📝 Test türü seçildi: {target.test_type}")
+
+            # Venue listesini getiren isteklerin bitmesini bekle
+            try_wait(self.waits.ajax_idle, step="venue_request")
+
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Form doldurma hatası: {e}")
+            return False
+
+    @metrics.timed("session_restore")
+    def open_cached_results(self, target, url):
+        """Önbellekteki filtreli sonuç sayfasını açar; hedef venue listelenmezse kaydı siler"""
+        from selenium.common.exceptions import TimeoutException
+        from ielts_waits import try_wait
+        from ielts_session import same_site
+
+        if same_site(url, self.settings.base_url):
+            try:
+                self.throttle(url)
+                self.driver.get(url)
+                try_wait(self.waits.page_ready, step="session_page")
+                self.waits.venue_listed(target.venue_id, target.venue_name)
+                try_wait(self.waits.ajax_idle, step="session_venue_request")
+                logger.info(f"🍪 Önbellekteki oturum geçerli, form atlandı [{describe(target)}]")
+                return True
+            except TimeoutException:
+                logger.info(f"🍪 Önbellekteki sonuç sayfası doğrulanamadı, form dolduruluyor [{describe(target)}]")
+        self.session_cache().invalidate(target_key(target))
+        return False
+
+    def open_venue_results(self, target):
+        """Filtreli venue sonuçlarını açar: önbellek geçerliyse doğrudan, değilse formu doldurarak"""
+        cache = self.session_cache()
+        url = cache.results_url(target_key(target)) if cache else None
+        if url and self.open_cached_results(target, url):
+            return True
+        if not self.fill_registration_form(target):
+            return False
+        self.remember_session(target)
+        return True
+
+    def open_venue_datepicker(self, target):
+        """
+        Venue'ye tıklar ve datepicker takvimi çizilene kadar bekler. Müsait günü
+        olmayan takvim boş sonuçtur, hata değil; yalnızca datepicker hiç
+        gelmezse aşama geçici hatayla yeniden denenir (aynı sayfada yeniden tıklanır).
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import TimeoutException
+        from ielts_waits import try_wait
+        from ielts_selectors import venue_link_selectors
+        from ielts_pipeline import StageError, SELECTOR_DRIFT, SITE_DOWN, page_is_down
+
+        venue_name = target.venue_name
+        try:
+            # Venue bölümü render edilene kadar bekle
+            self.waits.venue_results()
+            logger.info("🏢 Venue bölümü bulundu")
+        except TimeoutException:
+            if page_is_down(self.driver):
+                raise StageError(SITE_DOWN, "venue", "site hata sayfası döndürdü")
+            raise
+
+        # Venue linkini tüm selector'larla aynı anda ara
+        selector, venue_link = self.selectors.find(
+            self.driver, f"venue_link_{target.venue_id}", venue_link_selectors(target),
+            timeout=15, clickable=True
+        )
+        if not venue_link:
+            raise StageError(SELECTOR_DRIFT, "venue", f"{venue_name} linki bulunamadı")
+        logger.info(f"🏢 {venue_name} linki bulundu: {selector[1]}")
+
+        # Venue'ye tıkla
+        self.throttle()
+        venue_link.click()
+        logger.info(f"✅ {venue_name} açıldı")
+
+        # Datepicker takvimi çizilene kadar bekle (müsait gün olması gerekmez)
+        try:
+            datepicker = self.waits.datepicker_cells(target.venue_id)
+        except TimeoutException:
+            exists, days, _ = self.waits.datepicker_state(target.venue_id)
+            if not (exists and days):
+                if page_is_down(self.driver):
+                    raise StageError(SITE_DOWN, "venue", "site hata sayfası döndürdü")
+                raise
+            # Bekleme sınırında çizildi
+            datepicker = self.driver.find_element(By.ID, f"session-date-{target.venue_id}")
+        _, _, bookable = self.waits.datepicker_state(target.venue_id)
+        logger.info(f"📅 Datepicker bulundu ({bookable} seçilebilir gün)")
+        try_wait(self.waits.ajax_idle, step="datepicker_request")  # Müsaitlik sınıfları için
+        return datepicker
+
+    @metrics.timed("check_available_dates")
+    def check_available_dates(self, target=None):
+        """
+        Hedef venue için müsait tarihleri kontrol eder. Geçici hatada yalnızca
+        başarısız aşama yeniden denenir; taranamazsa StageError fırlatır.
+        """
+        from ielts_datepicker import collect_target_dates
+        from ielts_pipeline import run_stage
+
+        target = target or self.settings.default_target
+        venue_name = target.venue_name
+        retries = self.settings.stage_retries
+        available_dates = []
+
+        datepicker = run_stage("venue", lambda: self.open_venue_datepicker(target), retries,
+                               can_retry=self.is_driver_alive)
+
+        # Görünen ayları oku, görünmeyen hedef aylara widget API'siyle atla
+        periods = self.settings.target_periods
+        views = [] if self.settings.snapshot_mode != "off" else None
+
+        def read_dates():
+            if views is not None:
+                del views[:]
+            return collect_target_dates(self.driver, self.waits, target.venue_id, periods, views,
+                                        throttle=self.throttle)
+
+        date_cells, (date_selector, jumps) = run_stage("dates", read_dates, retries,
+                                                       can_retry=self.is_driver_alive)
+        metrics.REGISTRY.set_gauge("datepicker_jumps", jumps)
+        self.record_snapshot(target, periods, views, len(date_cells))
+
+        if not date_cells:
+            logger.info(f"📅 {venue_name} için {format_periods(periods)} aylarında müsait tarih bulunamadı")
+
+            # Datepicker içeriğini debug için logla
+            try:
+                datepicker_html = datepicker.get_attribute("outerHTML")[:500]
+                logger.debug(f"📅 Datepicker içeriği: {datepicker_html}")
+            except:
+                pass
+
+            return []
+
+        logger.info(f"📅 {len(date_cells)} hedef tarih bulundu ({jumps} ay atlaması): {date_selector}")
+
+        # Hücreler hedef aylara göre zaten süzüldü
+        for date_obj, level in date_cells:
+            available_dates.append({
+                "date": date_obj,
+                "venue": venue_name,
+                "date_str": date_obj.strftime("%Y-%m-%d"),
+                "venue_id": target.venue_id,
+                "location": target.location,
+                "test_type": target.test_type,
+                "level": level
+            })
+
+            logger.info(f"✅ Hedef tarih bulundu: {date_obj.strftime('%d %B %Y')} - {venue_name}")
+
+        return available_dates
+
+    @metrics.timed("http_check", failed=lambda result: result is None)
+    def check_via_http(self, target=None):
+        """Tarihleri HTTP motoruyla kontrol eder, başarısızsa None döndürür"""
+        from ielts_http import IELTSHttpEngine, HttpEngineError
+
+        target = target or self.settings.default_target
+        if self.http_engine is None:
+            self.http_engine = IELTSHttpEngine(self.settings.base_url, self.settings.http_endpoints,
+                                               throttle=self.throttle)
+        try:
+            dates = self.http_engine.check_available_dates(
+                target.country_id, target.location, target.test_type, target.venue_id,
+                self.settings.target_periods
+            )
+        except HttpEngineError as e:
+            logger.warning(f"⚠️ HTTP motoru başarısız, Selenium'a geçiliyor: {e}")
+            return None
+        for d in dates:
+            d.update(venue_id=target.venue_id, location=target.location, test_type=target.test_type)
+        return dates
+
+    def open_results_stage(self, target):
+        """Filtreli sonuç sayfası aşaması; açılamazsa hata sayfası mı, geçici mi ayırt eder"""
+        from ielts_pipeline import StageError, TRANSIENT, SITE_DOWN, page_is_down
+        # Login adımını atla; önbellek geçerliyse form da atlanır
+        if self.open_venue_results(target):
+            return True
+        if page_is_down(self.driver):
+            raise StageError(SITE_DOWN, "results", "site hata sayfası döndürdü")
+        raise StageError(TRANSIENT, "results", "sonuç sayfası açılamadı")
+
+    def scan_target(self, target):
+        """
+        Tek bir hedefi aşamalar halinde tarar; taranamazsa None döndürür. Hata
+        sınıfı devre kesiciye bildirilir. Bu sırada üretilen loglar hedefi taşır.
+        """
+        from ielts_logging import log_context
+        from ielts_pipeline import StageError, SITE_DOWN, classify
+        with log_context(target=describe(target)):
+            try:
+                return self._scan_target(target)
+            except Exception as e:
+                # Her çıkışta devre kesiciye sonuç bildirilir; aksi halde yarı açık deneme asılı kalır
+                if not isinstance(e, StageError) and classify(e) == SITE_DOWN:
+                    self.report_scan_result(StageError(SITE_DOWN, "scan", str(e)))
+                else:
+                    self.abandon_circuit_trial()
+                raise
+
+    def _scan_target(self, target):
+        from ielts_pipeline import StageError, run_stage
+
+        available_dates = None
+        self.scan_priority = self.target_priority(target)
+        if self.settings.engine == 'http':
+            available_dates = self.check_via_http(target)
+
+        if available_dates is None:
+            if not self.ensure_driver():
+                self.abandon_circuit_trial()
+                return None
+            self.waits.reset()
+            try:
+                run_stage("results", lambda: self.open_results_stage(target), self.settings.stage_retries,
+                          can_retry=self.is_driver_alive)
+                available_dates = self.check_available_dates(target)
+            except StageError as e:
+                logger.warning(f"⚠️ Hedef taranamadı [{describe(target)}] ({e.kind}): {e}")
+                self.record_snapshot(target, self.settings.target_periods, None, None, error=e)
+                self.report_scan_result(e)
+                return None
+            finally:
+                logger.info(f"⏱️ Bekleme süreleri [{describe(target)}]: {self.waits.summary()}",
+                            extra={"timings": {step: round(s, 3) for step, s in self.waits.timings.items()}})
+                if self.settings.lean_mode and self.driver:
+                    from ielts_lean import collect_network_stats, format_network_stats
+                    self.network_stats = collect_network_stats(self.driver)
+                    metrics.REGISTRY.set_gauge("lean_blocked_requests", self.network_stats["blocked"])
+                    metrics.REGISTRY.set_gauge("downloaded_bytes", self.network_stats["downloaded_bytes"])
+                    logger.info(f"🪶 Ağ [{describe(target)}]: {format_network_stats(self.network_stats)}")
+                self.supervise_browser()
+
+        self.report_scan_result()
+        return available_dates
+
+    def scan_all_targets(self):
+        """
+        Tüm hedefleri tarar; tek hedefte kendi oturumunu, çoklu hedefte worker havuzunu kullanır.
+        (tarihler, başarıyla taranan hedefler) döndürür; hiçbiri taranamazsa tarihler None olur.
+        """
+        targets = self.settings.targets
+        if len(targets) == 1:
+            available_dates = self.scan_target(targets[0])
+            return available_dates, ([] if available_dates is None else targets)
+
+        # Hedef ayı en yakın hedefler havuza önce verilir
+        targets = sorted(targets, key=self.target_priority)
+
+        # Kalıcı oturumda havuz ve worker tarayıcıları döngüler arasında korunur
+        if self.scan_pool is None:
+            self.scan_pool = ScanPool(self.spawn_worker, self.settings.scan_pool_size)
+        try:
+            available_dates, failed = self.scan_pool.scan(targets)
+        finally:
+            if not self.settings.persistent_session:
+                self.scan_pool.close()
+                self.scan_pool = None
+        if failed and len(failed) == len(targets):
+            return None, []
+        return available_dates, [t for t in targets if t not in failed]
+
+    def scan_cycle(self):
+        """Döngünün taraması: koordinatörde kuyruk üzerinden worker'lara, aksi halde yerelde"""
+        if self.settings.queue_role == "coordinator":
+            return self.scan_via_queue()
+        return self.scan_all_targets()
+
+    def job_queue(self):
+        """Koordinatör ve worker'ların paylaştığı iş kuyruğunu ilk kullanımda açar"""
+        if self.queue is None:
+            from ielts_queue import JobQueue
+            self.queue = JobQueue(self.settings.queue_db_path, self.settings.queue_lease_seconds,
+                                  self.settings.queue_max_attempts)
+        return self.queue
+
+    @metrics.timed("queue_cycle", failed=lambda result: result[0] is None)
+    def scan_via_queue(self):
+        """
+        Hedefleri kuyruğa ekler, worker'ların bitirmesini bekler ve sonuçları
+        birleştirir; scan_all_targets ile aynı (tarihler, taranan hedefler) döner.
+        Süre içinde bitmeyen hedefler taranmamış sayılır (geçmişteki durumu korunur).
+        """
+        queue = self.job_queue()
+        targets = self.settings.targets
+        cycle_id = queue.enqueue_cycle(targets, [self.target_priority(t) for t in targets])
+        logger.info(f"📮 Döngü #{cycle_id}: {len(targets)} hedef kuyruğa eklendi")
+        finished = queue.wait_cycle(cycle_id, self.settings.queue_cycle_timeout_minutes * 60)
+        available_dates, scanned, failed = queue.collect(cycle_id)
+
+        stats = queue.stats()
+        metrics.REGISTRY.set_gauge("queue_pending", stats["states"].get("pending", 0))
+        metrics.REGISTRY.set_gauge("queue_active_workers", len(stats["active_workers"]))
+        if not finished:
+            logger.warning(f"⏳ Döngü #{cycle_id} süresinde bitmedi; {len(failed)} hedef bu döngüde sayılmadı "
+                           f"(aktif worker: {len(stats['active_workers'])})")
+        elif failed:
+            logger.warning(f"⚠️ {len(failed)} hedef taranamadı: {', '.join(describe(t) for t in failed)}")
+        queue.purge()
+        if not scanned:
+            return None, []
+        return available_dates, scanned
+
+    def run_queue_worker(self, stop_event=None, max_jobs=None):
+        """Kuyruktan hedef alıp tarayan worker döngüsü; işlenen iş sayısını döndürür"""
+        from ielts_queue import JobDeferred, run_worker
+
+        def gate():
+            # Devre açıkken iş kiralanmaz; kesintide işler deneme hakkını tüketmez
+            breaker = self.circuit_breaker()
+            wait = breaker.blocked_for() if breaker is not None else 0
+            if wait:
+                logger.debug(f"🔌 Devre açık, {wait / 60:.1f} dk iş kiralanmayacak")
+            return min(wait, CIRCUIT_POLL_SECONDS)
+
+        def scan(target):
+            if not self.circuit_allows():
+                raise JobDeferred("devre açık")
+            try:
+                return self.scan_target(target)
+            finally:
+                self.save_state()
+                if not self.settings.persistent_session:
+                    self.close_driver()
+                self.reap_browsers()
+
+        try:
+            return run_worker(self.job_queue(), scan, stop_event=stop_event, max_jobs=max_jobs, gate=gate)
+        finally:
+            self.shutdown()
+
+
+# --- Tarayıcı gerektirmeyen hızlı modlar ---
+
+MODES = ("check", "status", "dry-run", "notify-only")
+
+# check modunda sürecin rolü (bkz. ielts_queue)
+ROLES = ("standalone", "coordinator", "worker")
+
+
+def add_mode_arguments(parser):
+    """Giriş noktalarının ortak komut satırı seçenekleri"""
+    parser.add_argument("--mode", choices=MODES, default=None,
+                        help="check: tarama (varsayılan), status: geçmişten son durum, "
+                             "dry-run: ayar ve hedef planı, notify-only: tarayıcısız bildirim")
+    parser.add_argument("--message", help="notify-only modunda gönderilecek metin")
+    return parser
+
+
+def parse_mode_arguments(argv=None, description=None, default_mode="check", roles=False):
+    parser = add_mode_arguments(argparse.ArgumentParser(description=description))
+    if roles:
+        parser.add_argument("--role", choices=ROLES, default=None,
+                            help="standalone: tek süreç (varsayılan), coordinator: hedefleri kuyruğa "
+                                 "ekler ve bildirir, worker: kuyruktan hedef alıp tarar")
+    args = parser.parse_args(argv)
+    args.mode = args.mode or default_mode
+    return args
+
+
+def format_open_slots(slots):
+    """Geçmişteki açık slotları satırlara çevirir"""
+    lines = []
+    for slot in slots:
+        first_seen = datetime.fromtimestamp(slot["first_seen"]).strftime("%d.%m %H:%M")
+        lines.append(f"📅 {slot['exam_date']} - {slot['venue']} ({slot['level'] or '-'}, ilk görülme {first_seen})")
+    return lines
+
+
+def show_status(settings, out=print):
+    """Son çalıştırmayı ve açık slotları geçmişten okur (tarayıcı ve ağ yok)"""
+    if not os.path.exists(settings.history_db_path):
+        out(f"ℹ️ Henüz geçmiş yok: {settings.history_db_path}")
+        return 0
+    store = AvailabilityStore(settings.history_db_path)
+    try:
+        last_run = store.last_run()
+        slots = store.current_slots()
+    finally:
+        store.close()
+
+    if last_run:
+        checked_at = datetime.fromtimestamp(last_run["checked_at"]).strftime("%Y-%m-%d %H:%M:%S")
+        out(f"🕒 Son kontrol: {checked_at} ({last_run['source'] or '-'}, "
+            f"{last_run['target_count']} hedef, {last_run['date_count']} tarih)")
+    out(f"📊 Açık slot sayısı: {len(slots)}")
+    for line in format_open_slots(slots):
+        out(f"   {line}")
+
+    summary_path = settings.metrics_summary_path
+    if summary_path and os.path.exists(summary_path):
+        with open(summary_path, encoding="utf-8") as f:
+            phases = json.load(f).get("phases", {})
+        for phase, stats in phases.items():
+            out(f"   ⏱️ {phase}: ort. {stats.get('mean_seconds')}s, {stats.get('failure', 0)} hata")
+    return 0
+
+
+def dry_run(settings, out=print):
+    """Çözümlenen ayarları ve tarama planını gösterir; tarayıcı açmaz, ağa çıkmaz"""
+    out("🧪 Dry-run: çözümlenen ayarlar")
+    out(settings.describe())
+    out(f"🎯 {len(settings.targets)} hedef, motor: {settings.engine}, havuz: {settings.scan_pool_size}")
+    out(f"📅 Hedef aylar: {format_periods(settings.target_periods)}")
+    if settings.subscriptions_db_path and os.path.exists(settings.subscriptions_db_path):
+        from ielts_subscriptions import SubscriptionStore
+        store = SubscriptionStore(settings.subscriptions_db_path)
+        try:
+            out(f"👥 {len(store.subscriptions())} aktif abonelik")
+        finally:
+            store.close()
+    for target in settings.targets:
+        out(f"   • {describe(target)}")
+    if not settings.telegram_bot_token or not settings.chat_id:
+        out("⚠️ TELEGRAM_BOT_TOKEN / CHAT_ID eksik: bildirim gönderilmeyecek")
+    return 0
+
+
+def notify_only(settings, notifier, message=None, out=print):
+    """Verilen mesajı ya da geçmişteki açık slotların özetini tarayıcısız gönderir"""
+    if not message:
+        slots = []
+        if os.path.exists(settings.history_db_path):
+            store = AvailabilityStore(settings.history_db_path)
+            try:
+                slots = store.current_slots()
+            finally:
+                store.close()
+        if slots:
+            message = "📋 <b>Açık IELTS tarihleri</b>\n\n" + "\n".join(format_open_slots(slots))
+        else:
+            message = "ℹ️ Bilinen açık IELTS tarihi yok."
+    ok = notifier.send_now(message)
+    out("✅ Bildirim gönderildi" if ok else "❌ Bildirim gönderilemedi")
+    return 0 if ok else 1
+
+
+def run_fast_mode(mode, settings, notifier, message=None):
+    """Tarayıcı gerektirmeyen modu çalıştırır ve çıkış kodunu döndürür"""
+    if mode == "status":
+        return show_status(settings)
+    if mode == "dry-run":
+        return dry_run(settings)
+    if mode == "notify-only":
+        return notify_only(settings, notifier, message)
+    raise ValueError(f"Bilinmeyen mod: {mode}")
+
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çok aylı datepicker taraması: hedef ayların her birine "ileri" okuna art arda
+tıklamak yerine widget API'siyle ($(el).datepicker('setDate', ...)) doğrudan
+atlanır. Aynı tarayıcı oturumunda tüm hedef aylar toplanır; yıl sınırını
+aşan aralıklar (ör. 2025-11..2026-02) desteklenir.
+"""
+
+import logging
+
+from ielts_extract import extract_date_cells, parse_date_cells
+
+logger = logging.getLogger(__name__)
+
+# Datepicker'da şu an çizili (yıl, 0-tabanlı ay) çiftleri. Müsait günü olmayan
+# aylar da sayılır: önce widget'ın çizdiği ay (drawYear/drawMonth ya da getDate) ve
+# ay sayısı, yoksa başlıklardaki ay/yıl, en son data-month/data-year hücreleri.
+VISIBLE_MONTHS_SCRIPT = """
+var root = document.getElementById(arguments[0]);
+if (!root) return [];
+var months = [], seen = {};
+function add(year, month) {
+    var key = year + '-' + month;
+    if (!seen[key] && !isNaN(year) && month >= 0 && month < 12) { seen[key] = true; months.push([year, month]); }
+}
+var $ = window.jQuery;
+try {
+    if ($ && typeof $(root).datepicker === 'function') {
+        var widget = $(root), year = null, month = null;
+        var inst = $.datepicker && $.datepicker._getInst ? $.datepicker._getInst(root) : null;
+        if (inst && typeof inst.drawYear === 'number') { year = inst.drawYear; month = inst.drawMonth; }
+        else { var shown = widget.datepicker('getDate'); if (shown) { year = shown.getFullYear(); month = shown.getMonth(); } }
+        var count = widget.datepicker('option', 'numberOfMonths');
+        if (count && count.length) count = count[0] * count[1];
+        count = parseInt(count, 10) || 1;
+        if (year !== null) {
+            for (var i = 0; i < count; i++) { var d = new Date(year, month + i, 1); add(d.getFullYear(), d.getMonth()); }
+            return months;
+        }
+    }
+} catch (e) {}
+var NAMES = ['january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september',
+             'october', 'november', 'december'];
+var TR = ['ocak', 'şubat', 'mart', 'nisan', 'mayıs', 'haziran', 'temmuz', 'ağustos', 'eylül', 'ekim',
+          'kasım', 'aralık'];
+var titles = root.querySelectorAll('.ui-datepicker-title');
+for (var t = 0; t < titles.length; t++) {
+    var m = titles[t].querySelector('.ui-datepicker-month'), y = titles[t].querySelector('.ui-datepicker-year');
+    if (!m || !y) continue;
+    var text = m.tagName === 'SELECT' ? null : (m.textContent || '').trim().toLowerCase();
+    var index = text === null ? parseInt(m.value, 10) : NAMES.indexOf(text);
+    if (index < 0) index = TR.indexOf(text);
+    if (index < 0 && text) index = NAMES.map(function(n) { return n.slice(0, 3); }).indexOf(text.slice(0, 3));
+    add(parseInt(y.tagName === 'SELECT' ? y.value : y.textContent, 10), index);
+}
+if (months.length) return months;
+var cells = root.querySelectorAll('td[data-month][data-year]');
+for (var c = 0; c < cells.length; c++) {
+    add(parseInt(cells[c].getAttribute('data-year'), 10), parseInt(cells[c].getAttribute('data-month'), 10));
+}
+return months;
+"""
+
+# Snapshot kaydı için datepicker'ın o anki tam HTML'i
+DATEPICKER_HTML_SCRIPT = """
+var root = document.getElementById(arguments[0]);
+return root ? root.outerHTML : null;
+"""
+
+# Datepicker'ı verilen ayın 1'ine atlatır; widget'ın gösterdiği ayı ve ay sayısını
+# döndürür (minDate/maxDate tarafından kırpılırsa istenen aydan farklı olur).
+JUMP_SCRIPT = """
+var el = document.getElementById(arguments[0]);
+var $ = window.jQuery;
+if (!el || !$) return null;
+var widget = $(el);
+if (!widget || typeof widget.datepicker !== 'function') return null;
+widget.datepicker('setDate', new Date(arguments[1], arguments[2], 1));
+var shown = widget.datepicker('getDate');
+var count = widget.datepicker('option', 'numberOfMonths');
+if (count && count.length) count = count[0] * count[1];
+return shown ? [shown.getFullYear(), shown.getMonth(), parseInt(count, 10) || 1] : null;
+"""
+
+
+def _parse_month(text):
+    year, month = str(text).strip().split("-", 1)
+    year, month = int(year), int(month)
+    if not 1 <= month <= 12:
+        raise ValueError(f"Geçersiz ay: {text}")
+    return year, month
+
+
+def month_range(start, end):
+    """(yıl, ay) start..end (dahil) arasındaki ayları sırayla döndürür"""
+    year, month = start
+    months = []
+    while (year, month) <= end:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def parse_target_range(raw):
+    """
+    "2025-11..2026-02" veya ("2025-11", "2026-02") biçimindeki aralığı
+    [(2025, 11), (2025, 12), (2026, 1), (2026, 2)] listesine çevirir
+    """
+    if isinstance(raw, str):
+        parts = raw.split("..") if ".." in raw else [raw]
+    else:
+        parts = list(raw)
+    if len(parts) == 1:
+        parts = parts * 2
+    start, end = _parse_month(parts[0]), _parse_month(parts[-1])
+    if end < start:
+        raise ValueError(f"Aralık sonu başlangıçtan önce: {raw}")
+    return month_range(start, end)
+
+
+def target_periods(target_months, target_year, target_range=None):
+    """Taranacak (yıl, ay) çiftleri; TARGET_RANGE varsa TARGET_MONTHS/TARGET_YEAR'ı ezer"""
+    if target_range:
+        return parse_target_range(target_range)
+    return sorted((int(target_year), int(month)) for month in target_months)
+
+
+def format_periods(periods):
+    """Log ve mesajlar için kısa gösterim: "2025-11..2026-02" ya da "2025-07, 2025-09\""""
+    periods = sorted(periods)
+    if not periods:
+        return "-"
+    if periods == month_range(periods[0], periods[-1]) and len(periods) > 2:
+        return f"{periods[0][0]}-{periods[0][1]:02d}..{periods[-1][0]}-{periods[-1][1]:02d}"
+    return ", ".join(f"{year}-{month:02d}" for year, month in periods)
+
+
+def visible_months(driver, venue_id):
+    """Datepicker'da çizili ayları 1-tabanlı (yıl, ay) kümesi olarak döndürür"""
+    months = driver.execute_script(VISIBLE_MONTHS_SCRIPT, f"session-date-{venue_id}") or []
+    return {(int(year), int(month) + 1) for year, month in months}
+
+
+def jump_to_month(driver, venue_id, year, month):
+    """
+    Datepicker'ı widget API'siyle (yıl, ay)'a atlatır. Gösterilen ayları
+    döndürür; widget API'si yoksa None.
+    """
+    result = driver.execute_script(JUMP_SCRIPT, f"session-date-{venue_id}", year, month - 1)
+    if not result:
+        return None
+    shown_year, shown_month, count = int(result[0]), int(result[1]) + 1, int(result[2])
+    end_year, end_month = shown_year + (shown_month + count - 2) // 12, (shown_month + count - 2) % 12 + 1
+    return month_range((shown_year, shown_month), (end_year, end_month))
+
+
+def collect_target_dates(driver, waits, venue_id, periods, views=None, throttle=None):
+    """
+    Açık datepicker'dan hedef aylardaki müsait tarihleri toplar; görünmeyen
+    hedef aylara atlar. [(datetime, seviye), ...] ve (eşleşen selector,
+    atlama sayısı) döndürür. views listesi verilirse okunan her görünümün
+    HTML'i snapshot için eklenir; throttle her atlamanın isteğinden önce çağrılır.
+    """
+    from ielts_waits import try_wait
+
+    targets = set(periods)
+    found = {}
+    selector = None
+
+    def read_cells():
+        nonlocal selector
+        cell_selector, cells = extract_date_cells(driver, venue_id)
+        selector = selector or cell_selector
+        for date_obj, level in parse_date_cells(cells):
+            if (date_obj.year, date_obj.month) in targets:
+                found.setdefault(date_obj, level)
+        if views is not None:
+            views.append({
+                "months": sorted(visible_months(driver, venue_id)),
+                "html": driver.execute_script(DATEPICKER_HTML_SCRIPT, f"session-date-{venue_id}"),
+            })
+
+    # Açılışta görünen aylarda müsait gün olmasa da (uzak hedef aylar) atlamalara geçilir
+    read_cells()
+    pending = sorted(targets - visible_months(driver, venue_id))
+    jumps = 0
+    while pending:
+        year, month = pending.pop(0)
+        if throttle:
+            throttle()
+        shown = jump_to_month(driver, venue_id, year, month)
+        if shown is None:
+            logger.warning(f"⚠️ Datepicker API'si bulunamadı; {year}-{month:02d} ve sonrası taranamadı")
+            break
+        jumps += 1
+        if (year, month) not in shown:
+            # minDate/maxDate dışındaki ay; widget en yakın aya kırptı
+            logger.info(f"📅 {year}-{month:02d} datepicker aralığı dışında, atlanıyor")
+        else:
+            try_wait(waits.datepicker_cells, venue_id, step="datepicker_jump")
+            try_wait(waits.ajax_idle, step="datepicker_jump_request")
+            read_cells()
+            logger.debug(f"📅 Datepicker {format_periods(shown)} gösteriyor")
+        covered = set(shown) | visible_months(driver, venue_id)
+        pending = [period for period in pending if period not in covered]
+
+    return sorted(found.items()), (selector, jumps)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Datepicker'daki tüm aday hücreleri tek bir execute_script çağrısıyla okur.
+Hücre başına find_element/get_attribute/text round trip'i yapılmaz.
+Müsaitlik sınıflı hücreler (high / medium / seçili) tek geçişte birlikte
+toplanır; HTTP motoru gibi tüm seviyeler döner. Hiçbiri yoksa genel selector
+cascade'i denenir. Kaydedilmiş HTML için aynı akış BeautifulSoup ile
+çalıştırılır (bkz. ielts_snapshots).
+"""
+
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Müsaitlik sınıfları tek geçişte: high (yeşil - müsait), medium (sarı - dolmak
+# üzere), selected (mavi - seçili). Aynı gün birden çok kez eşleşirse bir kez sayılır.
+AVAILABILITY_SELECTOR = ".high-availability-date a, .medium-availability-date a, .selected-legend a"
+
+# Müsaitlik sınıflı hücre yoksa sırayla denenen selector'lar; ilk eşleşen kazanır
+DATE_SELECTORS = [
+    # 1. Genel tıklanabilir tarihler (disabled olmayanlar)
+    ("css", "td[data-handler='selectDay']:not(.ui-datepicker-unselectable) a"),
+    # 2. UI datepicker aktif tarihler
+    ("css", "td:not(.ui-datepicker-unselectable):not(.ui-state-disabled) a"),
+    # 3. Herhangi bir aktif tarih linki
+    ("xpath", ".//td[@data-handler='selectDay' and not(contains(@class, 'ui-datepicker-unselectable'))]//a"),
+    # 4. Tüm tıklanabilir tarih elementleri
+    ("css", "td[data-event='click'] a"),
+]
+
+# Müsaitlik geçişini, eşleşme yoksa selector cascade'ini tarayıcıda çalıştırır ve
+# [gün, ay, yıl, seviye] listesi döndürür
+EXTRACT_SCRIPT = """
+var root = document.getElementById(arguments[0]) || document;
+var selectors = arguments[1];
+var availability = arguments[2];
+
+function collect(type, value) {
+    if (type === 'xpath') {
+        var result = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var k = 0; k < result.snapshotLength; k++) nodes.push(result.snapshotItem(k));
+        return nodes;
+    }
+    return Array.prototype.slice.call(root.querySelectorAll(value));
+}
+
+function level(cls) {
+    if (/high-availability-date/.test(cls)) return 'high';
+    if (/medium-availability-date/.test(cls)) return 'medium';
+    if (/selected-legend/.test(cls)) return 'selected';
+    return 'available';
+}
+
+function read(links) {
+    var cells = [], seen = {};
+    for (var j = 0; j < links.length; j++) {
+        var td = links[j].parentElement;
+        var cell = [
+            (links[j].textContent || '').trim(),
+            td ? td.getAttribute('data-month') : null,
+            td ? td.getAttribute('data-year') : null,
+            level(td ? td.className : '')
+        ];
+        var key = cell[0] + '/' + cell[1] + '/' + cell[2];
+        if (seen[key]) continue;
+        seen[key] = true;
+        cells.push(cell);
+    }
+    return cells;
+}
+
+if (availability) {
+    var found = collect('css', availability);
+    if (found.length) return {selector: availability, cells: read(found)};
+}
+for (var i = 0; i < selectors.length; i++) {
+    var links;
+    try { links = collect(selectors[i][0], selectors[i][1]); } catch (e) { continue; }
+    if (!links.length) continue;
+    return {selector: selectors[i][1], cells: read(links)};
+}
+return {selector: null, cells: []};
+"""
+
+
+def extract_date_cells(driver, venue_id, selectors=None):
+    """
+    session-date-<venue_id> içindeki tarih hücrelerini tek round trip'te okur.
+    (eşleşen selector, [[gün, ay, yıl, seviye], ...]) döndürür. selectors
+    verilirse müsaitlik geçişi atlanır, yalnızca o cascade denenir.
+    """
+    availability = None if selectors else AVAILABILITY_SELECTOR
+    result = driver.execute_script(EXTRACT_SCRIPT, f"session-date-{venue_id}", selectors or DATE_SELECTORS,
+                                   availability)
+    result = result or {}
+    return result.get("selector"), result.get("cells") or []
+
+
+def _cell_level(classes):
+    """EXTRACT_SCRIPT'teki level() ile aynı sınıflandırma"""
+    text = " ".join(classes or ())
+    for marker, level in (("high-availability-date", "high"), ("medium-availability-date", "medium"),
+                          ("selected-legend", "selected")):
+        if marker in text:
+            return level
+    return "available"
+
+
+def extract_date_cells_from_html(html, selectors=None, parser=None):
+    """
+    extract_date_cells'in tarayıcısız karşılığı: kaydedilmiş datepicker HTML'inde
+    müsaitlik geçişini ve CSS selector cascade'ini çalıştırır. XPath adayları
+    BeautifulSoup'ta desteklenmediğinden atlanır. (eşleşen selector, hücre listesi) döndürür.
+    """
+    from bs4 import BeautifulSoup
+
+    if parser is None:
+        try:
+            import lxml  # noqa: F401
+            parser = "lxml"
+        except ImportError:
+            parser = "html.parser"
+    soup = BeautifulSoup(html or "", parser)
+    candidates = list(selectors or DATE_SELECTORS)
+    if not selectors:
+        candidates.insert(0, ("css", AVAILABILITY_SELECTOR))
+    for kind, value in candidates:
+        if kind != "css":
+            continue
+        links = soup.select(value)
+        if not links:
+            continue
+        cells, seen = [], set()
+        for link in links:
+            td = link.parent
+            cell = [
+                link.get_text().strip(),
+                td.get("data-month") if td else None,
+                td.get("data-year") if td else None,
+                _cell_level(td.get("class") if td else None),
+            ]
+            if tuple(cell[:3]) in seen:
+                continue
+            seen.add(tuple(cell[:3]))
+            cells.append(cell)
+        return value, cells
+    return None, []
+
+
+def parse_date_cells(cells):
+    """Ham hücre listesini (datetime, seviye) çiftlerine çevirir"""
+    parsed = []
+    for day_text, data_month, data_year, level in cells:
+        if not (data_month and data_year and day_text):
+            logger.debug(f"📅 Alternatif tarih metni: {day_text}/{data_month}/{data_year}")
+            continue
+        try:
+            # Month 0-based olduğu için +1 ekliyoruz
+            parsed.append((datetime(int(data_year), int(data_month) + 1, int(day_text)), level))
+        except (ValueError, TypeError) as parse_error:
+            logger.debug(f"📅 Tarih parse hatası: {day_text}, {data_month}, {data_year} - {parse_error}")
+    return parsed
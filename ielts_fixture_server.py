@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IELTS booking sitesinin yerel mock'u: hem HTTP motorunun kullandığı JSON
+uç noktalarını hem de Selenium akışının gezdiği booking sayfasını sunar
+(bağımlı CountryId / TestCentreLocationName / TestModuleId dropdown'ları,
+#venue-selection-results ve jQuery UI uyumlu session-date-<venue> datepicker'ı).
+
+    python ielts_fixture_server.py --port 8765
+    python ielts_http.py --base-url http://127.0.0.1:8765/book/IELTS
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from ielts_http import DEFAULT_ENDPOINTS
+
+# Varsayılan veri seti: Turkey → Ankara → Academic → Bilkent University (1771)
+DEFAULT_FIXTURE = {
+    "countries": [
+        {"Id": "212", "Name": "Turkey"},
+    ],
+    "locations": {
+        "212": [{"Name": "Ankara"}, {"Name": "Istanbul"}],
+    },
+    "test_modules": {
+        "212|Ankara": [
+            {"Id": "1", "Name": "Academic - IELTS"},
+            {"Id": "2", "Name": "General Training - IELTS"},
+        ],
+        "212|Istanbul": [
+            {"Id": "1", "Name": "Academic - IELTS"},
+        ],
+    },
+    "venues": {
+        "212|Ankara|1": [
+            {"Id": "1771", "Name": "Bilkent University"},
+            {"Id": "1772", "Name": "METU"},
+        ],
+        "212|Ankara|2": [
+            {"Id": "1771", "Name": "Bilkent University"},
+        ],
+        "212|Istanbul|1": [
+            {"Id": "1801", "Name": "Istanbul Centre"},
+        ],
+    },
+    "sessions": {
+        "1771|1": [
+            {"Date": "2025-07-12", "Availability": "high"},
+            {"Date": "2025-07-26", "Availability": "medium"},
+            {"Date": "2025-08-09", "Availability": "full"},
+            {"Date": "2025-09-13", "Availability": "high"},
+            # Yıl sınırını aşan hedef aralıkları (--target-range 2025-11..2026-02) için
+            {"Date": "2025-12-06", "Availability": "medium"},
+            {"Date": "2026-01-17", "Availability": "high"},
+        ],
+    },
+    # Datepicker'ın açıldığında gösterdiği ilk ay (jQuery UI defaultDate)
+    "datepicker_start": "2025-07",
+    "datepicker_months": 2,
+}
+
+BOOKING_PATH = "/book/IELTS"
+
+MOCK_CSS = b"#venue-selection-results .panel { margin: 4px 0; } .high-availability-date a { color: green; }"
+
+# jQuery UI datepicker markup'ını üreten küçük shim; gerçek jQuery'ye ağ erişimi
+# olmadan aynı DOM'u ve $.active / .datepicker('setDate'|'getDate') API'sini sağlar.
+BOOKING_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>IELTS Booking (mock)</title>
+<link rel="stylesheet" href="/static/mock.css">
+</head>
+<body>
+<form id="search-form">
+  <select id="CountryId" name="CountryId"><option value="">Select country</option></select>
+  <select id="TestCentreLocationName" name="TestCentreLocationName" disabled><option value="">Select location</option></select>
+  <select id="TestModuleId" name="TestModuleId" disabled><option value="">Select test</option></select>
+</form>
+<div id="venue-selection-results"></div>
+<script>
+(function() {
+  var ENDPOINTS = __ENDPOINTS__;
+  var START = "__START__".split("-");
+  var MONTHS = __MONTHS__;
+  var MONTH_NAMES = ["January","February","March","April","May","June","July",
+                     "August","September","October","November","December"];
+
+  function jQuery(selector) {
+    var el = typeof selector === "string" ? document.querySelector(selector) : selector;
+    return {
+      datepicker: function(method, value) {
+        var state = el && el.__datepicker;
+        if (!state) return undefined;
+        if (method === "setDate") { state.year = value.getFullYear(); state.month = value.getMonth(); render(el); return this; }
+        if (method === "getDate") { return new Date(state.year, state.month, 1); }
+        if (method === "option") { return state[value]; }
+        return this;
+      }
+    };
+  }
+  jQuery.active = 0;
+  window.jQuery = window.$ = jQuery;
+
+  function ajax(name, params, callback) {
+    var query = Object.keys(params).map(function(k) {
+      return encodeURIComponent(k) + "=" + encodeURIComponent(params[k]);
+    }).join("&");
+    jQuery.active++;
+    var xhr = new XMLHttpRequest();
+    xhr.open("GET", ENDPOINTS[name] + "?" + query);
+    xhr.onload = function() { callback(JSON.parse(xhr.responseText)); };
+    xhr.onloadend = function() { jQuery.active--; };
+    xhr.send();
+  }
+
+  // Gerçek site gibi seçili filtreler URL'de tutulur; ?countryId=..&location=..&testModuleId=..
+  // ile açılan sayfa dropdown'ları kendisi doldurup venue listesini gösterir.
+  var PRESET = {};
+  window.location.search.substring(1).split("&").forEach(function(pair) {
+    var parts = pair.split("=");
+    if (parts[0]) PRESET[decodeURIComponent(parts[0])] = decodeURIComponent((parts[1] || "").split("+").join(" "));
+  });
+  var PRESET_KEYS = {CountryId: "countryId", TestCentreLocationName: "location", TestModuleId: "testModuleId"};
+
+  function fill(select, items, valueKey, textKey) {
+    select.innerHTML = '<option value="">Select</option>';
+    items.forEach(function(item) {
+      var option = document.createElement("option");
+      option.value = item[valueKey];
+      option.text = item[textKey];
+      select.appendChild(option);
+    });
+    select.disabled = false;
+    var key = PRESET_KEYS[select.id];
+    if (key && PRESET[key]) {
+      select.value = PRESET[key];
+      delete PRESET[key];
+      select.dispatchEvent(new Event("change"));
+    }
+  }
+
+  function rememberFilters() {
+    var query = ["countryId=" + encodeURIComponent(country.value),
+                 "location=" + encodeURIComponent(location.value),
+                 "testModuleId=" + encodeURIComponent(module.value)].join("&");
+    window.history.replaceState(null, "", window.location.pathname + "?" + query);
+  }
+
+  var country = document.getElementById("CountryId");
+  var location = document.getElementById("TestCentreLocationName");
+  var module = document.getElementById("TestModuleId");
+  var results = document.getElementById("venue-selection-results");
+
+  ajax("countries", {}, function(items) { fill(country, items, "Id", "Name"); });
+
+  country.addEventListener("change", function() {
+    ajax("locations", {countryId: country.value}, function(items) { fill(location, items, "Name", "Name"); });
+  });
+  location.addEventListener("change", function() {
+    ajax("test_modules", {countryId: country.value, location: location.value},
+         function(items) { fill(module, items, "Id", "Name"); });
+  });
+  module.addEventListener("change", function() {
+    rememberFilters();
+    ajax("venues", {countryId: country.value, location: location.value, testModuleId: module.value},
+         renderVenues);
+  });
+
+  function renderVenues(venues) {
+    results.innerHTML = venues.map(function(v) {
+      return '<div class="panel panel-default">' +
+        '<div class="panel-heading"><h3 class="panel-title">' +
+        '<a href="#" data-toggle="collapse" data-target="#venue-info-' + v.Id + '">' + v.Name + '</a>' +
+        '</h3></div>' +
+        '<div id="venue-info-' + v.Id + '" class="panel-collapse collapse" style="display:none">' +
+        '<div id="session-date-' + v.Id + '"></div></div></div>';
+    }).join("");
+    Array.prototype.forEach.call(results.querySelectorAll("a[data-target]"), function(link) {
+      link.addEventListener("click", function(event) {
+        event.preventDefault();
+        var venueId = link.getAttribute("data-target").replace("#venue-info-", "");
+        document.getElementById("venue-info-" + venueId).style.display = "block";
+        ajax("sessions", {venueId: venueId, testModuleId: module.value}, function(sessions) {
+          var el = document.getElementById("session-date-" + venueId);
+          var levels = {};
+          sessions.forEach(function(s) { levels[s.Date.substring(0, 10)] = s.Availability; });
+          el.__datepicker = {year: parseInt(START[0], 10), month: parseInt(START[1], 10) - 1,
+                             levels: levels, numberOfMonths: MONTHS};
+          render(el);
+        });
+      });
+    });
+  }
+
+  function pad(n) { return n < 10 ? "0" + n : "" + n; }
+
+  function renderMonth(year, month, levels) {
+    var first = new Date(year, month, 1).getDay();
+    var days = new Date(year, month + 1, 0).getDate();
+    var html = '<div class="ui-datepicker-group"><div class="ui-datepicker-header ui-widget-header">' +
+      '<a class="ui-datepicker-prev" data-handler="prev" data-event="click">Prev</a>' +
+      '<a class="ui-datepicker-next" data-handler="next" data-event="click">Next</a>' +
+      '<div class="ui-datepicker-title"><span class="ui-datepicker-month">' + MONTH_NAMES[month] +
+      '</span>&nbsp;<span class="ui-datepicker-year">' + year + '</span></div></div>' +
+      '<table class="ui-datepicker-calendar"><tbody><tr>';
+    for (var i = 0; i < first; i++) html += '<td class="ui-datepicker-other-month ui-datepicker-unselectable ui-state-disabled">&#xa0;</td>';
+    for (var day = 1; day <= days; day++) {
+      var level = levels[year + "-" + pad(month + 1) + "-" + pad(day)];
+      if (level === "high" || level === "medium") {
+        html += '<td class="' + level + '-availability-date" data-handler="selectDay" data-event="click" ' +
+          'data-month="' + month + '" data-year="' + year + '"><a class="ui-state-default" href="#">' + day + '</a></td>';
+      } else {
+        html += '<td class="ui-datepicker-unselectable ui-state-disabled"><span class="ui-state-default">' + day + '</span></td>';
+      }
+      if ((first + day) % 7 === 0 && day !== days) html += '</tr><tr>';
+    }
+    return html + '</tr></tbody></table></div>';
+  }
+
+  function render(el) {
+    var state = el.__datepicker;
+    var html = '<div class="ui-datepicker-inline ui-datepicker ui-widget ui-widget-content ui-datepicker-multi">';
+    for (var i = 0; i < state.numberOfMonths; i++) {
+      var d = new Date(state.year, state.month + i, 1);
+      html += renderMonth(d.getFullYear(), d.getMonth(), state.levels);
+    }
+    el.innerHTML = html + '</div>';
+  }
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def load_fixture(path=None):
+    """Fixture verisini dosyadan ya da varsayılandan yükler"""
+    if not path:
+        return json.loads(json.dumps(DEFAULT_FIXTURE))
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def render_booking_page(fixture, endpoints=DEFAULT_ENDPOINTS):
+    """Booking sayfasını fixture ayarlarıyla üretir"""
+    return (BOOKING_PAGE
+            .replace("__ENDPOINTS__", json.dumps(endpoints))
+            .replace("__START__", str(fixture.get("datepicker_start", "2025-07")))
+            .replace("__MONTHS__", str(int(fixture.get("datepicker_months", 2))))).encode("utf-8")
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    fixture = DEFAULT_FIXTURE
+    delay = 0.0
+    page_delay = 0.0
+    endpoints = DEFAULT_ENDPOINTS
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _lookup(self, name, query):
+        """Uç nokta adına ve sorgu parametrelerine göre fixture kaydını döndürür"""
+        q = {k: v[0] for k, v in query.items()}
+        data = self.fixture.get(name)
+        if name == "countries":
+            return data
+        if name == "locations":
+            key = q.get("countryId", "")
+        elif name == "test_modules":
+            key = f"{q.get('countryId', '')}|{q.get('location', '')}"
+        elif name == "venues":
+            key = f"{q.get('countryId', '')}|{q.get('location', '')}|{q.get('testModuleId', '')}"
+        else:
+            key = f"{q.get('venueId', '')}|{q.get('testModuleId', '')}"
+        return (data or {}).get(key, [])
+
+    def _send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path.rstrip("/") == BOOKING_PATH:
+            if self.page_delay:
+                time.sleep(self.page_delay)
+            self._send_body(render_booking_page(self.fixture, self.endpoints), "text/html; charset=utf-8")
+            return
+        if parsed.path == "/static/mock.css":
+            self._send_body(MOCK_CSS, "text/css")
+            return
+
+        if self.delay:
+            time.sleep(self.delay)
+        for name, path in self.endpoints.items():
+            if parsed.path.rstrip("/") == path.rstrip("/"):
+                self._send_json(self._lookup(name, parse_qs(parsed.query)))
+                return
+        self._send_json({"error": "not found"}, status=404)
+
+
+def start_fixture_server(host="127.0.0.1", port=0, fixture=None, delay=0.0, page_delay=0.0):
+    """
+    Fixture sunucusunu arka plan thread'inde başlatır, (server, base_url) döndürür.
+    delay: JSON uç noktalarının gecikmesi, page_delay: booking sayfasının gecikmesi (saniye)
+    """
+    handler = type("BoundFixtureHandler", (FixtureHandler,), {
+        "fixture": fixture if fixture is not None else load_fixture(),
+        "delay": delay,
+        "page_delay": page_delay,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}/book/IELTS"
+    return server, base_url
+
+
+def main():
+    """Fixture sunucusunu ön planda çalıştırır"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="IELTS booking fixture sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixture", help="JSON fixture dosyası")
+    parser.add_argument("--delay", type=float, default=0.0, help="JSON yanıtı başına gecikme (saniye)")
+    parser.add_argument("--page-delay", type=float, default=0.0, help="Booking sayfası gecikmesi (saniye)")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(args.host, args.port, load_fixture(args.fixture),
+                                            args.delay, args.page_delay)
+    print(f"🧪 Fixture sunucusu çalışıyor: {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kalıcı müsaitlik geçmişi (SQLite).
+Her kontrol döngüsü tek transaction'da yazılır; "son çalıştırmadan beri yeni"
+farkı, tüm geçmişi taramadan `current_slots` tablosu üzerinden hesaplanır.
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "ielts_history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    checked_at REAL NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    target_count INTEGER NOT NULL DEFAULT 0,
+    date_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS observations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    observed_at REAL NOT NULL,
+    target_key TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    test_type TEXT NOT NULL DEFAULT '',
+    exam_date TEXT NOT NULL,
+    level TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_observations_time ON observations(observed_at);
+
+-- Döngüde başarıyla taranan hedefler (tarih bulunamasa da); analizde sansür sınırları buradan çıkar
+CREATE TABLE IF NOT EXISTS run_targets (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    target_key TEXT NOT NULL,
+    PRIMARY KEY (target_key, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_observations_target_time ON observations(target_key, observed_at);
+CREATE INDEX IF NOT EXISTS idx_observations_slot ON observations(target_key, exam_date, observed_at);
+
+-- Her hedef için şu an açık olan slotlar; fark hesabı yalnızca bu tabloya bakar
+CREATE TABLE IF NOT EXISTS current_slots (
+    target_key TEXT NOT NULL,
+    exam_date TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    level TEXT NOT NULL DEFAULT '',
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (target_key, exam_date)
+) WITHOUT ROWID;
+"""
+
+
+def slot_target_key(location, test_type, venue_id):
+    """Gözlemleri hedefe bağlayan anahtar"""
+    return f"{location}|{test_type}|{venue_id}"
+
+
+def record_target_key(record):
+    """Tarih kaydından hedef anahtarını üretir"""
+    return slot_target_key(record.get("location", ""), record.get("test_type", ""),
+                           record.get("venue_id") or record.get("venue", ""))
+
+
+class AvailabilityStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            self.conn.close()
+
+    def has_runs(self):
+        """Daha önce en az bir döngü kaydedilmiş mi"""
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone() is not None
+
+    def record_cycle(self, dates, scanned_target_keys=None, source="", checked_at=None):
+        """
+        Bir döngünün gözlemlerini tek transaction'da yazar ve bir önceki
+        çalıştırmada açık olmayan (yeni) kayıtları döndürür.
+
+        scanned_target_keys: bu döngüde başarıyla taranan hedefler. Yalnızca
+        bunların kaybolan slotları kapatılır; taranamayan hedefin durumu korunur.
+        """
+        checked_at = checked_at or time.time()
+        by_key = {}
+        for d in dates:
+            by_key[(record_target_key(d), d["date_str"])] = d
+        scanned = set(scanned_target_keys or ()) | {key for key, _ in by_key}
+
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (checked_at, source, target_count, date_count) VALUES (?, ?, ?, ?)",
+                (checked_at, source, len(scanned), len(by_key))
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany("INSERT OR IGNORE INTO run_targets (run_id, target_key) VALUES (?, ?)",
+                                  [(run_id, key) for key in scanned])
+
+            self.conn.executemany(
+                "INSERT INTO observations (run_id, observed_at, target_key, venue, test_type, exam_date, level) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, checked_at, key, d["venue"], d.get("test_type", ""), date_str, d.get("level", ""))
+                 for (key, date_str), d in by_key.items()]
+            )
+
+            previous = set()
+            for target_key in scanned:
+                previous.update(
+                    (target_key, row["exam_date"]) for row in self.conn.execute(
+                        "SELECT exam_date FROM current_slots WHERE target_key = ?", (target_key,)
+                    )
+                )
+
+            new_keys = set(by_key) - previous
+            closed_keys = {key for key in previous if key not in by_key}
+
+            self.conn.executemany(
+                "DELETE FROM current_slots WHERE target_key = ? AND exam_date = ?", list(closed_keys)
+            )
+            self.conn.executemany(
+                "INSERT INTO current_slots (target_key, exam_date, venue, level, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(target_key, exam_date) DO UPDATE SET level = excluded.level, last_seen = excluded.last_seen",
+                [(key, date_str, d["venue"], d.get("level", ""), checked_at, checked_at)
+                 for (key, date_str), d in by_key.items()]
+            )
+
+        if closed_keys:
+            logger.info(f"🗂️ {len(closed_keys)} slot artık açık değil")
+        return [by_key[key] for key in sorted(new_keys, key=lambda k: (k[1], k[0]))]
+
+    def current_slots(self, target_key=None):
+        """Şu an açık bilinen slotları döndürür"""
+        query = "SELECT * FROM current_slots"
+        params = ()
+        if target_key:
+            query += " WHERE target_key = ?"
+            params = (target_key,)
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(query + " ORDER BY exam_date", params)]
+
+    def observations_between(self, start, end, target_key=None):
+        """[start, end) zaman aralığındaki gözlemleri döndürür (unix zaman damgası)"""
+        query = "SELECT * FROM observations WHERE observed_at >= ? AND observed_at < ?"
+        params = [start, end]
+        if target_key:
+            query = ("SELECT * FROM observations WHERE target_key = ? "
+                     "AND observed_at >= ? AND observed_at < ?")
+            params = [target_key, start, end]
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(query + " ORDER BY observed_at", params)]
+
+    def release_hours(self, since=None):
+        """
+        Slotların ilk görüldüğü yerel saatlerin dağılımı (saat → adet).
+        İlk döngüde görülenler hariç tutulur; o anda açık olan her slot "yeni" görünür.
+        Yalnızca since sonrası gözlemler okunur (idx_observations_time); since'ten önce
+        de görülmüş slotlar idx_observations_slot üzerinden tek aramayla elenir.
+        INDEXED BY: planlayıcı GROUP BY sıralamasından kaçmak için slot indeksinde
+        tüm tabloyu taramayı seçebiliyor.
+        """
+        query = (
+            "SELECT MIN(o.observed_at) AS first_seen FROM observations o INDEXED BY idx_observations_time "
+            "WHERE o.observed_at >= ? "
+            "GROUP BY o.target_key, o.exam_date "
+            "HAVING MIN(o.run_id) > (SELECT MIN(id) FROM runs) "
+            "AND NOT EXISTS (SELECT 1 FROM observations p WHERE p.target_key = o.target_key "
+            "AND p.exam_date = o.exam_date AND p.observed_at < ?)"
+        )
+        since = since or 0
+        with self._lock:
+            rows = self.conn.execute(query, (since, since)).fetchall()
+        return Counter(datetime.fromtimestamp(row["first_seen"]).hour for row in rows)
+
+    def last_run(self):
+        """En son kaydedilen döngünün bilgisi"""
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        return dict(row) if row else None
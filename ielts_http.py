@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tarayıcısız HTTP motoru: ülke, lokasyon, test türü ve venue oturum
+verilerini sayfanın kullandığı backend uç noktalarından doğrudan okur.
+"""
+
+import logging
+from datetime import datetime
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Booking sayfasının dropdown ve datepicker'ı doldururken çağırdığı uç noktalar.
+# Site değişirse config.HTTP_ENDPOINTS ile tek tek ezilebilir.
+DEFAULT_ENDPOINTS = {
+    "countries": "/book/IELTS/GetCountries",
+    "locations": "/book/IELTS/GetTestCentreLocations",
+    "test_modules": "/book/IELTS/GetTestModules",
+    "venues": "/book/IELTS/GetVenues",
+    "sessions": "/book/IELTS/GetVenueSessions",
+}
+
+# Datepicker'daki CSS sınıflarının HTTP yanıtındaki karşılıkları
+AVAILABLE_LEVELS = ("high", "medium")
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+class HttpEngineError(Exception):
+    """HTTP motoru veriyi alamadığında fırlatılır; çağıran Selenium'a düşer"""
+
+
+def site_root(base_url):
+    """BASE_URL'den şema + host kısmını döndürür"""
+    parts = base_url.split("/", 3)
+    return "/".join(parts[:3]) + "/"
+
+
+class IELTSHttpEngine:
+    def __init__(self, base_url, endpoints=None, timeout=10, pool_size=4, retries=2, throttle=None):
+        self.base_url = base_url
+        # İstek öncesi çağrılır (ortak istek bütçesi, bkz. ielts_ratelimit)
+        self.throttle = throttle
+        self.root = site_root(base_url)
+        self.endpoints = dict(DEFAULT_ENDPOINTS)
+        if endpoints:
+            self.endpoints.update(endpoints)
+        self.timeout = timeout
+        self.session = self._build_session(pool_size, retries)
+
+    def _build_session(self, pool_size, retries):
+        """Keep-alive bağlantı havuzlu requests.Session oluşturur"""
+        session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": self.base_url,
+        })
+        return session
+
+    def close(self):
+        """Bağlantı havuzunu kapatır"""
+        self.session.close()
+
+    def _get(self, name, **params):
+        """Bir uç noktayı çağırır ve JSON gövdesini döndürür"""
+        url = urljoin(self.root, self.endpoints[name].lstrip("/"))
+        if self.throttle:
+            self.throttle(url)
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise HttpEngineError(f"{name} isteği başarısız: {e}") from e
+
+    @staticmethod
+    def _find(items, key, value, label):
+        """Liste içinden alan değeri eşleşen kaydı bulur"""
+        for item in items or []:
+            if str(item.get(key, "")).strip().lower() == str(value).strip().lower():
+                return item
+        raise HttpEngineError(f"{label} bulunamadı: {value}")
+
+    def resolve_country(self, country_id):
+        """Ülke kaydını döndürür"""
+        return self._find(self._get("countries"), "Id", country_id, "Ülke")
+
+    def resolve_location(self, country_id, location):
+        """Ülkedeki lokasyon kaydını döndürür"""
+        return self._find(self._get("locations", countryId=country_id), "Name", location, "Lokasyon")
+
+    def resolve_test_module(self, country_id, location, test_type):
+        """Lokasyondaki test türü kaydını döndürür"""
+        modules = self._get("test_modules", countryId=country_id, location=location)
+        return self._find(modules, "Name", test_type, "Test türü")
+
+    def list_venues(self, country_id, location, test_module_id):
+        """Seçili filtre için venue listesini döndürür"""
+        return self._get("venues", countryId=country_id, location=location, testModuleId=test_module_id)
+
+    def fetch_sessions(self, venue_id, test_module_id):
+        """Venue'nun datepicker oturumlarını döndürür"""
+        return self._get("sessions", venueId=venue_id, testModuleId=test_module_id)
+
+    def check_available_dates(self, country_id, location, test_type, venue_id, target_periods):
+        """
+        Selenium akışıyla aynı {"date", "venue", "date_str"} kayıtlarını döndürür.
+        target_periods: (yıl, ay) çiftleri; oturum listesi tüm ayları içerdiğinden atlama gerekmez.
+        """
+        target_periods = set(target_periods)
+        country = self.resolve_country(country_id)
+        logger.info(f"🌍 Ülke bulundu (HTTP): {country.get('Name', country_id)}")
+
+        self.resolve_location(country_id, location)
+        logger.info(f"📍 Lokasyon bulundu (HTTP): {location}")
+
+        module = self.resolve_test_module(country_id, location, test_type)
+        module_id = module.get("Id")
+        logger.info(f"📝 Test türü bulundu (HTTP): {test_type}")
+
+        venue = self._find(self.list_venues(country_id, location, module_id), "Id", venue_id, "Venue")
+        venue_name = venue.get("Name", str(venue_id))
+        logger.info(f"🏢 Venue bulundu (HTTP): {venue_name}")
+
+        available_dates = []
+        for session in self.fetch_sessions(venue_id, module_id) or []:
+            level = str(session.get("Availability", "")).lower()
+            if level not in AVAILABLE_LEVELS:
+                continue
+            try:
+                date_obj = datetime.strptime(str(session.get("Date", ""))[:10], "%Y-%m-%d")
+            except ValueError:
+                logger.debug(f"📅 Tarih parse hatası (HTTP): {session}")
+                continue
+
+            if (date_obj.year, date_obj.month) in target_periods:
+                available_dates.append({
+                    "date": date_obj,
+                    "venue": venue_name,
+                    "date_str": date_obj.strftime("%Y-%m-%d"),
+                    "level": level
+                })
+                logger.info(f"✅ Hedef tarih bulundu (HTTP): {date_obj.strftime('%d %B %Y')} - {venue_name}")
+
+        return available_dates
+
+
+def main():
+    """Komut satırından tek seferlik HTTP kontrolü (fixture sunucusuna karşı da çalışır)"""
+    import argparse
+    from ielts_datepicker import target_periods
+
+    parser = argparse.ArgumentParser(description="IELTS HTTP motoru ile tarih kontrolü")
+    parser.add_argument("--base-url", default="https://ielts.idp.com/book/IELTS")
+    parser.add_argument("--country-id", default="212")
+    parser.add_argument("--location", default="Ankara")
+    parser.add_argument("--test-type", default="Academic - IELTS")
+    parser.add_argument("--venue-id", default="1771")
+    parser.add_argument("--months", default="7,8")
+    parser.add_argument("--year", type=int, default=2025)
+    parser.add_argument("--range", help="Yıl sınırını aşabilen ay aralığı, ör. 2025-11..2026-02")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    engine = IELTSHttpEngine(args.base_url)
+    try:
+        months = [int(x) for x in args.months.split(",") if x.strip()]
+        periods = target_periods(months, args.year, args.range)
+        dates = engine.check_available_dates(args.country_id, args.location, args.test_type,
+                                             args.venue_id, periods)
+        for d in dates:
+            print(f"{d['date_str']}  {d['venue']}")
+    except HttpEngineError as e:
+        logger.error(f"❌ HTTP motoru hatası: {e}")
+        raise SystemExit(1)
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
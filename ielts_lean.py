@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yalın tarama profili: headless Chrome'da akışın ihtiyaç duymadığı kaynak
+türlerini ve üçüncü taraf takip host'larını DevTools protokolüyle engeller,
+gereksiz Chrome özelliklerini kapatır ve kontrol başına engellenen istekleri raporlar.
+"""
+
+import json
+import logging
+from collections import Counter
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# Kaynak türü → Network.setBlockedURLs desenleri
+RESOURCE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav"],
+    "stylesheet": ["*.css"],
+}
+
+# CSS engellenmez: datepicker ve sonuç listesi görünürlük kontrolleri (offsetParent) stile bağlı
+DEFAULT_BLOCK_TYPES = ("image", "font", "media")
+
+# Booking akışında rolü olmayan analitik / reklam / takip host'ları
+THIRD_PARTY_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "connect.facebook.net",
+    "facebook.com/tr",
+    "hotjar.com",
+    "clarity.ms",
+    "bing.com",
+    "linkedin.com",
+    "licdn.com",
+    "tiktok.com",
+    "youtube.com",
+    "onetrust.com",
+    "cookielaw.org",
+    "newrelic.com",
+    "nr-data.net",
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+]
+
+# Akışın ihtiyaç duymadığı Chrome özellikleri
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-notifications",
+    "--disable-client-side-phishing-detection",
+    "--disable-domain-reliability",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions,AutofillServerCommunication",
+]
+
+LEAN_PREFS = {
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False,
+}
+
+
+def image_blocking_enabled(block_types=DEFAULT_BLOCK_TYPES, allow_list=None):
+    """
+    Görseller Chrome genelinde kapatılabilir mi: "image" engelleniyor olmalı ve
+    allow-list boş olmalı (bayrak host bazında daraltılamaz; allow-list varsa
+    görseller yalnızca ona saygı duyan URL desenleriyle engellenir)
+    """
+    return "image" in block_types and not allow_list
+
+
+def apply_lean_options(chrome_options, block_types=DEFAULT_BLOCK_TYPES, allow_list=None):
+    """Chrome seçeneklerine yalın profil bayraklarını ve ağ loglamayı ekler"""
+    prefs = dict(LEAN_PREFS)
+    for argument in LEAN_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    if image_blocking_enabled(block_types, allow_list):
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        prefs["profile.managed_default_content_settings.images"] = 2
+    chrome_options.add_experimental_option("prefs", prefs)
+    # Engellenen istekleri saymak için performans logu
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def build_block_patterns(block_types=DEFAULT_BLOCK_TYPES, allow_list=None, extra_hosts=None):
+    """Engellenecek URL desenlerini oluşturur; allow-list'teki host/desenler çıkarılır"""
+    allow_list = [a.lower() for a in (allow_list or [])]
+    patterns = []
+    for resource_type in block_types:
+        patterns.extend(RESOURCE_PATTERNS.get(resource_type, []))
+    for host in list(THIRD_PARTY_HOSTS) + list(extra_hosts or []):
+        if any(allowed in host.lower() for allowed in allow_list):
+            continue
+        patterns.append(f"*{host}*")
+    return [p for p in patterns if p.lower() not in allow_list]
+
+
+def enable_resource_blocking(driver, patterns):
+    """Network.setBlockedURLs ile desenleri engeller; başarısızsa False döndürür"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        logger.info(f"🪶 Yalın mod: {len(patterns)} URL deseni engelleniyor")
+        return True
+    except (WebDriverException, AttributeError) as e:
+        logger.warning(f"⚠️ Kaynak engelleme etkinleştirilemedi: {e}")
+        return False
+
+
+def collect_network_stats(driver):
+    """
+    Son çağrıdan bu yana biriken performans logunu okur.
+    {"requests", "blocked", "blocked_by_type", "blocked_other", "downloaded_bytes"} döndürür.
+    blocked: Network.setBlockedURLs desenlerine takılan (yalın modun engellediği) istekler;
+    blocked_other: tarayıcının başka nedenle (CSP, mixed content...) engellediği istekler.
+    Engellenen isteğin boyutu bilinmez; downloaded_bytes yalnızca indirilenleri sayar.
+    """
+    stats = {"requests": 0, "blocked": 0, "blocked_by_type": Counter(), "blocked_other": 0, "downloaded_bytes": 0}
+    try:
+        entries = driver.get_log("performance")
+    except (WebDriverException, ValueError) as e:
+        logger.debug(f"🪶 Performans logu okunamadı: {e}")
+        return stats
+
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError, TypeError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            stats["requests"] += 1
+        elif method == "Network.loadingFinished":
+            stats["downloaded_bytes"] += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            # setBlockedURLs ile engellenenler "inspector" nedeniyle düşer
+            if params["blockedReason"] == "inspector":
+                stats["blocked"] += 1
+                stats["blocked_by_type"][params.get("type", "Other")] += 1
+            else:
+                stats["blocked_other"] += 1
+    return stats
+
+
+def format_network_stats(stats):
+    """Ağ istatistiklerini tek satırlık log metnine çevirir"""
+    by_type = ", ".join(f"{t}: {n}" for t, n in stats["blocked_by_type"].most_common())
+    share = stats["blocked"] / stats["requests"] * 100 if stats["requests"] else 0
+    other = f", {stats['blocked_other']} başka nedenle engellendi" if stats["blocked_other"] else ""
+    return (f"{stats['requests']} istek, yalın mod {stats['blocked']} isteği engelledi (%{share:.0f}"
+            f"{f'; {by_type}' if by_type else ''}){other}, "
+            f"indirilen {stats['downloaded_bytes'] / 1024:.0f} KB")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kuyruk üzerinden log yazımı: tarama thread'leri kaydı yalnızca bir kuyruğa
+bırakır, diske ve konsola yazma ayrı bir dinleyici thread'inde yapılır. Log
+dosyası boyuta (ya da LOG_ROTATE_WHEN ile zamana) göre döndürülür.
+
+LOG_FORMAT = 'json' ile her satır bir JSON nesnesidir; kontrol döngüsü başına
+bir korelasyon kimliği (check), taranan hedef (target) ve kayda eklenen
+alanlar (ör. aşama süreleri) yer alır:
+
+    {"time": "...", "level": "INFO", "check": "a1b2c3d4", "target": "Ankara / ...", "msg": "...", "timings": {...}}
+"""
+
+import json
+import uuid
+import queue
+import atexit
+import logging
+import functools
+import contextvars
+import logging.handlers
+from datetime import datetime
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Dinleyici yetişemezse kuyruk bu boyutta kalır; fazlası düşürülür, tarama beklemez
+QUEUE_SIZE = 10000
+
+_context = contextvars.ContextVar("ielts_log_context", default={})
+
+# LogRecord'un kendi alanları; JSON'a yalnızca extra ile eklenenler yazılır
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+def new_check_id():
+    """Kısa korelasyon kimliği"""
+    return uuid.uuid4().hex[:8]
+
+
+class log_context:
+    """
+    Blok boyunca üretilen tüm loglara alan ekler (ör. check=..., target=...).
+    contextvars tabanlıdır; thread havuzuna copy_context() ile taşınır.
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self._token = None
+
+    def __enter__(self):
+        self._token = _context.set({**_context.get(), **self.fields})
+        return self
+
+    def __exit__(self, *exc):
+        _context.reset(self._token)
+
+
+def correlated(fn):
+    """Her çağrıya yeni bir kontrol kimliği veren dekoratör (run_check gibi döngü girişleri için)"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with log_context(check=new_check_id()):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+class ContextFilter(logging.Filter):
+    """Kaydı üreten thread'in bağlamını (check, target) kayda kopyalar"""
+
+    def filter(self, record):
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Tek satırlık JSON; extra alanları (timings, stage, elapsed_ms ...) korur"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        entry["msg"] = record.getMessage()
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Kuyruk doluysa beklemek yerine kaydı düşürür ve sayar"""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+def _file_handler(path, max_mb, backup_count, rotate_when):
+    if rotate_when:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=rotate_when, backupCount=backup_count, encoding="utf-8", delay=True
+        )
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=int(max_mb * 1024 * 1024) if max_mb else 0, backupCount=backup_count,
+        encoding="utf-8", delay=True
+    )
+
+
+def setup_logging(level="INFO", path=None, fmt="text", max_mb=10, backup_count=5, rotate_when=None,
+                  console=True):
+    """
+    Kök logger'ı kuyruk + dinleyici thread'i ile yapılandırır. Tekrar çağrılırsa
+    önceki dinleyici durdurulup yenisi kurulur. Dinleyiciyi döndürür.
+    """
+    global _listener
+    formatter = JsonFormatter() if str(fmt).lower() == "json" else logging.Formatter(TEXT_FORMAT)
+
+    handlers = []
+    if path:
+        file_handler = _file_handler(path, max_mb, backup_count, rotate_when)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    if console:
+        stream_handler = logging.StreamHandler()
+        # Konsol her zaman okunabilir kalır; JSON yalnızca dosyaya (dosya yoksa konsola) yazılır
+        stream_handler.setFormatter(formatter if not path else logging.Formatter(TEXT_FORMAT))
+        handlers.append(stream_handler)
+
+    if _listener is not None:
+        _listener.stop()
+    log_queue = queue.Queue(QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO) if isinstance(level, str) else level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Kuyrukta kalan kayıtları yazar ve dinleyiciyi durdurur"""
+    global _listener
+    if _listener is None:
+        return
+    if DroppingQueueHandler.dropped:
+        logging.getLogger(__name__).warning(f"⚠️ {DroppingQueueHandler.dropped} log kaydı kuyruk dolu olduğu için atlandı")
+    _listener.stop()
+    _listener = None
+
+
+def setup_from_settings(settings):
+    """Ayarlardaki LOG_* değerleriyle setup_logging"""
+    return setup_logging(settings.log_level, settings.log_path, settings.log_format,
+                         settings.log_max_mb, settings.log_backup_count, settings.log_rotate_when)
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kontrol hattının adım bazlı metrikleri: süre histogramları ve başarı/hata
+sayaçları. Daemon bunları Prometheus metin formatında yerel bir HTTP uç
+noktasından sunar, tek seferlik kontrol ise JSON özet dosyasına yazar.
+"""
+
+import os
+import json
+import time
+import logging
+import functools
+import threading
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# Saniye cinsinden histogram sınırları (tarayıcı başlatma ve datepicker beklemeleri dahil)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+METRIC_PREFIX = "ielts"
+
+
+class PhaseStats:
+    """Tek bir adımın sayaçları ve süre histogramı"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.success = 0
+        self.failure = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = 0.0
+        self.last_outcome = None
+        self.last_at = None
+
+    def observe(self, seconds, ok):
+        self.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_seconds = seconds
+        self.last_outcome = "success" if ok else "failure"
+        self.last_at = time.time()
+        if ok:
+            self.success += 1
+        else:
+            self.failure += 1
+
+    @property
+    def count(self):
+        return self.success + self.failure
+
+    def quantile(self, q):
+        """Histogramdan yaklaşık yüzdelik (ilgili kovanın üst sınırı)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.bucket_counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.max_seconds
+
+    def as_dict(self):
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets, self.bucket_counts):
+            running += n
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "success": self.success,
+            "failure": self.failure,
+            "total_seconds": round(self.total_seconds, 4),
+            "mean_seconds": round(self.total_seconds / self.count, 4) if self.count else None,
+            "max_seconds": round(self.max_seconds, 4),
+            "p50_seconds": self.quantile(0.5),
+            "p95_seconds": self.quantile(0.95),
+            "last_seconds": round(self.last_seconds, 4),
+            "last_outcome": self.last_outcome,
+            "last_at": self.last_at,
+            "buckets": cumulative,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._gauges = {}
+        self._local = threading.local()
+
+    def observe(self, phase, seconds, ok=True):
+        """Bir adımın süresini ve sonucunu kaydeder"""
+        with self._lock:
+            stats = self._phases.get(phase)
+            if stats is None:
+                stats = self._phases[phase] = PhaseStats(self.buckets)
+            stats.observe(seconds, ok)
+
+    def set_gauge(self, name, value):
+        """Anlık değer (ör. son kontrolde bulunan tarih sayısı)"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def mark_failed(self):
+        """
+        Ölçülen adımı hata olarak işaretler; hatayı yakalayıp boş sonuç
+        döndüren metotlar (ör. check_available_dates) için.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack:
+            stack[-1] = True
+
+    def timed(self, phase, failed=lambda result: result is False):
+        """
+        Metodu/fonksiyonu ölçen dekoratör. İstisna fırlatan, `failed(result)`
+        True dönen ya da mark_failed() çağıran adımlar hata sayılır.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                stack = getattr(self._local, "stack", None)
+                if stack is None:
+                    stack = self._local.stack = []
+                stack.append(False)
+                start = time.perf_counter()
+                ok = False
+                try:
+                    result = fn(*args, **kwargs)
+                    ok = not failed(result)
+                    return result
+                finally:
+                    marked = stack.pop()
+                    self.observe(phase, time.perf_counter() - start, ok and not marked)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """Tüm metriklerin JSON'a yazılabilir kopyası"""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "generated_at": time.time(),
+                "phases": {name: stats.as_dict() for name, stats in sorted(self._phases.items())},
+                "gauges": dict(self._gauges),
+            }
+
+    def render_prometheus(self):
+        """Prometheus metin formatı (text/plain; version=0.0.4)"""
+        snapshot = self.snapshot()
+        duration = f"{METRIC_PREFIX}_phase_duration_seconds"
+        total = f"{METRIC_PREFIX}_phase_total"
+        lines = [
+            f"# HELP {duration} Kontrol adımlarının süresi",
+            f"# TYPE {duration} histogram",
+        ]
+        for phase, stats in snapshot["phases"].items():
+            for bound, n in stats["buckets"].items():
+                lines.append(f'{duration}_bucket{{phase="{phase}",le="{bound}"}} {n}')
+            lines.append(f'{duration}_sum{{phase="{phase}"}} {stats["total_seconds"]}')
+            lines.append(f'{duration}_count{{phase="{phase}"}} {stats["count"]}')
+
+        lines += [f"# HELP {total} Adım sonuçları", f"# TYPE {total} counter"]
+        for phase, stats in snapshot["phases"].items():
+            lines.append(f'{total}{{phase="{phase}",outcome="success"}} {stats["success"]}')
+            lines.append(f'{total}{{phase="{phase}",outcome="failure"}} {stats["failure"]}')
+
+        for name, value in sorted(snapshot["gauges"].items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_uptime_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_uptime_seconds {snapshot['generated_at'] - self.started_at:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_summary(self, path):
+        """Metrikleri atomik olarak JSON özet dosyasına yazar"""
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+            logger.info(f"📊 Metrik özeti yazıldı: {path}")
+            return True
+        except OSError as e:
+            logger.warning(f"⚠️ Metrik özeti yazılamadı: {e}")
+            return False
+
+    def summary_line(self):
+        """Adım başına ortalama süreleri tek satır log metni olarak döndürür"""
+        parts = []
+        for phase, stats in self.snapshot()["phases"].items():
+            if stats["count"]:
+                parts.append(f"{phase}={stats['mean_seconds']:.2f}s ({stats['failure']} hata)")
+        return ", ".join(parts) or "-"
+
+
+# Tüm modüllerin paylaştığı varsayılan kayıt
+REGISTRY = MetricsRegistry()
+
+
+def timed(phase, failed=lambda result: result is False):
+    """Varsayılan kayıt üzerinde adım ölçen dekoratör"""
+    return REGISTRY.timed(phase, failed)
+
+
+def mark_failed():
+    """Varsayılan kayıtta o an ölçülen adımı hata olarak işaretler"""
+    REGISTRY.mark_failed()
+
+
+def _metrics_handler(registry):
+    """/metrics isteklerini karşılayan handler sınıfı (http.server yalnızca daemon'da yüklenir)"""
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path in ("/metrics", "/"):
+                body = registry.render_prometheus().encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/metrics.json":
+                body = json.dumps(registry.snapshot(), ensure_ascii=False).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("metrics: " + format % args)
+
+    return MetricsHandler
+
+
+def start_metrics_server(host="127.0.0.1", port=9108, registry=REGISTRY):
+    """/metrics uç noktasını arka plan thread'inde başlatır; başarısızsa None döndürür"""
+    from http.server import ThreadingHTTPServer
+    try:
+        server = ThreadingHTTPServer((host, port), _metrics_handler(registry))
+    except OSError as e:
+        logger.warning(f"⚠️ Metrik sunucusu başlatılamadı ({host}:{port}): {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"📊 Metrikler: http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Telegram bildirim bileşeni: keep-alive bağlantı havuzu, arka plan gönderim
+kuyruğu, backoff'lu yeniden deneme ve 429 retry_after desteği.
+Yeni tarih mesajları hata ve negatif mesajlardan önce gönderilir.
+"""
+
+import time
+import queue
+import logging
+import itertools
+import threading
+
+import ielts_metrics as metrics
+
+logger = logging.getLogger(__name__)
+
+# Düşük değer önce gönderilir
+PRIORITY_POSITIVE = 0
+PRIORITY_ERROR = 1
+PRIORITY_NEGATIVE = 2
+
+TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/{method}"
+
+_STOP = object()
+
+
+class TelegramNotifier:
+    def __init__(self, token, chat_id=None, max_retries=4, backoff_base=1.0,
+                 backoff_max=30.0, timeout=10, pool_size=4):
+        self.token = token
+        self.chat_id = chat_id
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._session = None
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"queued": 0, "sent": 0, "failed": 0, "retries": 0, "rate_limited": 0}
+
+    @property
+    def session(self):
+        """Keep-alive HTTP oturumu; requests ilk gönderimde yüklenir"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def api_url(self, method):
+        """Telegram Bot API metodunun URL'si"""
+        return TELEGRAM_API_URL.format(token=self.token, method=method)
+
+    def _ensure_worker(self):
+        """Gönderim thread'ini ilk mesajda başlatır"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="telegram-notifier", daemon=True)
+                self._thread.start()
+
+    def send(self, message, priority=PRIORITY_NEGATIVE, chat_id=None):
+        """Mesajı kuyruğa ekler ve hemen döner; scrape thread'i bloklanmaz"""
+        chat_id = chat_id or self.chat_id
+        if not chat_id:
+            logger.warning("⚠️ CHAT_ID tanımlanmamış, mesaj gönderilemiyor")
+            return False
+
+        self._ensure_worker()
+        self._queue.put((priority, next(self._sequence), chat_id, message))
+        self.stats["queued"] += 1
+        return True
+
+    def send_now(self, message, chat_id=None):
+        """Mesajı kuyruğu atlayarak senkron gönderir"""
+        chat_id = chat_id or self.chat_id
+        if not chat_id:
+            logger.warning("⚠️ CHAT_ID tanımlanmamış, mesaj gönderilemiyor")
+            return False
+        return self._deliver(chat_id, message)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item[3] is _STOP:
+                    return
+                _, _, chat_id, message = item
+                self._deliver(chat_id, message)
+            except Exception as e:
+                logger.error(f"❌ Telegram kuyruk hatası: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _backoff(self, attempt):
+        return min(self.backoff_max, self.backoff_base * (2 ** attempt))
+
+    @metrics.timed("telegram_delivery")
+    def _deliver(self, chat_id, message):
+        """Mesajı yeniden deneme ve rate-limit kurallarıyla gönderir"""
+        from requests import RequestException
+
+        data = {
+            "chat_id": chat_id,
+            "text": message,
+            "parse_mode": "HTML",
+            "disable_web_page_preview": True
+        }
+
+        for attempt in range(self.max_retries + 1):
+            delay = None
+            try:
+                response = self.session.post(self.api_url("sendMessage"), data=data, timeout=self.timeout)
+                result = response.json()
+                if result.get("ok"):
+                    self.stats["sent"] += 1
+                    logger.info("✅ Telegram mesajı gönderildi")
+                    return True
+
+                if response.status_code == 429:
+                    self.stats["rate_limited"] += 1
+                    delay = result.get("parameters", {}).get("retry_after", self._backoff(attempt))
+                    logger.warning(f"⏳ Telegram rate limit, {delay}s sonra tekrar denenecek")
+                elif response.status_code >= 500:
+                    delay = self._backoff(attempt)
+                    logger.warning(f"⚠️ Telegram sunucu hatası ({response.status_code}), tekrar denenecek")
+                else:
+                    # 400/403 gibi hatalar tekrar denemeyle düzelmez
+                    logger.error(f"❌ Telegram mesaj hatası: {result}")
+                    break
+            except (RequestException, ValueError) as e:
+                delay = self._backoff(attempt)
+                logger.warning(f"⚠️ Telegram gönderme hatası: {e}")
+
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                time.sleep(delay)
+
+        self.stats["failed"] += 1
+        logger.error("❌ Telegram mesajı gönderilemedi")
+        return False
+
+    def flush(self, timeout=60):
+        """Kuyruktaki mesajlar gönderilene kadar (en fazla timeout saniye) bekler"""
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                logger.warning(f"⚠️ {self._queue.unfinished_tasks} Telegram mesajı gönderilemeden kaldı")
+                return False
+            time.sleep(0.05)
+        return True
+
+    def close(self, timeout=60):
+        """Kuyruğu boşaltır, gönderim thread'ini durdurur ve bağlantıları kapatır"""
+        self.flush(timeout)
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put((float("inf"), next(self._sequence), None, _STOP))
+            self._thread.join(timeout=5)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aşamalı tarama: bir hedefin taraması sonuç sayfası → venue/datepicker → tarih
+okuma aşamalarına bölünür. Hatalar üç sınıfa ayrılır:
+
+- transient: zaman aşımı, bayat element, araya giren overlay → yalnızca o
+  aşama aynı oturumda yeniden denenir (ör. venue'ye yeniden tıklanıp
+  datepicker yeniden beklenir); tarayıcı ve form baştan açılmaz.
+- selector_drift: sayfa geldi ama beklenen öğe yok → yeniden denenmez, site
+  değişikliği olarak raporlanır.
+- site_down: bağlantı / DNS hatası, 5xx sayfası → devre kesiciye sayılır.
+  Art arda eşik kadar site_down olunca devre açılır; bekleme süresi boyunca
+  tarama yapılmaz ve hata mesajı gönderilmez.
+
+    python ielts_pipeline.py ielts_breaker.json   # devre kesici durumu
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+import ielts_metrics as metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BREAKER_PATH = "ielts_breaker.json"
+
+TRANSIENT, SELECTOR_DRIFT, SITE_DOWN = "transient", "selector_drift", "site_down"
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Tarayıcı / requests hata metinlerinde sitenin erişilemediğini gösteren parçalar
+SITE_DOWN_MARKERS = (
+    "net::ERR_", "ERR_CONNECTION", "ERR_NAME_NOT_RESOLVED", "ERR_TIMED_OUT", "ERR_ADDRESS_UNREACHABLE",
+    "ERR_INTERNET_DISCONNECTED", "ERR_TUNNEL_CONNECTION_FAILED", "Failed to establish a new connection",
+    "Name or service not known", "Max retries exceeded",
+)
+SITE_DOWN_EXCEPTIONS = {"ConnectionError", "ConnectTimeout", "NewConnectionError", "NameResolutionError"}
+SELECTOR_DRIFT_EXCEPTIONS = {"NoSuchElementException", "InvalidSelectorException"}
+
+# Sayfa başlığı / gövdesinde bakım veya 5xx hata sayfası işaretleri
+DOWN_PAGE_MARKERS = (
+    "502 bad gateway", "503 service", "504 gateway", "service unavailable", "bad gateway",
+    "gateway timeout", "under maintenance", "temporarily unavailable", "internal server error",
+)
+DOWN_PAGE_SCRIPT = """
+return [document.title || '', document.body ? document.body.innerText.slice(0, 500) : ''];
+"""
+
+
+class StageError(Exception):
+    """Sınıflandırılmış aşama hatası"""
+
+    def __init__(self, kind, stage, message=""):
+        super().__init__(f"{stage}: {message}" if message else stage)
+        self.kind = kind
+        self.stage = stage
+
+
+def classify(exc):
+    """İstisnayı transient / selector_drift / site_down sınıfına ayırır"""
+    if isinstance(exc, StageError):
+        return exc.kind
+    name = type(exc).__name__
+    text = str(exc)
+    if name in SITE_DOWN_EXCEPTIONS or any(marker in text for marker in SITE_DOWN_MARKERS):
+        return SITE_DOWN
+    if name in SELECTOR_DRIFT_EXCEPTIONS:
+        return SELECTOR_DRIFT
+    return TRANSIENT
+
+
+def page_is_down(driver):
+    """Açık sayfa bir 5xx / bakım sayfası mı"""
+    try:
+        title, body = driver.execute_script(DOWN_PAGE_SCRIPT) or ("", "")
+    except Exception:
+        return False
+    text = f"{title}\n{body}".lower()
+    return any(marker in text for marker in DOWN_PAGE_MARKERS)
+
+
+def run_stage(stage, fn, retries=2, backoff=1.0, can_retry=None):
+    """
+    fn'i çalıştırır; transient hatada yalnızca bu aşamayı en fazla retries kez
+    yeniden dener. Diğer sınıflar ve tükenen denemeler StageError olarak yükselir.
+    can_retry() False dönerse (ör. tarayıcı oturumu öldü) yeniden denenmez.
+    """
+    attempt = 0
+    while True:
+        start = time.monotonic()
+        try:
+            result = fn()
+            elapsed = time.monotonic() - start
+            metrics.REGISTRY.observe(f"stage_{stage}", elapsed, ok=True)
+            logger.debug(f"✔️ {stage} aşaması {elapsed:.2f}s", extra={"stage": stage, "elapsed_ms": round(elapsed * 1000),
+                                                                      "attempt": attempt + 1})
+            return result
+        except Exception as e:
+            metrics.REGISTRY.observe(f"stage_{stage}", time.monotonic() - start, ok=False)
+            kind = classify(e)
+            if kind != TRANSIENT or attempt >= retries or (can_retry and not can_retry()):
+                if isinstance(e, StageError):
+                    raise
+                raise StageError(kind, stage, str(e).splitlines()[0] if str(e) else type(e).__name__) from e
+            attempt += 1
+            logger.warning(f"🔁 {stage} aşamasında geçici hata ({type(e).__name__}), "
+                           f"aşama yeniden deneniyor ({attempt}/{retries})")
+            time.sleep(backoff * attempt)
+
+
+class CircuitBreaker:
+    """
+    Art arda site_down hatalarında açılan devre kesici. Durum dosyaya yazılır;
+    tek seferlik çalıştırmalar (cron / GitHub Actions) arasında da korunur ve
+    her çağrıda dosya değiştiyse yeniden okunur (koordinatör ve worker'lar aynı
+    devreyi görür). Yarı açık devrenin deneme taraması da dosyada tutulur;
+    trial_timeout içinde sonuç bildirmeyen deneme bayat sayılır.
+    """
+
+    def __init__(self, path=DEFAULT_BREAKER_PATH, threshold=3, cooldown=600, max_cooldown=3600,
+                 trial_timeout=900):
+        self.path = path
+        self.threshold = max(1, int(threshold))
+        self.cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self.trial_timeout = trial_timeout
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._data = self._load()
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+
+    def _load(self):
+        empty = {"state": CLOSED, "failures": 0, "opened_at": 0, "cooldown": self.cooldown, "last_error": "",
+                 "trial_started_at": 0}
+        self._mtime = self._stat() if self.path else None
+        if not self.path or not os.path.exists(self.path):
+            return empty
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return {**empty, **json.load(f)}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Devre kesici durumu okunamadı ({self.path}): {e}")
+            return empty
+
+    def _refresh_locked(self):
+        """Başka bir süreç durumu değiştirdiyse dosyadan yeniden okur"""
+        if self.path and self._stat() != self._mtime:
+            self._data = self._load()
+
+    def _save_locked(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._mtime = self._stat()
+        except OSError as e:
+            logger.warning(f"⚠️ Devre kesici durumu yazılamadı: {e}")
+
+    def _trial_running(self):
+        started = self._data["trial_started_at"]
+        return bool(started) and time.time() - started < self.trial_timeout
+
+    @property
+    def state(self):
+        with self._lock:
+            self._refresh_locked()
+            return self._data["state"]
+
+    def remaining(self):
+        """Açık devrenin kapanmaya (deneme taramasına) kalan saniyesi"""
+        if self._data["state"] != OPEN:
+            return 0
+        return max(0, self._data["opened_at"] + self._data["cooldown"] - time.time())
+
+    def blocked_for(self):
+        """Devreyi değiştirmeden: tarama için beklenecek saniye (0: allow() denenebilir)"""
+        with self._lock:
+            self._refresh_locked()
+            if self._data["state"] == OPEN:
+                return self.remaining()
+            if self._data["state"] == HALF_OPEN and self._trial_running():
+                return max(0, self._data["trial_started_at"] + self.trial_timeout - time.time())
+            return 0
+
+    def allow(self):
+        """
+        Tarama yapılabilir mi. Bekleme süresi dolan açık devre yarı açığa geçer ve
+        tek bir deneme taramasına izin verir.
+        """
+        with self._lock:
+            self._refresh_locked()
+            if self._data["state"] == CLOSED:
+                return True
+            if self._data["state"] == OPEN and self.remaining() > 0:
+                return False
+            if self._trial_running():
+                return False
+            if self._data["trial_started_at"]:
+                logger.warning("🔌 Önceki deneme taraması sonuç bildirmedi, yeniden deneniyor")
+            self._data.update(state=HALF_OPEN, trial_started_at=time.time())
+            self._save_locked()
+            logger.info("🔌 Devre yarı açık: deneme taraması yapılıyor")
+            return True
+
+    def abandon_trial(self):
+        """
+        Deneme taraması site hakkında sonuç üretmeden bitti (tarayıcı açılamadı,
+        beklenmeyen hata); devre yarı açık kalır, sonraki allow() yeniden dener
+        """
+        with self._lock:
+            self._refresh_locked()
+            if self._data["trial_started_at"]:
+                self._data["trial_started_at"] = 0
+                self._save_locked()
+
+    def record_success(self):
+        """Site yanıt verdi; devre kapanır. Devre daha önce açıksa True (toparlandı)"""
+        with self._lock:
+            self._refresh_locked()
+            recovered = self._data["state"] != CLOSED
+            if recovered or self._data["failures"]:
+                self._data.update(state=CLOSED, failures=0, cooldown=self.cooldown, last_error="",
+                                  trial_started_at=0)
+                self._save_locked()
+            metrics.REGISTRY.set_gauge("circuit_open", 0)
+            return recovered
+
+    def record_failure(self, kind, error=""):
+        """
+        Hatayı kaydeder. Yalnızca site_down sayılır (diğer sınıflar sitenin yanıt
+        verdiğini gösterir, onlar için record_success). Devre bu çağrıyla açıldıysa True.
+        """
+        if kind != SITE_DOWN:
+            return False
+        with self._lock:
+            self._refresh_locked()
+            self._data["trial_started_at"] = 0
+            self._data["failures"] += 1
+            self._data["last_error"] = str(error)[:300]
+            opened = False
+            if self._data["state"] == HALF_OPEN:
+                # Deneme başarısız: bekleme süresi katlanarak yeniden açılır
+                self._data.update(state=OPEN, opened_at=time.time(),
+                                  cooldown=min(self.max_cooldown, self._data["cooldown"] * 2))
+            elif self._data["state"] == CLOSED and self._data["failures"] >= self.threshold:
+                self._data.update(state=OPEN, opened_at=time.time(), cooldown=self.cooldown)
+                opened = True
+            self._save_locked()
+            metrics.REGISTRY.set_gauge("circuit_open", int(self._data["state"] != CLOSED))
+            return opened
+
+    def summary(self):
+        with self._lock:
+            self._refresh_locked()
+            return {**self._data, "remaining_seconds": int(self.remaining())}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(path=DEFAULT_BREAKER_PATH, threshold=3, cooldown=600, max_cooldown=3600):
+    """Aynı durum dosyasını kullanan tüm worker'lar için tek bir devre kesici döndürür"""
+    with _breakers_lock:
+        breaker = _breakers.get(path)
+        if breaker is None:
+            breaker = CircuitBreaker(path, threshold, cooldown, max_cooldown)
+            _breakers[path] = breaker
+        return breaker
+
+
+if __name__ == "__main__":
+    import sys
+    breaker = CircuitBreaker(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BREAKER_PATH)
+    print(json.dumps(breaker.summary(), ensure_ascii=False, indent=2))
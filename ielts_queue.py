@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Koordinatör / worker modu için yerel iş kuyruğu (SQLite, WAL).
+
+Koordinatör her döngüde hedef başına bir iş ekler ve sonuçları bekler;
+worker süreçleri işleri süreli kiralar (lease), hedefi tarar ve sonucu geri
+yazar. Kirası dolan iş (worker öldü / takıldı) başka bir worker'a verilir;
+aynı hedefin bitmemiş işi varken ikinci iş eklenmez ve geç gelen ikinci sonuç
+yok sayılır. Worker ekledikçe aynı döngüde taranan hedef sayısı artar.
+
+    python ielts_tracker.py --role coordinator
+    python ielts_tracker.py --role worker      # istenen sayıda süreç / makine
+    python ielts_queue.py                      # kuyruk durumu
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+from ielts_scan import ScanTarget, target_key
+from ielts_logging import log_context
+
+logger = logging.getLogger(__name__)
+
+
+class JobDeferred(Exception):
+    """scan() işi şu an tarayamaz (ör. devre açık); iş deneme hakkı harcanmadan kuyruğa döner"""
+
+
+DEFAULT_QUEUE_PATH = "ielts_queue.db"
+
+# İş durumları
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    job_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cycle_id INTEGER NOT NULL REFERENCES cycles(id),
+    target_key TEXT NOT NULL,
+    target TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, priority, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_cycle ON jobs(cycle_id);
+-- Aynı hedefin aynı anda yalnızca bir bitmemiş işi olabilir
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_open_target ON jobs(target_key) WHERE state IN ('pending', 'leased');
+"""
+
+
+def worker_name():
+    """Kiraları sahiplenmek için makine ve süreç adı"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def encode_dates(dates):
+    """Tarih kayıtlarını JSON'a çevirir (datetime alanı date_str'den yeniden kurulur)"""
+    return json.dumps([{k: v for k, v in d.items() if k != "date"} for d in dates], ensure_ascii=False)
+
+
+def decode_dates(raw):
+    dates = []
+    for d in json.loads(raw or "[]"):
+        d["date"] = datetime.strptime(d["date_str"], "%Y-%m-%d")
+        dates.append(d)
+    return dates
+
+
+class JobQueue:
+    def __init__(self, path=DEFAULT_QUEUE_PATH, lease_seconds=300, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Birden fazla süreç aynı dosyayı kullanır; yazma kilidi için bekle
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if "priority" not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            self.conn.close()
+
+    def _write(self, fn):
+        """fn(conn)'u tek bir BEGIN IMMEDIATE transaction'ında çalıştırır (süreçler arası atomik)"""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self.conn)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return result
+
+    # --- Koordinatör ---
+
+    def enqueue_cycle(self, targets, priorities=None):
+        """
+        Yeni döngü için hedef başına bir iş ekler ve döngü id'sini döndürür.
+        Hedefin önceki döngüden kalan bitmemiş işi varsa yenisi eklenmez, o iş
+        bu döngüye devredilir. Düşük priority değerli işler önce kiralanır.
+        """
+        now = time.time()
+        priorities = list(priorities) if priorities is not None else [0] * len(targets)
+
+        def enqueue(conn):
+            cycle_id = conn.execute("INSERT INTO cycles (created_at) VALUES (?)", (now,)).lastrowid
+            adopted = 0
+            for target, priority in zip(targets, priorities):
+                key = target_key(target)
+                cursor = conn.execute(
+                    "UPDATE jobs SET cycle_id = ?, priority = ? WHERE target_key = ? AND state IN (?, ?)",
+                    (cycle_id, priority, key, PENDING, LEASED)
+                )
+                if cursor.rowcount:
+                    adopted += 1
+                    continue
+                conn.execute(
+                    "INSERT INTO jobs (cycle_id, target_key, target, priority, enqueued_at) VALUES (?, ?, ?, ?, ?)",
+                    (cycle_id, key, json.dumps(list(target), ensure_ascii=False), priority, now)
+                )
+            conn.execute("UPDATE cycles SET job_count = ? WHERE id = ?", (len(targets), cycle_id))
+            return cycle_id, adopted
+
+        cycle_id, adopted = self._write(enqueue)
+        if adopted:
+            logger.info(f"📮 {adopted} hedefin önceki işi hâlâ sürüyor, yeniden eklenmedi")
+        return cycle_id
+
+    def cycle_state(self, cycle_id):
+        """Döngünün iş sayıları (durum → adet)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT state, COUNT(*) AS n FROM jobs WHERE cycle_id = ? GROUP BY state", (cycle_id,)
+            ).fetchall()
+        return {row["state"]: row["n"] for row in rows}
+
+    def wait_cycle(self, cycle_id, timeout, poll_interval=1.0):
+        """Döngünün tüm işleri bitene (ya da süre dolana) kadar bekler; bitti mi döndürür"""
+        deadline = time.monotonic() + timeout
+        while True:
+            self.requeue_expired()
+            counts = self.cycle_state(cycle_id)
+            if not counts.get(PENDING) and not counts.get(LEASED):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+
+    def collect(self, cycle_id):
+        """
+        Döngünün sonuçlarını birleştirir: (tekilleştirilmiş tarihler, taranan
+        hedefler, başarısız hedefler). Aynı (hedef, tarih) bir kez yer alır.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT target, state, result FROM jobs WHERE cycle_id = ? ORDER BY id", (cycle_id,)
+            ).fetchall()
+        merged, scanned, failed = {}, [], []
+        for row in rows:
+            target = ScanTarget(*json.loads(row["target"]))
+            if row["state"] != DONE:
+                failed.append(target)
+                continue
+            scanned.append(target)
+            for d in decode_dates(row["result"]):
+                merged.setdefault((target_key(target), d["date_str"]), d)
+        return list(merged.values()), scanned, failed
+
+    def _requeue_expired(self, conn, now):
+        """Transaction içinde: kirası dolan işleri kuyruğa geri koyar, deneme hakkı bitenleri başarısız sayar"""
+        expired = conn.execute(
+            "SELECT id, attempts, lease_owner FROM jobs WHERE state = ? AND lease_expires < ?", (LEASED, now)
+        ).fetchall()
+        for row in expired:
+            if row["attempts"] >= self.max_attempts:
+                conn.execute("UPDATE jobs SET state = ?, finished_at = ?, error = ? WHERE id = ?",
+                             (FAILED, now, f"kira doldu ({row['lease_owner']})", row["id"]))
+            else:
+                conn.execute("UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires = NULL WHERE id = ?",
+                             (PENDING, row["id"]))
+        return expired
+
+    def _log_expired(self, expired):
+        for row in expired:
+            outcome = "deneme hakkı bitti" if row["attempts"] >= self.max_attempts else "yeniden kuyrukta"
+            logger.warning(f"⏳ İş #{row['id']} kirası doldu ({row['lease_owner']}), {outcome}")
+
+    def requeue_expired(self):
+        """Kirası dolan işleri kuyruğa geri koyar; deneme hakkı bitenleri başarısız sayar"""
+        expired = self._write(lambda conn: self._requeue_expired(conn, time.time()))
+        self._log_expired(expired)
+        return len(expired)
+
+    def purge(self, older_than_days=7):
+        """Bitmiş eski işleri ve döngüleri siler"""
+        cutoff = time.time() - older_than_days * 86400
+
+        def purge(conn):
+            count = conn.execute("DELETE FROM jobs WHERE state IN (?, ?) AND finished_at < ?",
+                                 (DONE, FAILED, cutoff)).rowcount
+            conn.execute("DELETE FROM cycles WHERE created_at < ? AND id NOT IN (SELECT cycle_id FROM jobs)",
+                         (cutoff,))
+            return count
+
+        return self._write(purge)
+
+    # --- Worker ---
+
+    def lease(self, owner):
+        """Sıradaki işi kiralar: (iş id, ScanTarget) ya da boş kuyrukta None"""
+        now = time.time()
+
+        def lease(conn):
+            # Kirası dolanlar önce deneme hakkına göre kuyruğa döner ya da başarısız olur;
+            # koordinatör çalışmıyorken de ölen worker'ın işi sonsuza dek kiralanmaz
+            expired = self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT id, target FROM jobs WHERE state = ? ORDER BY priority, id LIMIT 1", (PENDING,)
+            ).fetchone()
+            if row is None:
+                return expired, None
+            conn.execute(
+                "UPDATE jobs SET state = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                (LEASED, owner, now + self.lease_seconds, row["id"])
+            )
+            return expired, (row["id"], ScanTarget(*json.loads(row["target"])))
+
+        expired, job = self._write(lease)
+        self._log_expired(expired)
+        return job
+
+    def heartbeat(self, job_id, owner):
+        """Uzun süren taramada kirayı uzatır; kira başkasına geçtiyse False"""
+        def extend(conn):
+            return conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND state = ? AND lease_owner = ?",
+                (time.time() + self.lease_seconds, job_id, LEASED, owner)
+            ).rowcount
+
+        return bool(self._write(extend))
+
+    def complete(self, job_id, owner, dates):
+        """
+        Sonucu yazar. İş bu arada başka bir worker tarafından bitirildiyse sonuç
+        yok sayılır (False); aynı hedef iki kez bildirilmez.
+        """
+        def complete(conn):
+            return conn.execute(
+                "UPDATE jobs SET state = ?, result = ?, finished_at = ?, lease_owner = ?, error = NULL "
+                "WHERE id = ? AND state IN (?, ?)",
+                (DONE, encode_dates(dates), time.time(), owner, job_id, PENDING, LEASED)
+            ).rowcount
+
+        return bool(self._write(complete))
+
+    def fail(self, job_id, owner, error):
+        """Taranamayan işi deneme hakkı kaldıysa kuyruğa geri koyar"""
+        def fail(conn):
+            row = conn.execute("SELECT attempts FROM jobs WHERE id = ? AND state = ? AND lease_owner = ?",
+                               (job_id, LEASED, owner)).fetchone()
+            if row is None:
+                return None
+            if row["attempts"] >= self.max_attempts:
+                conn.execute("UPDATE jobs SET state = ?, finished_at = ?, error = ? WHERE id = ?",
+                             (FAILED, time.time(), str(error)[:500], job_id))
+                return FAILED
+            conn.execute("UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, error = ? WHERE id = ?",
+                         (PENDING, str(error)[:500], job_id))
+            return PENDING
+
+        return self._write(fail)
+
+    def release(self, job_id, owner):
+        """Kiralanan işi taranmadan, deneme sayılmadan kuyruğa geri koyar"""
+        def release(conn):
+            return conn.execute(
+                "UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, "
+                "attempts = MAX(attempts - 1, 0) WHERE id = ? AND state = ? AND lease_owner = ?",
+                (PENDING, job_id, LEASED, owner)
+            ).rowcount
+
+        return bool(self._write(release))
+
+    def stats(self):
+        """Kuyruk özeti: durum sayıları ve aktif kiraların sahipleri"""
+        with self._lock:
+            states = {row["state"]: row["n"] for row in self.conn.execute(
+                "SELECT state, COUNT(*) AS n FROM jobs GROUP BY state")}
+            owners = [row["lease_owner"] for row in self.conn.execute(
+                "SELECT DISTINCT lease_owner FROM jobs WHERE state = ? AND lease_owner IS NOT NULL", (LEASED,))]
+            last = self.conn.execute("SELECT * FROM cycles ORDER BY id DESC LIMIT 1").fetchone()
+        return {"states": states, "active_workers": owners, "last_cycle": dict(last) if last else None}
+
+
+class _LeaseKeeper(threading.Thread):
+    """Tarama sürerken kirayı lease süresinin üçte birinde bir yeniler"""
+
+    def __init__(self, queue, job_id, owner):
+        super().__init__(daemon=True)
+        self.queue, self.job_id, self.owner = queue, job_id, owner
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(max(1.0, self.queue.lease_seconds / 3)):
+            try:
+                if not self.queue.heartbeat(self.job_id, self.owner):
+                    logger.warning(f"⚠️ İş #{self.job_id} kirası kaybedildi")
+                    return
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Kira yenilenemedi: {e}")
+
+
+def run_worker(queue, scan, owner=None, poll_interval=2.0, stop_event=None, max_jobs=None, gate=None):
+    """
+    Kuyruktan iş alıp scan(target) ile tarar. scan tarih listesi ya da
+    taranamadıysa None döndürür; JobDeferred fırlatırsa iş deneme sayılmadan
+    geri bırakılır. gate() verilirse her kiradan önce çağrılır ve beklenecek
+    saniyeyi döndürür (0: kirala). İşlenen iş sayısını döndürür.
+    """
+    owner = owner or worker_name()
+    stop_event = stop_event or threading.Event()
+    processed = 0
+    logger.info(f"👷 Worker başladı: {owner}")
+    while not stop_event.is_set() and (max_jobs is None or processed < max_jobs):
+        delay = gate() if gate else 0
+        if delay:
+            stop_event.wait(delay)
+            continue
+        job = queue.lease(owner)
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        job_id, target = job
+        keeper = _LeaseKeeper(queue, job_id, owner)
+        keeper.start()
+        try:
+            with log_context(check=f"job-{job_id}"):
+                dates = scan(target)
+        except JobDeferred as e:
+            keeper.stopped.set()
+            queue.release(job_id, owner)
+            logger.info(f"⏸️ İş #{job_id} ertelendi ({e}), kuyruğa geri bırakıldı")
+            stop_event.wait(poll_interval)
+            continue
+        except Exception as e:
+            dates, error = None, e
+        else:
+            error = "tarama başarısız"
+        finally:
+            keeper.stopped.set()
+        if dates is None:
+            state = queue.fail(job_id, owner, error)
+            logger.warning(f"⚠️ İş #{job_id} taranamadı ({error}), durum: {state}")
+        elif queue.complete(job_id, owner, dates):
+            logger.info(f"📬 İş #{job_id} tamamlandı: {len(dates)} tarih")
+        else:
+            logger.info(f"📭 İş #{job_id} başka bir worker tarafından bitirilmiş, sonuç atlandı")
+        processed += 1
+    return processed
+
+
+if __name__ == "__main__":
+    import sys
+    queue = JobQueue(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_QUEUE_PATH)
+    try:
+        print(json.dumps(queue.stats(), ensure_ascii=False, indent=2))
+    finally:
+        queue.close()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tüm tarayıcılar, HTTP motoru ve worker süreçleri için ortak istek bütçesi.
+
+Host başına token bucket (ör. ielts.idp.com=30/min:5 → dakikada 30 istek,
+en fazla 5'lik patlama). Kova durumu kilitli bir JSON dosyasında tutulur;
+aynı dosyayı kullanan tüm thread'ler ve süreçler tek bütçeyi paylaşır. Bekleyen
+istekler önceliğe göre sıralanır: hedef ayı en yakın olan tarama token'ı önce alır.
+
+    python ielts_ratelimit.py ielts_ratelimit.json   # kova ve bekleyen durumu
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import date
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows: yalnızca süreç içi paylaşım
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = "ielts_ratelimit.json"
+
+# Öncelik: hedef aya kalan ay sayısı; yaklaşan hedef ayı olmayan taramalar en sona
+LOWEST_PRIORITY = 99
+
+# Bekleyen kaydı bu süre yenilenmezse (süreç öldü) sıradan düşürülür
+WAITER_STALE_SECONDS = 5.0
+
+_UNITS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60, "h": 3600, "hour": 3600}
+
+
+def parse_budget(spec):
+    """"30/min", "2/s:4" → (saniyedeki token, kova kapasitesi)"""
+    spec = str(spec).strip()
+    burst = None
+    if ":" in spec:
+        spec, burst = spec.split(":", 1)
+    count, _, unit = spec.partition("/")
+    rate = float(count) / _UNITS[(unit or "s").strip().lower()]
+    if rate <= 0:
+        raise ValueError(f"Geçersiz bütçe: {spec}")
+    return rate, max(1.0, float(burst) if burst else 1.0)
+
+
+def parse_budgets(raw):
+    """
+    "ielts.idp.com=30/min:5;*=60/min" ya da {"ielts.idp.com": "30/min:5"} →
+    {host: (rate, burst)}. "*" listede olmayan tüm host'lar için ortak kovadır.
+    """
+    if not raw:
+        return {}
+    items = raw.items() if isinstance(raw, dict) else (
+        item.split("=", 1) for item in str(raw).replace(",", ";").split(";") if "=" in item
+    )
+    return {host.strip().lower(): parse_budget(spec) for host, spec in items}
+
+
+def month_distance(periods, today=None):
+    """En yakın gelecek hedef aya kalan ay sayısı; hepsi geçmişse LOWEST_PRIORITY"""
+    today = today or date.today()
+    current = today.year * 12 + today.month - 1
+    distances = [year * 12 + month - 1 - current for year, month in periods]
+    upcoming = [d for d in distances if d >= 0]
+    return min(upcoming) if upcoming else LOWEST_PRIORITY
+
+
+class _FileLock:
+    """Süreçler arası kilit (flock); thread'ler de kendi fd'leriyle sıraya girer"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+class RateLimiter:
+    def __init__(self, path=DEFAULT_STATE_PATH, budgets=None, poll_interval=0.05):
+        self.path = path
+        self.budgets = parse_budgets(budgets)
+        self.poll_interval = poll_interval
+        self._local_lock = threading.Lock()
+        self._sequence = 0
+        if fcntl is None:
+            logger.info("ℹ️ fcntl yok, istek bütçesi yalnızca bu süreç içinde paylaşılıyor")
+
+    def bucket_for(self, url_or_host):
+        """URL'nin hangi kovaya düştüğü: (kova adı, (rate, burst)) ya da sınırsızsa None"""
+        host = urlparse(url_or_host).hostname if "//" in url_or_host else url_or_host
+        host = (host or "").lower()
+        for name, budget in self.budgets.items():
+            if name != "*" and (host == name or host.endswith("." + name)):
+                return name, budget
+        if "*" in self.budgets:
+            return "*", self.budgets["*"]
+        return None
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault("buckets", {})
+        state.setdefault("waiters", {})
+        return state
+
+    def _save(self, state):
+        tmp_path = f"{self.path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def _waiter_id(self):
+        with self._local_lock:
+            self._sequence += 1
+            return f"{os.getpid()}:{threading.get_ident()}:{self._sequence}"
+
+    def _try_take(self, name, budget, waiter, priority, since):
+        """
+        Kilit altında kovayı doldurur ve sıradaki bekleyen bu istekse token verir.
+        (token alındı mı, tahmini bekleme süresi) döndürür.
+        """
+        rate, burst = budget
+        now = time.time()
+        with self._local_lock, _FileLock(f"{self.path}.lock"):
+            state = self._load()
+            bucket = state["buckets"].get(name) or {"tokens": burst, "updated": now}
+            tokens = min(burst, bucket["tokens"] + max(0.0, now - bucket["updated"]) * rate)
+
+            waiters = {k: v for k, v in state["waiters"].items() if now - v[3] < WAITER_STALE_SECONDS}
+            waiters[waiter] = [name, priority, since, now]
+            first = min((v[1], v[2], k) for k, v in waiters.items() if v[0] == name)[2]
+
+            taken = first == waiter and tokens >= 1.0
+            if taken:
+                tokens -= 1.0
+                del waiters[waiter]
+            state["buckets"][name] = {"tokens": tokens, "updated": now}
+            state["waiters"] = waiters
+            self._save(state)
+        wait = 0.0 if taken else max(self.poll_interval, (1.0 - tokens) / rate)
+        return taken, wait
+
+    def _leave(self, waiter):
+        """Bekleme yarıda kesilirse kaydı sıradan siler"""
+        with self._local_lock, _FileLock(f"{self.path}.lock"):
+            state = self._load()
+            if state["waiters"].pop(waiter, None) is not None:
+                self._save(state)
+
+    def acquire(self, url, priority=LOWEST_PRIORITY, timeout=None):
+        """
+        url'nin kovasından bir token alana kadar bekler; beklenen süreyi döndürür.
+        Düşük priority değeri önce hizmet alır; timeout dolarsa TimeoutError.
+        """
+        bucket = self.bucket_for(url)
+        if bucket is None:
+            return 0.0
+        name, budget = bucket
+        waiter = self._waiter_id()
+        since = time.time()
+        start = time.monotonic()
+        try:
+            while True:
+                taken, wait = self._try_take(name, budget, waiter, priority, since)
+                if taken:
+                    return time.monotonic() - start
+                if timeout is not None and time.monotonic() - start + wait > timeout:
+                    raise TimeoutError(f"{name} bütçesi {timeout:.0f}s içinde token vermedi")
+                # Bekleme kaydı WAITER_STALE_SECONDS dolmadan yenilenmeli
+                time.sleep(min(wait, WAITER_STALE_SECONDS / 2))
+        except BaseException:
+            self._leave(waiter)
+            raise
+
+    def summary(self):
+        """Kovaların anlık doluluğu ve bekleyen istek sayısı"""
+        state = self._load()
+        now = time.time()
+        buckets = {}
+        for name, (rate, burst) in self.budgets.items():
+            bucket = state["buckets"].get(name) or {"tokens": burst, "updated": now}
+            tokens = min(burst, bucket["tokens"] + max(0.0, now - bucket["updated"]) * rate)
+            buckets[name] = {"tokens": round(tokens, 2), "burst": burst, "per_minute": round(rate * 60, 2)}
+        waiting = [v for v in state["waiters"].values() if now - v[3] < WAITER_STALE_SECONDS]
+        return {"buckets": buckets, "waiting": len(waiting)}
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(path=DEFAULT_STATE_PATH, budgets=None):
+    """Aynı durum dosyasını kullanan tüm worker'lar için tek bir sınırlayıcı döndürür"""
+    with _limiters_lock:
+        limiter = _limiters.get(path)
+        if limiter is None:
+            limiter = RateLimiter(path, budgets)
+            _limiters[path] = limiter
+        return limiter
+
+
+if __name__ == "__main__":
+    import sys
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATE_PATH
+    limiter = RateLimiter(path, sys.argv[2] if len(sys.argv) > 2 else "ielts.idp.com=30/min:5")
+    print(json.dumps(limiter.summary(), ensure_ascii=False, indent=2))
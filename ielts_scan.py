@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çoklu hedef taraması: (ülke, lokasyon, test türü, venue) hedeflerini
+sınırlı sayıda WebDriver worker'ına dağıtır ve sonuçları tek listede birleştirir.
+"""
+
+import time
+import logging
+import threading
+import contextvars
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+ScanTarget = namedtuple("ScanTarget", "country_id location test_type venue_id venue_name")
+
+DEFAULT_TARGET = ScanTarget("212", "Ankara", "Academic - IELTS", "1771", "Bilkent University")
+
+
+def describe(target):
+    """Hedefi log satırları için kısa metne çevirir"""
+    return f"{target.location} / {target.test_type} / {target.venue_name} ({target.venue_id})"
+
+
+def target_key(target):
+    """Hedefi benzersiz tanımlayan anahtar"""
+    return f"{target.country_id}|{target.location}|{target.test_type}|{target.venue_id}"
+
+
+def parse_target_spec(spec):
+    """
+    "212|Ankara|Academic - IELTS|1771|Bilkent University;212|Istanbul|..."
+    biçimindeki metni ScanTarget listesine çevirir
+    """
+    targets = []
+    for item in (spec or "").split(";"):
+        parts = [p.strip() for p in item.split("|")]
+        if len(parts) < 4 or not all(parts[:4]):
+            continue
+        venue_name = parts[4] if len(parts) > 4 and parts[4] else parts[3]
+        targets.append(ScanTarget(parts[0], parts[1], parts[2], parts[3], venue_name))
+    return targets
+
+
+def load_targets(raw, default):
+    """config/env'den gelen hedef tanımını normalize eder, boşsa varsayılanı döndürür"""
+    if not raw:
+        return [default]
+    if isinstance(raw, str):
+        return parse_target_spec(raw) or [default]
+
+    targets = []
+    for item in raw:
+        if isinstance(item, ScanTarget):
+            targets.append(item)
+        elif isinstance(item, dict):
+            targets.append(ScanTarget(
+                str(item.get("country_id", default.country_id)),
+                item.get("location", default.location),
+                item.get("test_type", default.test_type),
+                str(item.get("venue_id", default.venue_id)),
+                item.get("venue_name") or str(item.get("venue_id", default.venue_name)),
+            ))
+        else:
+            fields = [str(x) for x in item]
+            if len(fields) == 4:
+                fields.append(fields[3])
+            targets.append(ScanTarget(*fields[:5]))
+    return targets or [default]
+
+
+class ScanPool:
+    """
+    Her thread kendi worker'ını (ve dolayısıyla kendi WebDriver'ını) tutar;
+    worker'lar döngüler arasında yeniden kullanılır.
+    """
+
+    def __init__(self, worker_factory, pool_size=2):
+        self.worker_factory = worker_factory
+        self.pool_size = max(1, int(pool_size))
+        self.executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="ielts-scan")
+        self._local = threading.local()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def _worker(self):
+        """Mevcut thread'in worker'ını döndürür, yoksa oluşturur"""
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            worker = self.worker_factory()
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+        return worker
+
+    def _scan_one(self, target):
+        start = time.monotonic()
+        dates = self._worker().scan_target(target)
+        return dates, time.monotonic() - start
+
+    def scan(self, targets):
+        """
+        Hedefleri paralel tarar.
+        (birleştirilmiş tarih listesi, başarısız hedefler listesi) döndürür.
+        """
+        start = time.monotonic()
+        # Kontrol kimliği (log bağlamı) worker thread'lerine taşınır
+        futures = {
+            self.executor.submit(contextvars.copy_context().run, self._scan_one, target): target
+            for target in targets
+        }
+
+        merged = []
+        failed = []
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                dates, elapsed = future.result()
+            except Exception as e:
+                logger.error(f"❌ Hedef tarama hatası [{describe(target)}]: {e}")
+                failed.append(target)
+                continue
+            if dates is None:
+                logger.warning(f"⚠️ Hedef taranamadı: {describe(target)}")
+                failed.append(target)
+                continue
+            logger.info(f"🎯 {describe(target)}: {len(dates)} tarih ({elapsed:.1f}s)")
+            merged.extend(dates)
+
+        logger.info(
+            f"🧮 {len(targets)} hedef {self.pool_size} worker ile "
+            f"{time.monotonic() - start:.1f}s içinde tarandı ({len(failed)} başarısız)"
+        )
+        return merged, failed
+
+    def close(self):
+        """Havuzu ve worker'ların tarayıcılarını kapatır"""
+        self.executor.shutdown(wait=True)
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.shutdown()
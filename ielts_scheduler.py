@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Uyarlanabilir kontrol zamanlayıcısı: kontroller kesin deadline'larda başlar,
+ardışık hatalarda üstel olarak geri çekilir, yeni slotların açıldığı "release
+window"larda daha sık, diğer saatlerde daha seyrek kontrol eder. Seyrek dönem
+aralığı, günlük toplam kontrol sayısı sabit aralıklı çalışmayı aşmayacak
+şekilde hesaplanır.
+"""
+
+import time
+import random
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+import ielts_metrics as metrics
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+SECONDS_PER_DAY = 86400
+
+
+class ReleaseWindow:
+    """Gün içi zaman aralığı; isteğe bağlı olarak belirli haftanın günleriyle sınırlı"""
+
+    def __init__(self, start_minute, end_minute, days=None, source="config"):
+        self.start_minute = start_minute
+        self.end_minute = end_minute
+        self.days = frozenset(days) if days else frozenset(range(7))
+        self.source = source
+
+    @property
+    def minutes_per_day(self):
+        """Pencerenin haftalık ortalamada güne düşen süresi (dakika)"""
+        length = (self.end_minute - self.start_minute) % (24 * 60) or 24 * 60
+        return length * len(self.days) / 7
+
+    def contains(self, moment):
+        minute = moment.hour * 60 + moment.minute
+        if self.start_minute <= self.end_minute:
+            return moment.weekday() in self.days and self.start_minute <= minute < self.end_minute
+        # Gece yarısını aşan pencere: başlangıç günü akşamı veya ertesi sabah
+        if minute >= self.start_minute:
+            return moment.weekday() in self.days
+        return minute < self.end_minute and (moment.weekday() - 1) % 7 in self.days
+
+    def __repr__(self):
+        days = "" if len(self.days) == 7 else ",".join(DAY_NAMES[d] for d in sorted(self.days)) + " "
+        return (f"{days}{self.start_minute // 60:02d}:{self.start_minute % 60:02d}-"
+                f"{self.end_minute // 60:02d}:{self.end_minute % 60:02d} ({self.source})")
+
+
+def _parse_clock(text):
+    hour, minute = text.strip().split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _parse_days(text):
+    days = set()
+    for part in text.lower().split("/"):
+        if "-" in part:
+            first, last = (DAY_NAMES.index(p.strip()[:3]) for p in part.split("-", 1))
+            day = first
+            while True:
+                days.add(day)
+                if day == last:
+                    break
+                day = (day + 1) % 7
+        elif part.strip():
+            days.add(DAY_NAMES.index(part.strip()[:3]))
+    return days
+
+
+def parse_release_window(spec):
+    """
+    "09:00-11:30", "mon-fri 09:00-11:30" veya "tue/thu 22:00-01:00" biçimindeki
+    metni ReleaseWindow'a çevirir
+    """
+    spec = spec.strip()
+    days = None
+    if " " in spec:
+        day_spec, spec = spec.rsplit(" ", 1)
+        days = _parse_days(day_spec)
+    start, end = spec.split("-", 1)
+    return ReleaseWindow(_parse_clock(start), _parse_clock(end), days)
+
+
+def load_release_windows(raw):
+    """config/env'den gelen pencere listesini normalize eder; hatalı girdiler atlanır"""
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    windows = []
+    for item in raw:
+        if isinstance(item, ReleaseWindow):
+            windows.append(item)
+            continue
+        try:
+            windows.append(parse_release_window(item))
+        except (ValueError, IndexError) as e:
+            logger.warning(f"⚠️ Geçersiz release window '{item}': {e}")
+    return windows
+
+
+def learn_release_windows(hour_counts, min_events=3, top_hours=3):
+    """
+    Yeni slotların ilk görüldüğü saatlerin dağılımından pencere çıkarır:
+    ortalamanın belirgin üstündeki en yoğun saatler birer saatlik pencere olur.
+    """
+    total = sum(hour_counts.values())
+    if total < min_events:
+        return []
+    mean = total / 24
+    busy = [hour for hour, count in Counter(hour_counts).most_common(top_hours)
+            if count >= max(2, 1.5 * mean)]
+    return [ReleaseWindow(hour * 60, (hour + 1) * 60 % (24 * 60), source="öğrenilen") for hour in sorted(busy)]
+
+
+class AdaptiveScheduler:
+    def __init__(self, base_interval, window_interval=None, min_interval=60,
+                 max_backoff=3600, backoff_factor=2.0, release_windows=None,
+                 now=datetime.now):
+        self.base_interval = float(base_interval)
+        self.window_interval = float(window_interval or max(min_interval, base_interval / 3))
+        self.min_interval = float(min_interval)
+        self.max_backoff = float(max_backoff)
+        self.backoff_factor = backoff_factor
+        self.now = now
+        self.consecutive_failures = 0
+        self.next_deadline = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.set_release_windows(release_windows or [])
+
+    def set_release_windows(self, windows):
+        """Pencereleri ve onlara göre bütçe-nötr seyrek dönem aralığını günceller"""
+        self.release_windows = list(windows)
+        self.off_peak_interval = self._budget_neutral_off_peak()
+        if self.release_windows:
+            logger.info(
+                f"🗓️ Release window'lar: {', '.join(map(repr, self.release_windows))} | "
+                f"pencere içi {self.window_interval / 60:.1f} dk, dışı {self.off_peak_interval / 60:.1f} dk"
+            )
+
+    def _budget_neutral_off_peak(self):
+        """
+        Pencerelerde sık kontrol yapılırken günlük kontrol sayısının sabit aralıklı
+        çalışmayı (86400 / base_interval) aşmaması için gereken pencere dışı aralık
+        """
+        if not self.release_windows:
+            return self.base_interval
+        window_seconds = min(SECONDS_PER_DAY * 0.9, sum(w.minutes_per_day for w in self.release_windows) * 60)
+        budget = SECONDS_PER_DAY / self.base_interval
+        remaining = budget - window_seconds / self.window_interval
+        off_peak_seconds = SECONDS_PER_DAY - window_seconds
+        if remaining <= 1:
+            # Pencereler bütçeyi tüketiyor; dışarıda geri çekilme üst sınırına kadar seyrekleş
+            logger.warning("⚠️ Release window'lar günlük kontrol bütçesini aşıyor; pencere aralığını büyütün")
+            return max(self.base_interval, self.max_backoff)
+        # Pencere dışı aralık max_backoff ile sınırlı; sınır devreye girerse hacim bütçeyi biraz aşabilir
+        return max(self.base_interval, min(self.max_backoff, off_peak_seconds / remaining))
+
+    def active_window(self, moment=None):
+        moment = moment or self.now()
+        for window in self.release_windows:
+            if window.contains(moment):
+                return window
+        return None
+
+    def _next_window_start(self, moment):
+        """moment'tan sonraki ilk pencere başlangıcı (dakika çözünürlüğünde, 1 gün ileriye kadar)"""
+        probe = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(24 * 60):
+            if self.active_window(probe):
+                return probe
+            probe += timedelta(minutes=1)
+        return None
+
+    def next_interval(self, success, moment=None):
+        """Bir sonraki kontrole kadar beklenecek süre (saniye)"""
+        moment = moment or self.now()
+        if success:
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+
+        if self.consecutive_failures:
+            # Site/Chrome sorunu: üstel geri çekilme (±%10 jitter)
+            interval = self.base_interval * self.backoff_factor ** (self.consecutive_failures - 1)
+            interval = min(self.max_backoff, interval) * random.uniform(0.9, 1.1)
+            return max(self.min_interval, interval)
+
+        if self.active_window(moment):
+            return max(self.min_interval, self.window_interval)
+
+        interval = self.off_peak_interval
+        # Seyrek dönemde bir pencerenin başlangıcını kaçırma
+        window_start = self._next_window_start(moment) if self.release_windows else None
+        if window_start is not None:
+            interval = min(interval, max(self.min_interval, (window_start - moment).total_seconds()))
+        return max(self.min_interval, interval)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def request_run(self):
+        """Bekleyen deadline'ı beklemeden bir sonraki kontrolü hemen başlatır (isteğe bağlı kontrol)"""
+        self._wake.set()
+
+    def run_forever(self, job, refresh_windows=None, refresh_every=SECONDS_PER_DAY):
+        """
+        job() True/False döndürür. Deadline'lar bir önceki kontrolün başlangıcından
+        hesaplanır; uzun süren kontrol kayma yaratmaz, gecikmiş deadline'da
+        biriken kontroller art arda çalıştırılmaz.
+        """
+        last_refresh = time.monotonic()
+        self.next_deadline = time.monotonic()
+        while not self._stop.is_set():
+            delay = self.next_deadline - time.monotonic()
+            if delay > 0:
+                self._wake.wait(delay)
+            if self._stop.is_set():
+                break
+            self._wake.clear()
+
+            started = time.monotonic()
+            lateness = started - self.next_deadline
+            try:
+                success = bool(job())
+            except Exception as e:
+                logger.error(f"❌ Zamanlanmış kontrol hatası: {e}")
+                success = False
+
+            if refresh_windows and time.monotonic() - last_refresh >= refresh_every:
+                last_refresh = time.monotonic()
+                try:
+                    self.set_release_windows(refresh_windows())
+                except Exception as e:
+                    logger.warning(f"⚠️ Release window'lar güncellenemedi: {e}")
+
+            interval = self.next_interval(success)
+            self.next_deadline = max(time.monotonic(), started + interval)
+            wait_seconds = self.next_deadline - time.monotonic()
+
+            metrics.REGISTRY.set_gauge("scheduler_interval_seconds", round(interval, 1))
+            metrics.REGISTRY.set_gauge("scheduler_consecutive_failures", self.consecutive_failures)
+            metrics.REGISTRY.set_gauge("scheduler_lateness_seconds", round(max(0.0, lateness), 3))
+            window = self.active_window()
+            state = (f"{self.consecutive_failures}. hata, geri çekilme" if self.consecutive_failures
+                     else "release window" if window else "normal")
+            logger.info(f"⏰ Sonraki kontrol {wait_seconds / 60:.1f} dk sonra ({state})")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Uyarlanabilir selector çözücü: bir mantıksal elementin (ör. "country_dropdown")
+tüm aday selector'larını aynı anda bekler, ilk eşleşeni kullanır ve hangi
+selector'ın kazandığını diske yazar; bir sonraki çalıştırmada kazanan önce denenir.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_PATH = "selector_stats.json"
+
+# Mantıksal element → aday selector listesi (tanımlanma sırası ilk çalıştırmadaki sıradır)
+SELECTORS = {
+    "login_link": [
+        (By.LINK_TEXT, "Login Here"),
+        (By.PARTIAL_LINK_TEXT, "Login"),
+        (By.XPATH, "//a[contains(text(), 'Login')]"),
+        (By.CLASS_NAME, "login-link"),
+    ],
+    "username_field": [
+        (By.ID, "Username"),
+        (By.NAME, "Username"),
+        (By.XPATH, "//input[@type='text']"),
+        (By.XPATH, "//input[contains(@placeholder, 'sername')]"),
+    ],
+    "password_field": [
+        (By.ID, "Password"),
+        (By.NAME, "Password"),
+        (By.XPATH, "//input[@type='password']"),
+        (By.XPATH, "//input[contains(@placeholder, 'assword')]"),
+    ],
+    "login_button": [
+        (By.XPATH, "//input[@value='Login']"),
+        (By.XPATH, "//button[contains(text(), 'Login')]"),
+        (By.XPATH, "//input[@type='submit']"),
+        (By.CLASS_NAME, "login-button"),
+    ],
+    "login_success": [
+        (By.PARTIAL_LINK_TEXT, "My Account"),
+        (By.PARTIAL_LINK_TEXT, "Account"),
+        (By.XPATH, "//a[contains(text(), 'Account')]"),
+        (By.CLASS_NAME, "user-menu"),
+    ],
+    "country_dropdown": [
+        (By.ID, "CountryId"),
+        (By.NAME, "CountryId"),
+        (By.XPATH, "//select[contains(@name, 'Country')]"),
+    ],
+    "location_dropdown": [
+        (By.ID, "TestCentreLocationName"),
+        (By.NAME, "TestCentreLocationName"),
+        (By.XPATH, "//select[contains(@name, 'Location')]"),
+    ],
+    "test_type_dropdown": [
+        (By.ID, "TestModuleId"),
+        (By.NAME, "TestModuleId"),
+        (By.XPATH, "//select[contains(@name, 'TestModule')]"),
+    ],
+}
+
+
+def xpath_literal(text):
+    """Metni XPath string literal'ine çevirir; iki tür tırnak da varsa concat() ile"""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def venue_link_selectors(target):
+    """
+    Hedef venue'nun linki için aday selector'lar. Ad boşlukları normalize edilerek
+    tam eşleşir; "British Council Ankara" "British Council Istanbul"u yakalamaz.
+    """
+    venue_name = " ".join(target.venue_name.split())
+    name = xpath_literal(venue_name)
+    return [
+        (By.XPATH, f"//a[@data-target='#venue-info-{target.venue_id}']"),
+        (By.XPATH, f"//a[normalize-space()={name}]"),
+        (By.XPATH, f"//a[contains(@data-target, 'venue-info-{target.venue_id}')]"),
+        (By.XPATH, f"//h3[@class='panel-title']//a[normalize-space()={name}]"),
+        (By.LINK_TEXT, venue_name),
+        (By.XPATH, f"//div[@class='panel panel-default']//a[normalize-space()={name}]"),
+    ]
+
+
+def selector_key(locator):
+    """(By, değer) çiftini istatistik anahtarına çevirir"""
+    return f"{locator[0]}|{locator[1]}"
+
+
+@contextmanager
+def implicit_wait_disabled(driver, restore_to):
+    """
+    Aday taraması sırasında implicit wait'i kapatır; aksi halde bulunamayan
+    her selector poll başına implicit wait süresi kadar bloklar.
+    """
+    driver.implicitly_wait(0)
+    try:
+        yield
+    finally:
+        try:
+            driver.implicitly_wait(restore_to)
+        except WebDriverException:
+            pass
+
+
+def _is_clickable(element):
+    return element.is_displayed() and element.is_enabled()
+
+
+class SelectorResolver:
+    def __init__(self, path=DEFAULT_STATS_PATH, implicit_wait=0, poll_interval=0.2):
+        self.path = path
+        self.implicit_wait = implicit_wait
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stats = self._load()
+
+    def _load(self):
+        """İstatistik dosyasını yükler; yoksa ya da bozuksa boş başlar"""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Selector istatistikleri okunamadı ({self.path}): {e}")
+            return {}
+
+    def save(self):
+        """Değişiklik varsa istatistikleri atomik olarak diske yazar"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._stats, ensure_ascii=False, indent=2)
+            self._dirty = False
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ Selector istatistikleri yazılamadı: {e}")
+
+    def rank(self, name, candidates):
+        """Adayları son kazanan önce, sonra isabet sayısına göre sıralar"""
+        with self._lock:
+            entry = self._stats.get(name, {})
+        last = entry.get("last")
+        counts = entry.get("selectors", {})
+
+        def order(indexed):
+            index, locator = indexed
+            key = selector_key(locator)
+            return (key != last, -counts.get(key, {}).get("hits", 0), index)
+
+        return [locator for _, locator in sorted(enumerate(candidates), key=order)]
+
+    def _record(self, name, ranked, winner):
+        """Kazananı ve ondan önce denenip eşleşmeyenleri kaydeder"""
+        with self._lock:
+            entry = self._stats.setdefault(name, {"last": None, "selectors": {}})
+            for locator in ranked:
+                key = selector_key(locator)
+                counts = entry["selectors"].setdefault(key, {"hits": 0, "misses": 0})
+                if winner is not None and key == selector_key(winner):
+                    counts["hits"] += 1
+                    entry["last"] = key
+                    break
+                counts["misses"] += 1
+            self._dirty = True
+
+    def find(self, driver, name, candidates=None, timeout=15, clickable=False):
+        """
+        Tüm adayları aynı anda bekler, ilk eşleşeni döndürür.
+        (locator, element) ya da bulunamazsa (None, None) döndürür.
+        """
+        ranked = self.rank(name, candidates or SELECTORS[name])
+
+        def any_candidate(d):
+            for locator in ranked:
+                for element in d.find_elements(*locator):
+                    if not clickable or _is_clickable(element):
+                        return locator, element
+            return False
+
+        start = time.monotonic()
+        try:
+            with implicit_wait_disabled(driver, self.implicit_wait):
+                locator, element = WebDriverWait(driver, timeout, poll_frequency=self.poll_interval).until(any_candidate)
+        except TimeoutException:
+            self._record(name, ranked, None)
+            logger.debug(f"🔎 {name}: hiçbir selector eşleşmedi ({time.monotonic() - start:.1f}s)")
+            return None, None
+
+        self._record(name, ranked, locator)
+        logger.debug(f"🔎 {name}: {locator[1]} ({time.monotonic() - start:.2f}s)")
+        return locator, element
+
+    def stats(self):
+        """Mantıksal element başına selector isabet/ıska sayılarını döndürür"""
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    def report(self):
+        """Site değişimini görmek için istatistikleri okunabilir satırlara çevirir"""
+        lines = []
+        for name, entry in sorted(self.stats().items()):
+            lines.append(f"{name} (son kazanan: {entry.get('last')})")
+            for key, counts in entry.get("selectors", {}).items():
+                lines.append(f"   {counts['hits']:>5} isabet {counts['misses']:>5} ıska  {key}")
+        return "\n".join(lines)
+
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(path=DEFAULT_STATS_PATH, implicit_wait=0):
+    """Aynı dosyayı kullanan tüm worker'lar için tek bir çözücü döndürür"""
+    with _resolvers_lock:
+        resolver = _resolvers.get(path)
+        if resolver is None:
+            resolver = SelectorResolver(path, implicit_wait)
+            _resolvers[path] = resolver
+        return resolver
+
+
+if __name__ == "__main__":
+    import sys
+    resolver = SelectorResolver(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATS_PATH)
+    print(resolver.report() or "Henüz selector istatistiği yok.")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Oturum önbelleği: giriş yapılmış tarayıcının cookie'leri ve her hedef için
+filtreleri uygulanmış venue sonuç sayfasının URL'si diske yazılır. Yeni
+tarayıcı cookie'lerle başlatılır; önbellek geçerliyse login ve form adımları
+atlanıp doğrudan sonuç sayfasına gidilir. Doğrulama başarısız olursa kayıt
+silinir ve tam akışa dönülür.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "session_cache.json"
+
+
+def _url_without_fragment(url):
+    return (url or "").split("#", 1)[0].rstrip("/?")
+
+
+class SessionCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=12 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self):
+        """Önbellek dosyasını yükler; yoksa, bozuksa ya da süresi dolmuşsa boş başlar"""
+        empty = {"saved_at": 0, "cookies": [], "logged_in": False, "targets": {}}
+        if not self.path or not os.path.exists(self.path):
+            return empty
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Oturum önbelleği okunamadı ({self.path}): {e}")
+            return empty
+        if time.time() - data.get("saved_at", 0) > self.ttl:
+            logger.info("⌛ Oturum önbelleğinin süresi dolmuş, tam akış kullanılacak")
+            return empty
+        return {**empty, **data}
+
+    def _save_locked(self):
+        """Önbelleği atomik olarak ve yalnızca sahibinin okuyabileceği şekilde yazar"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ Oturum önbelleği yazılamadı: {e}")
+
+    def cookies(self):
+        """Süresi dolmamış cookie'ler (CDP Network.setCookies biçiminde)"""
+        now = time.time()
+        with self._lock:
+            return [c for c in self._data["cookies"] if not c.get("expires") or c["expires"] <= 0 or c["expires"] > now]
+
+    @property
+    def logged_in(self):
+        return bool(self._data.get("logged_in")) and bool(self._data["cookies"])
+
+    def results_url(self, key):
+        """Hedefin filtreli sonuç sayfası URL'si; süresi dolmuşsa None"""
+        with self._lock:
+            entry = self._data["targets"].get(key)
+        if not entry or time.time() - entry.get("saved_at", 0) > self.ttl:
+            return None
+        return entry.get("url")
+
+    def store(self, cookies, key=None, url=None, base_url=None, logged_in=None):
+        """
+        Cookie'leri ve (verildiyse) hedefin sonuç URL'sini kaydeder. URL filtreleri
+        taşımıyorsa (base_url ile aynıysa) kaydedilmez; o sayfaya gitmek formu atlatmaz.
+        """
+        with self._lock:
+            self._data["cookies"] = list(cookies or [])
+            self._data["saved_at"] = time.time()
+            if logged_in is not None:
+                self._data["logged_in"] = logged_in
+            if key and url:
+                if _url_without_fragment(url) == _url_without_fragment(base_url):
+                    logger.debug("🍪 Sonuç sayfası URL'si filtre taşımıyor, önbelleğe alınmadı")
+                else:
+                    self._data["targets"][key] = {"url": url, "saved_at": time.time()}
+            self._save_locked()
+
+    def invalidate(self, key=None, login=False):
+        """Doğrulaması başarısız olan hedef kaydını veya giriş durumunu siler"""
+        with self._lock:
+            if key:
+                self._data["targets"].pop(key, None)
+            if login:
+                self._data["logged_in"] = False
+                self._data["cookies"] = []
+            self._save_locked()
+
+    def summary(self):
+        with self._lock:
+            age = int(time.time() - self._data["saved_at"]) if self._data["saved_at"] else None
+            hosts = sorted({c.get("domain", "").lstrip(".") for c in self._data["cookies"]})
+            return {
+                "age_seconds": age,
+                "logged_in": bool(self._data.get("logged_in")),
+                "cookies": len(self._data["cookies"]),
+                "cookie_hosts": hosts,
+                "targets": sorted(self._data["targets"]),
+            }
+
+
+def export_cookies(driver):
+    """Tarayıcıdaki tüm cookie'leri (tüm domain'ler) CDP üzerinden okur"""
+    return driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+
+
+def restore_cookies(driver, cookies):
+    """
+    Cookie'leri sayfa açılmadan önce CDP ile yükler (Selenium add_cookie domain'e
+    gitmeyi gerektirirdi). Yüklenen cookie sayısını döndürür.
+    """
+    if not cookies:
+        return 0
+    allowed = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+    payload = []
+    for cookie in cookies:
+        item = {k: cookie[k] for k in allowed if k in cookie}
+        if item.get("expires", 0) <= 0:
+            item.pop("expires", None)
+        payload.append(item)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": payload})
+    return len(payload)
+
+
+def same_site(url, base_url):
+    """Önbellekteki URL'nin hâlâ ayarlardaki siteye ait olup olmadığı"""
+    return urlparse(url).netloc == urlparse(base_url).netloc
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_session_cache(path=DEFAULT_CACHE_PATH, ttl=12 * 3600):
+    """Aynı dosyayı kullanan tüm worker'lar için tek bir önbellek döndürür"""
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = SessionCache(path, ttl)
+            _caches[path] = cache
+        return cache
+
+
+if __name__ == "__main__":
+    import sys
+    cache = SessionCache(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CACHE_PATH)
+    print(json.dumps(cache.summary(), ensure_ascii=False, indent=2))
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Booking sayfası snapshot'larını kaydedip tarayıcısız yeniden oynatır.
+
+Kayıt: her tarama sonunda #venue-selection-results ve datepicker'ın okunan her
+görünümünün tam HTML'i, bekleme süreleri ve bulunan tarih sayısı gzip'li JSON
+Lines arşivine eklenir (her snapshot ayrı bir gzip üyesi; dosya append-only).
+Taranamayan hedeflerde (StageError) hata sınıfı ve sayfanın tamamı da kaydedilir.
+
+Oynatma: tarih okuma BeautifulSoup ile aynı selector cascade'i üzerinden
+snapshot'larda çalıştırılır; selector ayarlarken binlerce parse saniyeler
+içinde denenir, üretimdeki "tarih bulunamadı" durumları çevrimdışı incelenir.
+
+    python ielts_snapshots.py replay ielts_snapshots.jsonl.gz
+    python ielts_snapshots.py replay ielts_snapshots.jsonl.gz --selectors my_selectors.json --show
+    python ielts_snapshots.py stats ielts_snapshots.jsonl.gz
+"""
+
+import os
+import gzip
+import json
+import time
+import zlib
+import logging
+import threading
+from datetime import datetime
+
+from ielts_extract import extract_date_cells_from_html, parse_date_cells
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = "ielts_snapshots.jsonl.gz"
+
+# Kayıt modları: off, empty (yalnızca tarih bulunamayan taramalar), all
+SNAPSHOT_MODES = ("off", "empty", "all")
+
+VENUE_RESULTS_HTML_SCRIPT = """
+var root = document.getElementById('venue-selection-results');
+return root ? root.outerHTML : null;
+"""
+
+# Başarısız taramada sayfanın tamamı ve (varsa) hedef datepicker
+FAILURE_HTML_SCRIPT = """
+var root = document.getElementById(arguments[0]);
+return [document.documentElement ? document.documentElement.outerHTML : null, root ? root.outerHTML : null];
+"""
+
+
+class SnapshotRecorder:
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH, max_mb=50):
+        self.path = path
+        self.max_bytes = max_mb * 1024 * 1024 if max_mb else 0
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def _rotate(self):
+        """Arşiv sınırı aşınca bir önceki arşivin yerine geçer (en fazla iki dosya)"""
+        if self.max_bytes and os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+            os.replace(self.path, f"{self.path}.1")
+            logger.info(f"📦 Snapshot arşivi döndürüldü: {self.path}.1")
+
+    def record(self, snapshot):
+        """Snapshot'ı kendi gzip üyesi olarak arşive ekler; yazılan sıkıştırılmış bayt sayısını döndürür"""
+        line = (json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        payload = gzip.compress(line, compresslevel=6)
+        with self._lock:
+            try:
+                self._rotate()
+                with open(self.path, "ab") as f:
+                    f.write(payload)
+            except OSError as e:
+                logger.warning(f"⚠️ Snapshot yazılamadı: {e}")
+                return 0
+            self.recorded += 1
+        return len(payload)
+
+
+def capture(driver, target, periods, views, found, timings, url=None, error=None):
+    """
+    Tarayıcıdan snapshot sözlüğünü oluşturur (ağ isteği yapmaz). error (StageError)
+    verilirse hata sınıfı, sayfanın tamamı ve açıksa hedef datepicker da eklenir.
+    """
+    snapshot = {
+        "recorded_at": time.time(),
+        "target": dict(target._asdict()) if hasattr(target, "_asdict") else dict(target),
+        "url": url,
+        "periods": [list(p) for p in sorted(periods)],
+        "venue_results_html": driver.execute_script(VENUE_RESULTS_HTML_SCRIPT),
+        "datepicker_views": views,
+        "found": found,
+        "timings": {step: round(seconds, 3) for step, seconds in (timings or {}).items()},
+    }
+    if error is not None:
+        page_html, datepicker_html = driver.execute_script(
+            FAILURE_HTML_SCRIPT, f"session-date-{snapshot['target'].get('venue_id')}"
+        )
+        snapshot["error"] = {"kind": getattr(error, "kind", None), "stage": getattr(error, "stage", None),
+                             "message": str(error)}
+        snapshot["page_html"] = page_html
+        if not views and datepicker_html:
+            snapshot["datepicker_views"] = [{"months": [], "html": datepicker_html}]
+    return snapshot
+
+
+def read_snapshots(path):
+    """Arşivdeki snapshot'ları sırayla döndürür; yarım kalmış son üye sessizce atlanır"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            logger.warning(f"⚠️ Arşivin sonu bozuk, okuma durdu: {e}")
+
+
+def replay_snapshot(snapshot, selectors=None, parser=None):
+    """
+    Tek snapshot'ta tarih okumayı tarayıcısız tekrarlar: her datepicker görünümü
+    parse edilir, hedef aylara süzülür. (selector listesi, [(datetime, seviye)]) döndürür.
+    """
+    periods = {tuple(p) for p in snapshot.get("periods") or ()}
+    views = snapshot.get("datepicker_views") or []
+    if not views and snapshot.get("venue_results_html"):
+        views = [{"html": snapshot["venue_results_html"]}]
+    found = {}
+    matched = []
+    for view in views:
+        selector, cells = extract_date_cells_from_html(view.get("html"), selectors, parser)
+        matched.append(selector)
+        for date_obj, level in parse_date_cells(cells):
+            if not periods or (date_obj.year, date_obj.month) in periods:
+                found.setdefault(date_obj, level)
+    return matched, sorted(found.items())
+
+
+def replay(path, selectors=None, parser=None, limit=None):
+    """
+    Arşivdeki tüm snapshot'ları yeniden oynatır. Kayıttaki sonuçla uyuşmayanlar
+    (selector değişikliğinin etkisi ya da üretimdeki kaçırılan tarihler) listelenir.
+    """
+    results = []
+    start = time.perf_counter()
+    for index, snapshot in enumerate(read_snapshots(path)):
+        if limit and index >= limit:
+            break
+        matched, dates = replay_snapshot(snapshot, selectors, parser)
+        results.append({
+            "index": index,
+            "recorded_at": snapshot.get("recorded_at"),
+            "target": snapshot.get("target", {}),
+            "recorded_found": snapshot.get("found"),
+            "error": (snapshot.get("error") or {}).get("kind"),
+            "replayed_found": len(dates),
+            "selectors": matched,
+            "dates": [(d.strftime("%Y-%m-%d"), level) for d, level in dates],
+        })
+    elapsed = time.perf_counter() - start
+    return {
+        "snapshots": len(results),
+        "elapsed_seconds": round(elapsed, 3),
+        "per_snapshot_ms": round(elapsed * 1000 / len(results), 2) if results else 0,
+        "changed": [r for r in results if r["recorded_found"] is not None and r["recorded_found"] != r["replayed_found"]],
+        "results": results,
+    }
+
+
+def archive_stats(path):
+    """Arşiv boyutu, snapshot sayısı ve hedef başına dağılım"""
+    count, raw_bytes, per_target, empty, failed = 0, 0, {}, 0, 0
+    for snapshot in read_snapshots(path):
+        count += 1
+        raw_bytes += len(json.dumps(snapshot, ensure_ascii=False))
+        target = snapshot.get("target", {})
+        key = f"{target.get('location', '?')} / {target.get('venue_name', '?')}"
+        per_target[key] = per_target.get(key, 0) + 1
+        failed += bool(snapshot.get("error"))
+        empty += not snapshot.get("found") and not snapshot.get("error")
+    size = os.path.getsize(path)
+    return {
+        "snapshots": count,
+        "empty": empty,
+        "failed": failed,
+        "archive_bytes": size,
+        "raw_bytes": raw_bytes,
+        "ratio": round(raw_bytes / size, 1) if size else 0,
+        "per_target": per_target,
+    }
+
+
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+def get_recorder(path=DEFAULT_SNAPSHOT_PATH, max_mb=50):
+    """Aynı arşivi kullanan tüm worker'lar için tek bir kaydedici döndürür"""
+    with _recorders_lock:
+        recorder = _recorders.get(path)
+        if recorder is None:
+            recorder = SnapshotRecorder(path, max_mb)
+            _recorders[path] = recorder
+        return recorder
+
+
+def _load_selectors(path):
+    """[["css", "td.x a"], ...] biçimindeki JSON dosyasından selector listesi"""
+    with open(path, encoding="utf-8") as f:
+        return [tuple(item) for item in json.load(f)]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Booking sayfası snapshot'larını tarayıcısız yeniden oynat")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = commands.add_parser("replay", help="Snapshot'larda tarih okumayı tekrarla")
+    replay_parser.add_argument("path", nargs="?", default=DEFAULT_SNAPSHOT_PATH)
+    replay_parser.add_argument("--selectors", help="Denenecek selector listesi (JSON)")
+    replay_parser.add_argument("--parser", choices=("lxml", "html.parser", "html5lib"))
+    replay_parser.add_argument("--limit", type=int)
+    replay_parser.add_argument("--show", action="store_true", help="Her snapshot'ın tarihlerini yazdır")
+    replay_parser.add_argument("--json", help="Sonuçları bu dosyaya yaz")
+
+    stats_parser = commands.add_parser("stats", help="Arşiv özeti")
+    stats_parser.add_argument("path", nargs="?", default=DEFAULT_SNAPSHOT_PATH)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.command == "stats":
+        print(json.dumps(archive_stats(args.path), ensure_ascii=False, indent=2))
+        return
+
+    selectors = _load_selectors(args.selectors) if args.selectors else None
+    summary = replay(args.path, selectors, args.parser, args.limit)
+    if args.show:
+        for r in summary["results"]:
+            when = datetime.fromtimestamp(r["recorded_at"]).strftime("%Y-%m-%d %H:%M") if r["recorded_at"] else "-"
+            dates = ", ".join(d for d, _ in r["dates"]) or "-"
+            print(f"#{r['index']:<5} {when}  {r['target'].get('venue_name', '?'):<24} {dates}")
+    for r in summary["changed"]:
+        print(f"🔀 #{r['index']} {r['target'].get('venue_name', '?')}: kayıtta {r['recorded_found']}, "
+              f"yeniden oynatmada {r['replayed_found']} tarih ({', '.join(filter(None, r['selectors'])) or 'eşleşme yok'})")
+    print(f"🎞️ {summary['snapshots']} snapshot {summary['elapsed_seconds']}s içinde yeniden oynatıldı "
+          f"({summary['per_snapshot_ms']} ms/snapshot), {len(summary['changed'])} farklı sonuç")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
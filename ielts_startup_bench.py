@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Başlangıç süresi benchmark'ı: tarayıcı gerektirmeyen modların (status, dry-run)
+ve modül importlarının süresini ayrı süreçlerde ölçer, Selenium / schedule /
+requests gibi ağır bağımlılıkların bu yollarda yüklenmediğini doğrular.
+Bütçe aşılırsa 1 ile çıkar; CI'da regresyon kontrolü olarak kullanılabilir.
+
+    python ielts_startup_bench.py --runs 10 --budget-ms 150
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_RESULTS_DIR = "bench_results"
+
+# Tarayıcısız yollarda yüklenmemesi gereken modüller
+HEAVY_MODULES = ("selenium", "schedule", "requests", "urllib3", "http.server", "bs4", "telegram")
+
+# Tracker'ın import edebilmesi için geçici config.py
+STUB_CONFIG = """TELEGRAM_BOT_TOKEN = ''
+CHAT_ID = ''
+USERNAME = ''
+PASSWORD = ''
+BASE_URL = 'http://127.0.0.1:9/book/IELTS'
+COUNTRY_ID = '212'
+LOCATION = 'Ankara'
+TEST_TYPE = 'Academic - IELTS'
+TARGET_MONTHS = [7, 8]
+TARGET_YEAR = 2025
+CHECK_INTERVAL_MINUTES = 30
+HEADLESS_MODE = True
+IMPLICIT_WAIT = 10
+ENABLE_POSITIVE_NOTIFICATIONS = True
+ENABLE_NEGATIVE_NOTIFICATIONS = True
+"""
+
+# ad → komut satırı (python yorumlayıcısından sonra)
+SCENARIOS = {
+    "interpreter": ["-c", "pass"],
+    "import_single_check": ["-c", "import ielts_single_check"],
+    "single_check_status": [os.path.join(HERE, "ielts_single_check.py"), "--mode", "status"],
+    "single_check_dry_run": [os.path.join(HERE, "ielts_single_check.py"), "--mode", "dry-run"],
+    "import_tracker": ["-c", "import ielts_tracker"],
+    "tracker_status": [os.path.join(HERE, "ielts_tracker.py"), "--mode", "status"],
+}
+
+# Ağır modül kontrolü yapılan importlar
+IMPORT_CHECKS = ("ielts_single_check", "ielts_tracker", "ielts_core")
+
+# Bütçe yalnızca bu senaryolara uygulanır (yorumlayıcı süresi düşülerek)
+BUDGETED = ("single_check_status", "single_check_dry_run", "tracker_status")
+
+
+def _environment(workdir):
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": os.pathsep.join([workdir, HERE, env.get("PYTHONPATH", "")]).rstrip(os.pathsep),
+        "HISTORY_DB_PATH": os.path.join(workdir, "ielts_history.db"),
+        "METRICS_SUMMARY_PATH": "none",
+        "TELEGRAM_BOT_TOKEN": "",
+        "CHAT_ID": "",
+    })
+    return env
+
+
+def time_command(args, env, cwd, runs):
+    """Komutu runs kez çalıştırır, milisaniye cinsinden süre listesi döndürür"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable] + args, env=env, cwd=cwd,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} başarısız: {result.stderr.decode(errors='replace')[-500:]}")
+        timings.append(elapsed)
+    return timings
+
+
+def loaded_heavy_modules(module, env, cwd):
+    """Modül import edildikten sonra yüklenmiş ağır bağımlılıklar"""
+    code = (f"import sys, json, {module}; "
+            f"print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]))")
+    output = subprocess.run([sys.executable, "-c", code], env=env, cwd=cwd,
+                            capture_output=True, check=True).stdout
+    return json.loads(output)
+
+
+def run(runs=10):
+    workdir = tempfile.mkdtemp(prefix="ielts-startup-")
+    with open(os.path.join(workdir, "config.py"), "w", encoding="utf-8") as f:
+        f.write(STUB_CONFIG)
+    env = _environment(workdir)
+
+    # Isınma: bytecode önbelleği ve disk önbelleği ilk ölçümü bozmasın
+    for args in SCENARIOS.values():
+        time_command(args, env, workdir, 1)
+
+    scenarios = {}
+    for name, args in SCENARIOS.items():
+        timings = sorted(time_command(args, env, workdir, runs))
+        scenarios[name] = {
+            "p50_ms": round(statistics.median(timings), 1),
+            "p95_ms": round(timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))], 1),
+            "min_ms": round(timings[0], 1),
+        }
+    baseline = scenarios["interpreter"]["p50_ms"]
+    for stats in scenarios.values():
+        stats["overhead_ms"] = round(stats["p50_ms"] - baseline, 1)
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "scenarios": scenarios,
+        "heavy_modules": {module: loaded_heavy_modules(module, env, workdir) for module in IMPORT_CHECKS},
+    }
+
+
+def check_budget(results, budget_ms):
+    """Bütçe ihlallerini ve yüklenen ağır modülleri hata satırları olarak döndürür"""
+    problems = []
+    for name in BUDGETED:
+        overhead = results["scenarios"][name]["overhead_ms"]
+        if overhead > budget_ms:
+            problems.append(f"{name}: {overhead:.0f} ms > {budget_ms:.0f} ms")
+    for module, heavy in results["heavy_modules"].items():
+        if heavy:
+            problems.append(f"{module} import'u ağır modülleri yüklüyor: {', '.join(heavy)}")
+    return problems
+
+
+def format_results(results, baseline=None):
+    lines = [f"{'senaryo':<24}{'p50':>9}{'p95':>9}{'ek yük':>9}" + (f"{'önce':>9}" if baseline else "")]
+    for name, stats in results["scenarios"].items():
+        line = f"{name:<24}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['overhead_ms']:>9.1f}"
+        if baseline and name in baseline.get("scenarios", {}):
+            line += f"{baseline['scenarios'][name]['overhead_ms']:>9.1f}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tarayıcısız modların başlangıç süresi benchmark'ı")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="Yorumlayıcı başlangıcına eklenen süre için üst sınır (ms)")
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(format_results(results, baseline))
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    path = os.path.join(args.results_dir, f"startup-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"💾 Sonuçlar kaydedildi: {path}")
+
+    problems = check_budget(results, args.budget_ms)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ Başlangıç bütçesi içinde")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çok aboneli bildirim: her abonenin şehir / test türü / venue / ay filtresi
+SQLite'ta tutulur. Eşleştirici abonelikleri (venue, test türü, ay) anahtarıyla
+indeksler; bir döngünün tek scrape sonucu tüm ilgili chat'lere tek geçişte
+dağıtılır. Abone sayısı taranan sayfa sayısını artırmaz.
+
+    python ielts_subscriptions.py add --chat-id 123 --name Ayşe --location Ankara --months 2025-11..2026-02
+    python ielts_subscriptions.py list
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import namedtuple, defaultdict
+
+from ielts_datepicker import parse_target_range, format_periods
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "ielts_subscriptions.db"
+
+# Boş filtre "hepsi" anlamına gelir; indekste joker anahtar olarak tutulur
+ANY = "*"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    locations TEXT NOT NULL DEFAULT '[]',
+    test_types TEXT NOT NULL DEFAULT '[]',
+    venue_ids TEXT NOT NULL DEFAULT '[]',
+    months TEXT NOT NULL DEFAULT '',
+    active INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_chat ON subscriptions(chat_id);
+"""
+
+Subscription = namedtuple("Subscription", "id chat_id name locations test_types venue_ids periods")
+
+
+def parse_months(spec):
+    """
+    "2025-11..2026-02" veya "2025-07,2025-09" biçimindeki ay filtresini
+    (yıl, ay) kümesine çevirir; boşsa tüm aylar
+    """
+    periods = set()
+    for item in (spec or "").split(","):
+        if item.strip():
+            periods.update(parse_target_range(item.strip()))
+    return frozenset(periods)
+
+
+def describe_subscription(subscription):
+    """Abonelik filtresini mesaj ve log satırları için kısa metne çevirir"""
+    parts = [
+        ", ".join(sorted(subscription.locations)) or "tüm şehirler",
+        ", ".join(sorted(subscription.test_types)) or "tüm test türleri",
+    ]
+    if subscription.venue_ids:
+        parts.append("venue " + ", ".join(sorted(subscription.venue_ids)))
+    parts.append(format_periods(subscription.periods) if subscription.periods else "tüm aylar")
+    return " / ".join(parts)
+
+
+def _as_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+class SubscriptionStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            self.conn.close()
+
+    def add(self, chat_id, name="", locations=None, test_types=None, venue_ids=None, months=""):
+        """Yeni abonelik ekler ve id'sini döndürür; ay filtresi eklenmeden doğrulanır"""
+        parse_months(months)
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO subscriptions (chat_id, name, locations, test_types, venue_ids, months, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(chat_id), name or "", json.dumps(_as_list(locations), ensure_ascii=False),
+                 json.dumps(_as_list(test_types), ensure_ascii=False),
+                 json.dumps(_as_list(venue_ids), ensure_ascii=False), months or "", time.time())
+            )
+            return cursor.lastrowid
+
+    def remove(self, subscription_id=None, chat_id=None):
+        """Aboneliği (veya chat'in tüm aboneliklerini) pasifleştirir; etkilenen satır sayısını döndürür"""
+        if subscription_id is None and chat_id is None:
+            raise ValueError("subscription_id veya chat_id gerekli")
+        column, value = ("id", subscription_id) if subscription_id is not None else ("chat_id", str(chat_id))
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                f"UPDATE subscriptions SET active = 0, updated_at = ? WHERE {column} = ? AND active = 1",
+                (time.time(), value)
+            )
+            return cursor.rowcount
+
+    def import_json(self, path):
+        """[{"chat_id": ..., "name": ..., "locations": [...], "months": "..."}] listesini ekler"""
+        with open(path, encoding="utf-8") as f:
+            items = json.load(f)
+        count = 0
+        for item in items:
+            self.add(item["chat_id"], item.get("name", ""), item.get("locations"), item.get("test_types"),
+                     item.get("venue_ids"), item.get("months", ""))
+            count += 1
+        return count
+
+    def version(self):
+        """Abonelikler değiştiğinde değişen imza; eşleştirici yalnızca o zaman yeniden kurulur"""
+        with self._lock:
+            row = self.conn.execute("SELECT COUNT(*), COALESCE(MAX(updated_at), 0) FROM subscriptions").fetchone()
+        return tuple(row)
+
+    def subscriptions(self, chat_id=None, active_only=True):
+        """Abonelikleri Subscription listesi olarak döndürür; bozuk ay filtreleri atlanır"""
+        query = "SELECT * FROM subscriptions WHERE 1 = 1"
+        params = []
+        if active_only:
+            query += " AND active = 1"
+        if chat_id is not None:
+            query += " AND chat_id = ?"
+            params.append(str(chat_id))
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY id", params).fetchall()
+
+        subscriptions = []
+        for row in rows:
+            try:
+                periods = parse_months(row["months"])
+            except ValueError as e:
+                logger.warning(f"⚠️ Abonelik {row['id']} ay filtresi geçersiz: {e}")
+                continue
+            subscriptions.append(Subscription(
+                row["id"], row["chat_id"], row["name"],
+                frozenset(json.loads(row["locations"])), frozenset(json.loads(row["test_types"])),
+                frozenset(json.loads(row["venue_ids"])), periods
+            ))
+        return subscriptions
+
+
+class SubscriptionMatcher:
+    """Abonelikleri (venue, test türü, ay) anahtarıyla indeksler"""
+
+    def __init__(self, subscriptions):
+        self.subscriptions = list(subscriptions)
+        self.index = defaultdict(list)
+        for subscription in self.subscriptions:
+            for venue_id in subscription.venue_ids or (ANY,):
+                for test_type in subscription.test_types or (ANY,):
+                    for period in subscription.periods or (ANY,):
+                        self.index[(venue_id, test_type, period)].append(subscription)
+
+    def __len__(self):
+        return len(self.subscriptions)
+
+    def match(self, record):
+        """Tarih kaydıyla eşleşen abonelikler; yalnızca 8 indeks araması yapılır"""
+        date_obj = record["date"]
+        venue_id = str(record.get("venue_id") or "")
+        test_type = record.get("test_type", "")
+        period = (date_obj.year, date_obj.month)
+
+        matched = {}
+        for venue_key in (venue_id, ANY):
+            for test_key in (test_type, ANY):
+                for period_key in (period, ANY):
+                    for subscription in self.index.get((venue_key, test_key, period_key), ()):
+                        matched[subscription.id] = subscription
+
+        location = record.get("location", "")
+        return [s for s in matched.values() if not s.locations or location in s.locations]
+
+    def route(self, records):
+        """
+        Kayıtları chat'lere dağıtır: {chat_id: (abonelikler, kayıtlar)}. Aynı chat'in
+        birden fazla aboneliği tek mesajda birleşir, bir tarih iki kez yazılmaz.
+        """
+        routed = {}
+        for record in records:
+            for subscription in self.match(record):
+                subscriptions, chat_records = routed.setdefault(subscription.chat_id, ({}, {}))
+                subscriptions[subscription.id] = subscription
+                key = (record.get("venue_id") or record["venue"], record["date_str"])
+                chat_records.setdefault(key, record)
+        return {chat_id: (list(subs.values()), list(chat_records.values()))
+                for chat_id, (subs, chat_records) in routed.items()}
+
+
+def main(argv=None):
+    """Abonelikleri komut satırından yönetir"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="IELTS bildirim aboneliklerini yönet")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Abonelik ekle")
+    add.add_argument("--chat-id", required=True)
+    add.add_argument("--name", default="")
+    add.add_argument("--location", action="append", default=[], help="Tekrarlanabilir; boşsa tüm şehirler")
+    add.add_argument("--test-type", action="append", default=[])
+    add.add_argument("--venue", action="append", default=[], help="Venue id")
+    add.add_argument("--months", default="", help="ör. 2025-11..2026-02 veya 2025-07,2025-09")
+
+    remove = commands.add_parser("remove", help="Aboneliği kaldır")
+    remove.add_argument("id", nargs="?", type=int)
+    remove.add_argument("--chat-id")
+
+    commands.add_parser("list", help="Aktif abonelikleri listele")
+
+    import_parser = commands.add_parser("import", help="JSON dosyasından abonelik ekle")
+    import_parser.add_argument("path")
+
+    args = parser.parse_args(argv)
+    store = SubscriptionStore(args.db)
+    try:
+        if args.command == "add":
+            subscription_id = store.add(args.chat_id, args.name, args.location, args.test_type,
+                                        args.venue, args.months)
+            print(f"✅ Abonelik eklendi: #{subscription_id}")
+        elif args.command == "remove":
+            count = store.remove(args.id, args.chat_id)
+            print(f"🗑️ {count} abonelik kaldırıldı")
+        elif args.command == "import":
+            print(f"✅ {store.import_json(args.path)} abonelik eklendi")
+        else:
+            subscriptions = store.subscriptions()
+            for s in subscriptions:
+                print(f"#{s.id:<5} {s.chat_id:<14} {s.name or '-':<16} {describe_subscription(s)}")
+            print(f"📋 {len(subscriptions)} aktif abonelik")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tarayıcı bellek denetimi: her WebDriver'ın süreç ağacının (chromedriver +
+chrome + yardımcı süreçler) RSS'ini izler, N kontrolden sonra ya da bellek
+tavanı aşılınca tarayıcıyı yeniden başlattırır ve quit() hata verdiğinde
+geride kalan ya da sahibi ölmüş chrome/chromedriver süreçlerini temizler.
+
+Chrome her zaman --ielts-owner=<pid> argümanıyla başlatılır; aynı makinedeki
+başka tracker'ların ve kullanıcının kendi Chrome'u asla öldürülmez.
+"""
+
+import os
+import time
+import signal
+import logging
+import threading
+import subprocess
+from contextlib import contextmanager
+from collections import namedtuple, defaultdict
+
+import ielts_metrics as metrics
+
+logger = logging.getLogger(__name__)
+
+OWNER_ARG = "--ielts-owner"
+
+Proc = namedtuple("Proc", "pid ppid name state rss cmdline")
+
+
+def owner_argument(pid=None):
+    """Chrome'a eklenen sahiplik işareti"""
+    return f"{OWNER_ARG}={pid or os.getpid()}"
+
+
+def _is_browser(name):
+    return "chrom" in name.lower()
+
+
+def _proc_table():
+    """Linux: /proc'tan süreç tablosu; cmdline yalnızca Chrome süreçleri için okunur"""
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    table = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+            with open(f"/proc/{entry}/statm") as f:
+                resident_pages = int(f.read().split()[1])
+            # comm alanı boşluk içerebilir; durum ve ppid son ')' karakterinden sonra gelir
+            name = stat[stat.index("(") + 1:stat.rindex(")")]
+            fields = stat.rsplit(")", 1)[1].split()
+            cmdline = ""
+            if _is_browser(name):
+                with open(f"/proc/{entry}/cmdline", "rb") as f:
+                    cmdline = f.read().replace(b"\0", b" ").decode(errors="replace")
+        except (OSError, ValueError, IndexError):
+            continue
+        pid = int(entry)
+        table[pid] = Proc(pid, int(fields[1]), name, fields[0], resident_pages * page_size, cmdline)
+    return table
+
+
+def _ps_table():
+    """macOS ve /proc olmayan sistemler: ps çıktısından süreç tablosu"""
+    output = subprocess.run(["ps", "-axo", "pid=,ppid=,rss=,state=,command="],
+                            capture_output=True, text=True, check=True).stdout
+    table = {}
+    for line in output.splitlines():
+        parts = line.split(None, 4)
+        if len(parts) < 5:
+            continue
+        try:
+            pid, ppid, rss = int(parts[0]), int(parts[1]), int(parts[2]) * 1024
+        except ValueError:
+            continue
+        command = parts[4]
+        name = os.path.basename(command.split(" --", 1)[0])
+        table[pid] = Proc(pid, ppid, name, parts[3][:1], rss, command if _is_browser(command) else "")
+    return table
+
+
+def process_table():
+    """pid → Proc sözlüğü"""
+    return _proc_table() if os.path.isdir("/proc") else _ps_table()
+
+
+def descendants(root_pid, table):
+    """root_pid ve tüm alt süreçlerinin pid listesi"""
+    children = defaultdict(list)
+    for proc in table.values():
+        children[proc.ppid].append(proc.pid)
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        if pid in table:
+            pids.append(pid)
+        stack.extend(children.get(pid, ()))
+    return pids
+
+
+def tree_rss(root_pid, table=None):
+    """root_pid ve tüm alt süreçlerinin RSS toplamı (byte)"""
+    table = table if table is not None else process_table()
+    return sum(table[pid].rss for pid in descendants(root_pid, table))
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def _owner_of(proc):
+    """Chrome cmdline'ındaki --ielts-owner=<pid> değeri"""
+    marker = f"{OWNER_ARG}="
+    if marker not in proc.cmdline:
+        return None
+    try:
+        return int(proc.cmdline.split(marker, 1)[1].split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
+def terminate(pids, grace=3.0):
+    """Süreçlere SIGTERM, grace saniye sonra hâlâ yaşayanlara SIGKILL gönderir; zombileri toplar"""
+    pids = [pid for pid in pids if pid != os.getpid()]
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+    deadline = time.monotonic() + grace
+    alive = list(pids)
+    while alive and time.monotonic() < deadline:
+        alive = [pid for pid in alive if not _wait_child(pid) and _pid_alive(pid)]
+        if alive:
+            time.sleep(0.1)
+    for pid in alive:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        _wait_child(pid)
+    return len(pids)
+
+
+def _wait_child(pid):
+    """pid bu sürecin çıkmış çocuğuysa toplar (zombi kalmaz); toplandıysa True"""
+    try:
+        return os.waitpid(pid, os.WNOHANG)[0] == pid
+    except ChildProcessError:
+        return False
+
+
+def reap_zombies(table=None):
+    """
+    Bu sürecin zombi chrome/chromedriver çocuklarını toplar. waitpid(-1) yerine
+    tek tek beklenir; başka subprocess'lerin çıkış kodu çalınmaz.
+    """
+    table = table if table is not None else process_table()
+    me = os.getpid()
+    reaped = 0
+    for proc in table.values():
+        if proc.ppid == me and proc.state == "Z" and _is_browser(proc.name or proc.cmdline):
+            reaped += _wait_child(proc.pid)
+    return reaped
+
+
+DriverState = namedtuple("DriverState", "service_pid started_at")
+
+
+class BrowserSupervisor:
+    """Süreç genelinde tek örnek; tüm worker'ların WebDriver'larını izler"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._drivers = {}
+        self._starting = 0
+        self.stats = {
+            "recycles": 0,
+            "recycles_check_limit": 0,
+            "recycles_memory_limit": 0,
+            "orphans_reaped": 0,
+            "zombies_reaped": 0,
+            "rss_bytes": 0,
+            "peak_rss_bytes": 0,
+        }
+
+    @contextmanager
+    def starting(self):
+        """WebDriver kurulurken temizlik, henüz kaydedilmemiş chromedriver'ı öldürmesin"""
+        with self._lock:
+            self._starting += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._starting -= 1
+
+    def register(self, owner, driver):
+        """Yeni WebDriver'ı sahibine (CheckerCore örneği) bağlar"""
+        pid = service_pid(driver)
+        with self._lock:
+            self._drivers[id(owner)] = DriverState(pid, time.time())
+
+    def unregister(self, owner):
+        with self._lock:
+            return self._drivers.pop(id(owner), None)
+
+    def driver_rss(self, owner, table=None):
+        """Sahibin chromedriver süreç ağacının RSS'i (byte); bilinmiyorsa 0"""
+        with self._lock:
+            state = self._drivers.get(id(owner))
+        if not state or not state.service_pid:
+            return 0
+        try:
+            return tree_rss(state.service_pid, table)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"🧠 RSS okunamadı: {e}")
+            return 0
+
+    def total_rss(self):
+        """İzlenen tüm tarayıcıların toplam RSS'i; gauge'ları da günceller"""
+        try:
+            table = process_table()
+        except (OSError, subprocess.SubprocessError):
+            return self.stats["rss_bytes"]
+        with self._lock:
+            roots = [s.service_pid for s in self._drivers.values() if s.service_pid]
+        total = sum(tree_rss(pid, table) for pid in roots)
+        self.stats["rss_bytes"] = total
+        self.stats["peak_rss_bytes"] = max(self.stats["peak_rss_bytes"], total)
+        metrics.REGISTRY.set_gauge("browser_rss_bytes", total)
+        metrics.REGISTRY.set_gauge("browser_peak_rss_bytes", self.stats["peak_rss_bytes"])
+        metrics.REGISTRY.set_gauge("browser_count", len(roots))
+        return total
+
+    def recycle_reason(self, owner, checks, max_checks=None, max_rss_mb=None):
+        """Tarayıcının yeniden başlatılması gerekiyorsa nedeni, gerekmiyorsa None"""
+        if max_checks and checks >= max_checks:
+            return "check_limit"
+        if max_rss_mb:
+            rss = self.driver_rss(owner)
+            if rss > max_rss_mb * 1024 * 1024:
+                return "memory_limit"
+        return None
+
+    def record_recycle(self, reason):
+        with self._lock:
+            self.stats["recycles"] += 1
+            self.stats[f"recycles_{reason}"] = self.stats.get(f"recycles_{reason}", 0) + 1
+        metrics.REGISTRY.set_gauge("browser_recycles_total", self.stats["recycles"])
+        metrics.REGISTRY.set_gauge(f"browser_recycles_{reason}_total", self.stats[f"recycles_{reason}"])
+
+    def find_orphans(self, table=None):
+        """
+        Temizlenecek süreçler:
+        - bu sürecin, kayıtlı hiçbir WebDriver'a ait olmayan chromedriver/chrome çocukları
+        - sahibi (--ielts-owner) artık yaşamayan Chrome'lar ve onları başlatan chromedriver'lar
+        """
+        table = table if table is not None else process_table()
+        me = os.getpid()
+        with self._lock:
+            if self._starting:
+                return []
+            live_roots = [s.service_pid for s in self._drivers.values() if s.service_pid]
+        live = set()
+        for pid in live_roots:
+            live.update(descendants(pid, table))
+
+        orphans = set()
+        for proc in table.values():
+            if proc.pid in live or not _is_browser(proc.name or proc.cmdline):
+                continue
+            if proc.ppid == me and proc.state != "Z":
+                orphans.add(proc.pid)
+                continue
+            owner = _owner_of(proc)
+            if owner is None:
+                continue
+            if owner == me or not _pid_alive(owner):
+                # Chrome ve ağacı; sahipsiz kalmış chromedriver ebeveyni de dahil
+                orphans.update(descendants(proc.pid, table))
+                parent = table.get(proc.ppid)
+                if parent and parent.pid != me and "chromedriver" in parent.name.lower():
+                    orphans.add(parent.pid)
+        return sorted(orphans)
+
+    def reap(self):
+        """Artık süreçleri ve zombileri temizler; temizlenen süreç sayısını döndürür"""
+        try:
+            table = process_table()
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"🧹 Süreç tablosu okunamadı: {e}")
+            return 0
+        zombies = reap_zombies(table)
+        orphans = self.find_orphans(table)
+        if orphans:
+            logger.warning(f"🧹 {len(orphans)} artık chrome/chromedriver süreci sonlandırılıyor: {orphans}")
+            terminate(orphans)
+        with self._lock:
+            self.stats["orphans_reaped"] += len(orphans)
+            self.stats["zombies_reaped"] += zombies
+        metrics.REGISTRY.set_gauge("browser_orphans_reaped_total", self.stats["orphans_reaped"])
+        metrics.REGISTRY.set_gauge("browser_zombies_reaped_total", self.stats["zombies_reaped"])
+        return len(orphans) + zombies
+
+    def summary(self):
+        """Log satırı için kısa özet"""
+        return (f"RSS {self.stats['rss_bytes'] / 1048576:.0f} MB (tepe {self.stats['peak_rss_bytes'] / 1048576:.0f} MB), "
+                f"{self.stats['recycles']} yeniden başlatma, {self.stats['orphans_reaped']} artık süreç temizlendi")
+
+
+def service_pid(driver):
+    """WebDriver'ın chromedriver süreç kimliği; bilinmiyorsa None"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+_supervisor = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor():
+    """Süreçteki tüm worker'ların paylaştığı denetçi"""
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = BrowserSupervisor()
+        return _supervisor
+
+
+if __name__ == "__main__":
+    # Bu makinedeki chrome/chromedriver süreçlerini ve sahiplerini listeler
+    for proc in sorted(process_table().values(), key=lambda p: p.pid):
+        if _is_browser(proc.name or proc.cmdline):
+            owner = _owner_of(proc)
+            print(f"{proc.pid:>7} {proc.ppid:>7} {proc.rss / 1048576:>8.1f} MB  {proc.name:<20} "
+                  f"sahip={owner if owner else '-'}")
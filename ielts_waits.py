@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Olay tabanlı bekleme katmanı: sabit time.sleep yerine sayfanın gerçek
+hazır olma sinyallerini bekler ve her adımın ne kadar sürdüğünü kaydeder.
+"""
+
+import time
+import logging
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException, JavascriptException
+)
+
+logger = logging.getLogger(__name__)
+
+# Adım başına üst sınırlar (saniye); config.WAIT_TIMEOUTS ile ezilebilir
+DEFAULT_TIMEOUTS = {
+    "page_ready": 15,
+    "ajax_idle": 15,
+    "dropdown": 15,
+    "venue_results": 20,
+    "datepicker": 15,
+    "session_restore": 5,
+}
+
+DEFAULT_POLL_INTERVAL = 0.1
+
+# Sayfadaki bekleyen XHR/jQuery isteklerini sayar. XHR kancası ilk çağrıda
+# kurulur; jQuery.active ise sayfa yüklendiğinden beri tutulur.
+AJAX_PENDING_SCRIPT = """
+if (!window.__ieltsXhrHooked && window.XMLHttpRequest) {
+    window.__ieltsXhrHooked = true;
+    window.__ieltsXhrPending = 0;
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__ieltsXhrPending++;
+        this.addEventListener('loadend', function() { window.__ieltsXhrPending--; });
+        return origSend.apply(this, arguments);
+    };
+}
+var jq = (window.jQuery && typeof window.jQuery.active === 'number') ? window.jQuery.active : 0;
+var xhr = window.__ieltsXhrPending || 0;
+return document.readyState === 'complete' ? jq + xhr : -1;
+"""
+
+SELECT_HAS_OPTION_SCRIPT = """
+var sel = arguments[0], text = arguments[1], value = arguments[2];
+if (!sel || sel.disabled || !sel.options) return false;
+for (var i = 0; i < sel.options.length; i++) {
+    var o = sel.options[i];
+    if (text !== null && o.text.trim() === text) return true;
+    if (value !== null && o.value === value) return true;
+    if (text === null && value === null && o.value) return true;
+}
+return false;
+"""
+
+# Filtreli sonuç listesinde hedef venue'nun linki var mı
+VENUE_LISTED_SCRIPT = """
+var root = document.getElementById('venue-selection-results');
+if (!root || root.offsetParent === null) return false;
+if (root.querySelector("a[data-target*='venue-info-" + arguments[0] + "']")) return true;
+var links = root.querySelectorAll('a');
+for (var i = 0; i < links.length; i++) {
+    if ((links[i].textContent || '').indexOf(arguments[1]) !== -1) return true;
+}
+return false;
+"""
+
+# Datepicker'ın durumu: [container var mı, çizili gün hücresi, seçilebilir hücre].
+# Müsait günü olmayan ay da çizili hücre içerir; hazır olmak seçilebilir hücre gerektirmez.
+DATEPICKER_STATE_SCRIPT = """
+var root = document.getElementById(arguments[0]);
+if (!root) return [false, 0, 0];
+return [true, root.querySelectorAll("table.ui-datepicker-calendar td").length,
+        root.querySelectorAll("td[data-handler='selectDay'], td[data-month]").length];
+"""
+
+
+class WaitEngine:
+    def __init__(self, driver, timeouts=None, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.driver = driver
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.poll_interval = poll_interval
+        self.timings = {}
+
+    def reset(self):
+        """Yeni kontrol için adım sürelerini sıfırlar"""
+        self.timings = {}
+
+    def _until(self, step, kind, condition):
+        """Koşul sağlanana kadar bekler, süreyi `step` adıyla kaydeder"""
+        timeout = self.timeouts.get(kind, DEFAULT_TIMEOUTS.get(kind, 15))
+        start = time.monotonic()
+        try:
+            return WebDriverWait(
+                self.driver, timeout, poll_frequency=self.poll_interval,
+                ignored_exceptions=(NoSuchElementException, StaleElementReferenceException, JavascriptException)
+            ).until(condition)
+        finally:
+            elapsed = time.monotonic() - start
+            self.timings[step] = self.timings.get(step, 0.0) + elapsed
+            logger.debug(f"⏱️ {step}: {elapsed:.2f}s")
+
+    def page_ready(self, step="page_ready"):
+        """document.readyState 'complete' olana kadar bekler"""
+        return self._until(step, "page_ready",
+                           lambda d: d.execute_script("return document.readyState") == "complete")
+
+    def ajax_idle(self, step="ajax_idle"):
+        """Bekleyen jQuery/XHR isteği kalmayana kadar bekler"""
+        return self._until(step, "ajax_idle",
+                           lambda d: d.execute_script(AJAX_PENDING_SCRIPT) == 0)
+
+    def select_has_option(self, locator, text=None, value=None, step="dropdown"):
+        """Bağımlı dropdown istenen seçenekle dolana kadar bekler, elementi döndürür"""
+        def condition(d):
+            element = d.find_element(*locator)
+            if d.execute_script(SELECT_HAS_OPTION_SCRIPT, element, text, value):
+                return element
+            return False
+        return self._until(step, "dropdown", condition)
+
+    def venue_results(self, step="venue_results"):
+        """#venue-selection-results render edilip içerik gelene kadar bekler"""
+        def condition(d):
+            element = d.find_element(By.ID, "venue-selection-results")
+            has_content = d.execute_script(
+                "return arguments[0].children.length > 0 && arguments[0].offsetParent !== null", element
+            )
+            return element if has_content else False
+        return self._until(step, "venue_results", condition)
+
+    def venue_listed(self, venue_id, venue_name, step="session_restore"):
+        """Önbellekten açılan sonuç sayfasında hedef venue listelenene kadar bekler (kısa üst sınır)"""
+        return self._until(step, "session_restore",
+                           lambda d: d.execute_script(VENUE_LISTED_SCRIPT, str(venue_id), venue_name))
+
+    def datepicker_state(self, venue_id):
+        """(container var mı, çizili gün hücresi sayısı, seçilebilir hücre sayısı)"""
+        exists, days, bookable = self.driver.execute_script(DATEPICKER_STATE_SCRIPT, f"session-date-{venue_id}")
+        return bool(exists), int(days), int(bookable)
+
+    def datepicker_cells(self, venue_id, step="datepicker"):
+        """
+        session-date-<venue_id> datepicker'ının takvimi çizilene kadar bekler.
+        Müsait günü olmayan ay da hazır sayılır; müsaitlik sınıfları için
+        ardından ajax_idle beklenir.
+        """
+        element_id = f"session-date-{venue_id}"
+
+        def condition(d):
+            if d.execute_script(DATEPICKER_STATE_SCRIPT, element_id)[1] > 0:
+                return d.find_element(By.ID, element_id)
+            return False
+        return self._until(step, "datepicker", condition)
+
+    def summary(self):
+        """Kayıtlı adım sürelerini log için tek satır halinde döndürür"""
+        if not self.timings:
+            return "-"
+        return ", ".join(f"{step}={elapsed:.2f}s" for step, elapsed in self.timings.items())
+
+
+def try_wait(wait_call, *args, **kwargs):
+    """Bekleme zaman aşımına uğrarsa None döndürür (akış kendi kontrolünü yapar)"""
+    try:
+        return wait_call(*args, **kwargs)
+    except TimeoutException:
+        logger.debug(f"⏱️ Bekleme zaman aşımı: {getattr(wait_call, '__name__', wait_call)}")
+        return None
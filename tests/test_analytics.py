@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Müsaitlik analizi: sansür sınırları hedefin taramalarından çıkar, gözlemlerinden değil"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from ielts_analytics import Observations, analyze
+from ielts_history import AvailabilityStore, slot_target_key
+
+KEY = slot_target_key("Ankara", "Academic - IELTS", "1771")
+SLOT = {"venue": "Bilkent University", "location": "Ankara", "test_type": "Academic - IELTS",
+        "venue_id": "1771", "date_str": "2025-07-12", "level": "high"}
+HOUR = 3600
+T0 = 1751328000  # 2025-07-01 00:00 UTC
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "history.db")
+
+
+def record(store, runs):
+    for index, dates in enumerate(runs):
+        store.record_cycle(dates, [KEY], source="test", checked_at=T0 + index * HOUR)
+
+
+def test_slot_closed_before_empty_final_scans_is_not_censored(db_path):
+    store = AvailabilityStore(db_path)
+    # 1: boş, 2-3: slot açık, 4: hedef tarandı, tarih yok
+    record(store, [[], [SLOT], [SLOT], []])
+    store.close()
+
+    report = analyze(Observations.from_db(db_path))
+    target = report["per_target"][0]
+    assert report["releases"] == 1
+    assert target["open_now"] == 0
+    assert target["fill_rate"] == 1.0
+    assert target["lifetime_hours"]["p50"] == pytest.approx(1.0)
+
+
+def test_slot_open_in_first_scan_is_left_censored(db_path):
+    store = AvailabilityStore(db_path)
+    record(store, [[SLOT], [SLOT], []])
+    store.close()
+
+    report = analyze(Observations.from_db(db_path))
+    assert report["releases"] == 0
+    assert report["per_target"][0]["fill_rate"] == 1.0
+    assert report["per_target"][0]["lifetime_hours"]["p50"] is None
+
+
+def test_slot_open_in_last_scan_is_right_censored(db_path):
+    store = AvailabilityStore(db_path)
+    record(store, [[], [SLOT], [SLOT]])
+    store.close()
+
+    report = analyze(Observations.from_db(db_path))
+    assert report["releases"] == 1
+    assert report["per_target"][0]["open_now"] == 1
+    assert report["per_target"][0]["fill_rate"] is None
+
+
+def test_scan_coverage_survives_export(db_path, tmp_path):
+    store = AvailabilityStore(db_path)
+    record(store, [[], [SLOT], [SLOT], []])
+    store.close()
+
+    path = Observations.from_db(db_path).save(str(tmp_path / "obs.npz"))
+    report = analyze(Observations.load(path))
+    assert report["per_target"][0]["lifetime_hours"]["p50"] == pytest.approx(1.0)
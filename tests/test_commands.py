@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""SingleFlight: eşzamanlı /check istekleri tek taramayı paylaşır"""
+
+import threading
+import time
+
+import pytest
+
+from ielts_commands import SingleFlight
+
+
+def wait_for_joiners(flight, count, timeout=5):
+    """Lider, diğer çağrılar uçuşa katılana kadar bekler (zamanlamadan bağımsız test)"""
+    deadline = time.monotonic() + timeout
+    while flight.joined < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def run_concurrently(flight, fn, count):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    calls = []
+
+    def scan():
+        calls.append(1)
+        wait_for_joiners(flight, 4)
+        return "sonuç"
+
+    results, errors = run_concurrently(flight, scan, 5)
+    assert not errors
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert {result for result, _ in results} == {"sonuç"}
+    assert flight.joined == 4
+
+
+def test_errors_are_shared_with_waiters():
+    flight = SingleFlight()
+
+    def scan():
+        wait_for_joiners(flight, 2)
+        raise RuntimeError("tarayıcı açılamadı")
+
+    results, errors = run_concurrently(flight, scan, 3)
+    assert not results
+    assert len(errors) == 3
+    assert all(str(e) == "tarayıcı açılamadı" for e in errors)
+
+
+def test_next_call_after_flight_runs_again():
+    flight = SingleFlight()
+    counter = iter(range(10))
+    assert flight.do(lambda: next(counter)) == (0, False)
+    assert flight.do(lambda: next(counter)) == (1, False)
+
+    with pytest.raises(ValueError):
+        flight.do(lambda: int("x"))
+    assert flight.do(lambda: "tekrar") == ("tekrar", False)
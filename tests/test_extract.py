@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Tarih okuma: müsaitlik seviyeleri tek geçişte, cascade yalnızca yedek"""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("bs4")
+
+from ielts_extract import AVAILABILITY_SELECTOR, extract_date_cells_from_html, parse_date_cells
+
+
+def cell(day, css="", month=6, year=2025):
+    return (f'<td class="{css}" data-handler="selectDay" data-event="click" data-month="{month}" '
+            f'data-year="{year}"><a href="#">{day}</a></td>')
+
+
+def calendar(*cells):
+    return f'<div id="session-date-1771"><table class="ui-datepicker-calendar"><tr>{"".join(cells)}</tr></table></div>'
+
+
+def test_high_and_medium_cells_are_read_together():
+    html = calendar(cell(12, "high-availability-date"), cell(19, "ui-datepicker-unselectable"),
+                    cell(26, "medium-availability-date"))
+    selector, cells = extract_date_cells_from_html(html, parser="html.parser")
+    assert selector == AVAILABILITY_SELECTOR
+    assert parse_date_cells(cells) == [(datetime(2025, 7, 12), "high"), (datetime(2025, 7, 26), "medium")]
+
+
+def test_same_day_is_counted_once():
+    html = calendar(cell(12, "high-availability-date selected-legend"), cell(12, "selected-legend"))
+    _, cells = extract_date_cells_from_html(html, parser="html.parser")
+    assert parse_date_cells(cells) == [(datetime(2025, 7, 12), "high")]
+
+
+def test_cascade_is_used_without_availability_classes():
+    html = calendar(cell(5), cell(9, "ui-datepicker-unselectable"))
+    selector, cells = extract_date_cells_from_html(html, parser="html.parser")
+    assert selector != AVAILABILITY_SELECTOR
+    assert parse_date_cells(cells) == [(datetime(2025, 7, 5), "available")]
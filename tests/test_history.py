@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""AvailabilityStore.release_hours: since filtresi ilk görülme anını korur"""
+
+from datetime import datetime
+
+from ielts_history import AvailabilityStore
+
+
+def _record(venue, date_str):
+    return {"location": "Istanbul", "test_type": "academic", "venue": venue, "date_str": date_str}
+
+
+def _at(day, hour):
+    return datetime(2026, 10, day, hour).timestamp()
+
+
+def test_release_hours_counts_only_slots_first_seen_since(tmp_path):
+    store = AvailabilityStore(str(tmp_path / "history.db"))
+    # İlk döngü: o an açık olan slot yeni sayılmaz
+    store.record_cycle([_record("A", "2026-11-01")], checked_at=_at(1, 8))
+    # since'ten önce ilk kez görülen ve sonra da görülmeye devam eden slot
+    store.record_cycle([_record("A", "2026-11-01"), _record("A", "2026-11-02")], checked_at=_at(2, 9))
+    store.record_cycle([_record("A", "2026-11-02"), _record("B", "2026-11-03")], checked_at=_at(5, 14))
+    store.record_cycle([_record("A", "2026-11-02"), _record("B", "2026-11-03"), _record("B", "2026-11-04")],
+                       checked_at=_at(6, 16))
+
+    assert store.release_hours() == {9: 1, 14: 1, 16: 1}
+    assert store.release_hours(since=_at(4, 0)) == {14: 1, 16: 1}
+    assert store.release_hours(since=_at(6, 0)) == {16: 1}
+    store.close()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""HTTP motoru: yerel fixture sunucusuna karşı uçtan uca tarih okuma"""
+
+from datetime import datetime
+
+import pytest
+
+from ielts_fixture_server import load_fixture, start_fixture_server
+from ielts_http import HttpEngineError, IELTSHttpEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    fixture = load_fixture()
+    # Müsait günü olmayan venue: yalnızca dolu oturumlar
+    fixture["sessions"]["1772|1"] = [{"Date": "2025-07-19", "Availability": "full"}]
+    server, base_url = start_fixture_server(fixture=fixture)
+    engine = IELTSHttpEngine(base_url, retries=0)
+    yield engine
+    engine.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_available_dates_in_target_months(engine):
+    dates = engine.check_available_dates("212", "Ankara", "Academic - IELTS", "1771", [(2025, 7), (2025, 8)])
+    # 2025-08-09 dolu; 2025-09-13 hedef ay dışında
+    assert [d["date_str"] for d in dates] == ["2025-07-12", "2025-07-26"]
+    assert {d["venue"] for d in dates} == {"Bilkent University"}
+    assert [d["level"] for d in dates] == ["high", "medium"]
+    assert dates[0]["date"] == datetime(2025, 7, 12)
+
+
+def test_target_range_across_year_boundary(engine):
+    periods = [(2025, 11), (2025, 12), (2026, 1), (2026, 2)]
+    dates = engine.check_available_dates("212", "Ankara", "Academic - IELTS", "1771", periods)
+    assert [d["date_str"] for d in dates] == ["2025-12-06", "2026-01-17"]
+
+
+def test_venue_with_zero_availability_returns_empty(engine):
+    assert engine.check_available_dates("212", "Ankara", "Academic - IELTS", "1772", [(2025, 7)]) == []
+
+
+def test_venue_without_sessions_returns_empty(engine):
+    assert engine.check_available_dates("212", "Istanbul", "Academic - IELTS", "1801", [(2025, 7)]) == []
+
+
+def test_unknown_venue_raises(engine):
+    with pytest.raises(HttpEngineError):
+        engine.check_available_dates("212", "Ankara", "Academic - IELTS", "9999", [(2025, 7)])
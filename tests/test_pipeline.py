@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""CircuitBreaker durum geçişleri: kapalı → açık → yarı açık → kapalı / açık"""
+
+import time
+
+import pytest
+
+from ielts_pipeline import CLOSED, HALF_OPEN, OPEN, SELECTOR_DRIFT, SITE_DOWN, TRANSIENT, CircuitBreaker
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "breaker.json")
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.threshold - 1):
+        assert not breaker.record_failure(SITE_DOWN, "502")
+    assert breaker.record_failure(SITE_DOWN, "502")
+
+
+def test_opens_after_threshold_site_down_failures(path):
+    breaker = CircuitBreaker(path, threshold=3, cooldown=60)
+    open_breaker(breaker)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert 0 < breaker.remaining() <= 60
+
+
+def test_other_failure_kinds_do_not_count(path):
+    breaker = CircuitBreaker(path, threshold=1, cooldown=60)
+    assert not breaker.record_failure(TRANSIENT, "zaman aşımı")
+    assert not breaker.record_failure(SELECTOR_DRIFT, "selector")
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_success_resets_failure_count(path):
+    breaker = CircuitBreaker(path, threshold=2, cooldown=60)
+    breaker.record_failure(SITE_DOWN)
+    assert not breaker.record_success()
+    assert not breaker.record_failure(SITE_DOWN)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_single_trial_and_closes_on_success(path):
+    breaker = CircuitBreaker(path, threshold=1, cooldown=0.05)
+    open_breaker(breaker)
+    time.sleep(0.1)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Deneme sürerken ikinci tarama beklemede
+    assert not breaker.allow()
+    assert breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_with_doubled_cooldown(path):
+    breaker = CircuitBreaker(path, threshold=1, cooldown=0.05, max_cooldown=0.08)
+    open_breaker(breaker)
+    time.sleep(0.1)
+    assert breaker.allow()
+    assert not breaker.record_failure(SITE_DOWN, "502")
+    assert breaker.state == OPEN
+    assert breaker.summary()["cooldown"] == pytest.approx(0.08)
+
+
+def test_state_survives_restart(path):
+    open_breaker(CircuitBreaker(path, threshold=2, cooldown=60))
+    restored = CircuitBreaker(path, threshold=2, cooldown=60)
+    assert restored.state == OPEN
+    assert not restored.allow()
+
+
+def test_abandoned_trial_allows_a_new_trial(path):
+    breaker = CircuitBreaker(path, threshold=1, cooldown=0.05)
+    open_breaker(breaker)
+    time.sleep(0.1)
+    assert breaker.allow()
+    # Deneme taraması sonuç bildirmeden bitti (ör. tarayıcı açılamadı)
+    breaker.abandon_trial()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_stale_trial_expires(path):
+    breaker = CircuitBreaker(path, threshold=1, cooldown=0.05, trial_timeout=0.05)
+    open_breaker(breaker)
+    time.sleep(0.1)
+    assert breaker.allow()
+    assert not breaker.allow()
+    time.sleep(0.1)
+    assert breaker.allow()
+
+
+def test_processes_share_state_through_file(path):
+    coordinator = CircuitBreaker(path, threshold=1, cooldown=0.05)
+    worker = CircuitBreaker(path, threshold=1, cooldown=0.05)
+    assert coordinator.allow()
+    open_breaker(worker)
+    assert coordinator.state == OPEN
+    assert not coordinator.allow()
+    time.sleep(0.1)
+    # Denemeyi bir süreç alır, diğeri beklemede kalır
+    assert worker.allow()
+    assert not coordinator.allow()
+    assert worker.record_success()
+    assert coordinator.state == CLOSED
+    assert coordinator.allow()
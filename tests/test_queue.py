@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""JobQueue: kira süresi dolan işler ve deneme hakkı sınırı"""
+
+import threading
+import time
+
+import pytest
+
+from ielts_queue import DONE, FAILED, LEASED, PENDING, JobDeferred, JobQueue, run_worker
+from ielts_scan import ScanTarget
+
+TARGET = ScanTarget("212", "Ankara", "Academic - IELTS", "1771", "Bilkent University")
+OTHER = ScanTarget("212", "Ankara", "Academic - IELTS", "1772", "METU")
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"), lease_seconds=0.05, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def expire():
+    time.sleep(0.1)
+
+
+def test_lease_returns_pending_job_once(queue):
+    cycle_id = queue.enqueue_cycle([TARGET])
+    job_id, target = queue.lease("w1")
+    assert target == TARGET
+    assert queue.lease("w2") is None
+    assert queue.cycle_state(cycle_id) == {LEASED: 1}
+    assert queue.complete(job_id, "w1", [])
+    assert queue.cycle_state(cycle_id) == {DONE: 1}
+
+
+def test_expired_lease_is_leased_again(queue):
+    queue.enqueue_cycle([TARGET])
+    first, _ = queue.lease("w1")
+    expire()
+    second, target = queue.lease("w2")
+    assert (second, target) == (first, TARGET)
+    # Eski worker'ın kirası başkasına geçti
+    assert not queue.heartbeat(first, "w1")
+    assert queue.heartbeat(second, "w2")
+
+
+def test_expired_lease_fails_after_max_attempts(queue):
+    cycle_id = queue.enqueue_cycle([TARGET])
+    queue.lease("w1")
+    expire()
+    queue.lease("w2")
+    expire()
+    # Deneme hakkı bitti: iş bir daha kiralanmaz
+    assert queue.lease("w3") is None
+    assert queue.cycle_state(cycle_id) == {FAILED: 1}
+    _, scanned, failed = queue.collect(cycle_id)
+    assert (scanned, failed) == ([], [TARGET])
+
+
+def test_requeue_expired_respects_max_attempts(queue):
+    cycle_id = queue.enqueue_cycle([TARGET, OTHER], priorities=[0, 1])
+    queue.lease("w1")
+    expire()
+    assert queue.requeue_expired() == 1
+    assert queue.cycle_state(cycle_id) == {PENDING: 2}
+    queue.lease("w1")
+    expire()
+    assert queue.requeue_expired() == 1
+    assert queue.cycle_state(cycle_id) == {FAILED: 1, PENDING: 1}
+
+
+def test_fail_requeues_until_max_attempts(queue):
+    cycle_id = queue.enqueue_cycle([TARGET])
+    job_id, _ = queue.lease("w1")
+    assert queue.fail(job_id, "w1", "zaman aşımı") == PENDING
+    job_id, _ = queue.lease("w1")
+    assert queue.fail(job_id, "w1", "zaman aşımı") == FAILED
+    assert queue.cycle_state(cycle_id) == {FAILED: 1}
+
+
+def test_deferred_job_keeps_its_attempts(queue):
+    cycle_id = queue.enqueue_cycle([TARGET])
+
+    def scan(target):
+        raise JobDeferred("devre açık")
+
+    # Kesinti boyunca ertelenen iş deneme hakkını tüketmez
+    stop = threading.Event()
+    calls = []
+
+    def gate():
+        calls.append(1)
+        if len(calls) > 3:
+            stop.set()
+        return 0
+
+    run_worker(queue, scan, owner="w1", poll_interval=0, stop_event=stop, gate=gate)
+    assert queue.cycle_state(cycle_id) == {PENDING: 1}
+    job_id, _ = queue.lease("w1")
+    assert queue.fail(job_id, "w1", "zaman aşımı") == PENDING
+
+
+def test_closed_gate_does_not_lease(queue):
+    cycle_id = queue.enqueue_cycle([TARGET])
+    stop = threading.Event()
+
+    def gate():
+        stop.set()
+        return 0.01
+
+    run_worker(queue, lambda target: [], owner="w1", stop_event=stop, gate=gate)
+    assert queue.cycle_state(cycle_id) == {PENDING: 1}
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""AdaptiveScheduler.next_interval: geri çekilme, release window'lar ve bütçe"""
+
+from datetime import datetime
+
+import pytest
+
+from ielts_scheduler import SECONDS_PER_DAY, AdaptiveScheduler, parse_release_window
+
+# Pazartesi
+MONDAY = datetime(2026, 10, 12)
+
+
+def test_without_windows_uses_base_interval():
+    scheduler = AdaptiveScheduler(1800, min_interval=60)
+    assert scheduler.next_interval(True, MONDAY.replace(hour=3)) == 1800
+
+
+def test_failures_back_off_exponentially_up_to_max():
+    scheduler = AdaptiveScheduler(600, min_interval=60, max_backoff=3600)
+    moment = MONDAY.replace(hour=12)
+    intervals = [scheduler.next_interval(False, moment) for _ in range(5)]
+    for interval, expected in zip(intervals, (600, 1200, 2400, 3600, 3600)):
+        assert expected * 0.9 <= interval <= expected * 1.1
+    # Başarılı kontrol geri çekilmeyi sıfırlar
+    assert scheduler.next_interval(True, moment) == 600
+    assert scheduler.consecutive_failures == 0
+
+
+def test_window_interval_inside_release_window():
+    scheduler = AdaptiveScheduler(1800, window_interval=300, min_interval=60,
+                                  release_windows=[parse_release_window("09:00-11:00")])
+    assert scheduler.next_interval(True, MONDAY.replace(hour=9, minute=30)) == 300
+
+
+def test_off_peak_interval_does_not_skip_window_start():
+    scheduler = AdaptiveScheduler(1800, window_interval=300, min_interval=60,
+                                  release_windows=[parse_release_window("09:00-11:00")])
+    assert scheduler.off_peak_interval > 1800
+    assert scheduler.next_interval(True, MONDAY.replace(hour=8, minute=50)) == 600
+    assert scheduler.next_interval(True, MONDAY.replace(hour=2)) == scheduler.off_peak_interval
+
+
+def test_day_restricted_window_is_ignored_on_other_days():
+    scheduler = AdaptiveScheduler(1800, window_interval=300, min_interval=60,
+                                  release_windows=[parse_release_window("tue 09:00-11:00")])
+    assert scheduler.next_interval(True, MONDAY.replace(hour=9, minute=30)) != 300
+    assert scheduler.next_interval(True, MONDAY.replace(day=13, hour=9, minute=30)) == 300
+
+
+def test_daily_check_budget_is_kept():
+    scheduler = AdaptiveScheduler(1800, window_interval=300, min_interval=60, max_backoff=7200,
+                                  release_windows=[parse_release_window("09:00-11:00")])
+    window_seconds = 2 * 3600
+    checks = window_seconds / 300 + (SECONDS_PER_DAY - window_seconds) / scheduler.off_peak_interval
+    assert checks == pytest.approx(SECONDS_PER_DAY / 1800)
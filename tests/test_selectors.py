@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Venue linki selector'ları: tam ad eşleşmesi ve tırnaklı adlar"""
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from ielts_scan import ScanTarget
+from ielts_selectors import venue_link_selectors, xpath_literal
+
+
+def target(name):
+    return ScanTarget("212", "Ankara", "Academic - IELTS", "1801", name)
+
+
+def test_xpath_literal_quotes():
+    assert xpath_literal("Bilkent University") == "'Bilkent University'"
+    assert xpath_literal("St John's") == '"St John\'s"'
+    assert xpath_literal('St John\'s "Centre"') == 'concat(\'St John\', "\'", \'s "Centre"\')'
+
+
+def test_venue_name_is_matched_in_full():
+    values = [value for _, value in venue_link_selectors(target("British  Council Istanbul"))]
+    # İlk kelimeyle (contains 'British') eşleşen aday yok; ad normalize edilir
+    assert not any("'British'" in value for value in values)
+    assert "//a[normalize-space()='British Council Istanbul']" in values
+    assert "British Council Istanbul" in values
+
+
+def test_apostrophe_in_venue_name_builds_valid_literal():
+    for _, value in venue_link_selectors(target("St John's College")):
+        assert "'St John's" not in value